@@ -42,9 +42,41 @@ from ..core.ml_formats import *
 from ..core.ml_table import ML_ApproxTable
 from ..core.ml_operations import *
 from .generator_helper import *
+from .dispatch_index import DispatchIndex
 
 LOG_BACKEND_INIT = Log.LogLevel(Log.Info, "backend_init")
 
+
+class SupportedOpMap(dict):
+    """ language -> simplified map of the operations supported by a
+        processor hierarchy; the simplified map of a language is only
+        generated when it is first accessed """
+    def __init__(self, backend, language_list=()):
+        dict.__init__(self)
+        self.backend = backend
+        self.language_set = set(language_list)
+
+    def add_language(self, language):
+        """ declare <language> as supported by the processor hierarchy """
+        self.language_set.add(language)
+        self.pop(language, None)
+
+    def __contains__(self, language):
+        return language in self.language_set
+
+    def __setitem__(self, language, op_map):
+        self.language_set.add(language)
+        dict.__setitem__(self, language, op_map)
+
+    def __missing__(self, language):
+        if not language in self.language_set:
+            raise KeyError(language)
+        Log.report(LOG_BACKEND_INIT, "generating {} supported operation map for {}", language, self.backend)
+        op_map = self.backend.generate_supported_op_map(language = language)
+        dict.__setitem__(self, language, op_map)
+        return op_map
+
+
 ## abstract backend class
 class AbstractBackend(object):
     """ base abstract processor """
@@ -53,11 +85,14 @@ class AbstractBackend(object):
     def __init__(self, *args):
         # create ordered list of parent architecture instances
         parent_class_list = get_parent_proc_class_list(self.__class__)
-        self.parent_architecture = [parent(*args) for parent in create_proc_hierarchy(parent_class_list, [])]
+        self.parent_architecture = [get_shared_proc_instance(parent, *args) for parent in create_proc_hierarchy(parent_class_list, [])]
 
         # create simplified of operation supported by the processor hierarchy
-        self.simplified_rec_op_map = {}
-        self.simplified_rec_op_map[C_Code] = self.generate_supported_op_map(language = C_Code)
+        # (generated on first use)
+        self.simplified_rec_op_map = SupportedOpMap(self, [C_Code])
+
+        # compiled dispatch indexes, built lazily (see get_dispatch_index)
+        self.dispatch_index_map = {}
 
     def __str__(self):
         """ Nice description string """
@@ -125,15 +160,51 @@ class AbstractBackend(object):
                         return implementation
         return None
 
+    def get_dispatch_index(self, table_getter = lambda self: self.code_generation_table):
+        """ return the dispatch index over the tables returned by
+            table_getter for self and every parent architecture (in
+            priority order) """
+        table_list = [table_getter(self)] + [table_getter(parent_proc) for parent_proc in self.parent_architecture]
+        # table_getter are often lambdas built at each call, so the index
+        # is identified by the tables themselves (kept alive by the index)
+        index_key = tuple(id(table) for table in table_list)
+        if not index_key in self.dispatch_index_map:
+            self.dispatch_index_map[index_key] = DispatchIndex(self.target_name, table_list)
+        return self.dispatch_index_map[index_key]
+
+    def get_support_index(self):
+        """ return the dispatch index over the simplified map of
+            operations supported by the processor hierarchy """
+        if not "support" in self.dispatch_index_map:
+            self.dispatch_index_map["support"] = DispatchIndex("{}/support".format(self.target_name), [self.simplified_rec_op_map])
+        return self.dispatch_index_map["support"]
+
+    def invalidate_dispatch_index(self):
+        """ drop compiled dispatch indexes, must be called when one
+            of the code generation tables or simplified_rec_op_map
+            is modified after a lookup """
+        self.dispatch_index_map.clear()
+
+    def find_implementation(self, optree, language = None, table_getter = lambda self: self.code_generation_table, key_getter = lambda self, optree: self.get_operation_keys(optree)):
+        """ return the first implementation of optree found in the
+            processor class hierarchy, or None """
+        op_class, interface, codegen_key = key_getter(self, optree)
+        implementation = self.get_dispatch_index(table_getter).lookup(language, op_class, codegen_key, interface, optree)
+        if not implementation is None:
+            Log.report(
+                Log.Verbose,
+                "optree {} to implementation @ {}",
+                optree,
+                str(implementation.get_source_info())
+            )
+        return implementation
+
     def get_recursive_implementation(self, optree, language = None, table_getter = lambda self: self.code_generation_table, key_getter = lambda self, optree: self.get_operation_keys(optree)):
         """ recursively search for an implementation of optree in the processor class hierarchy """
-        if self.is_local_supported_operation(optree, language = language, table_getter = table_getter, key_getter = key_getter):
-            local_implementation = self.get_implementation(optree, language, table_getter = table_getter, key_getter = key_getter)
-            return local_implementation
+        implementation = self.find_implementation(optree, language, table_getter = table_getter, key_getter = key_getter)
+        if not implementation is None:
+            return implementation
         else:
-            for parent_proc in self.parent_architecture:
-                if parent_proc.is_local_supported_operation(optree, language = language, table_getter = table_getter, key_getter = key_getter):
-                    return parent_proc.get_implementation(optree, language, table_getter = table_getter, key_getter = key_getter)
             # no implementation were found
             Log.report(Log.Verbose, "Tested architecture(s) for language %s:" % language)
             for parent_proc in self.parent_architecture:
@@ -194,7 +265,11 @@ class AbstractBackend(object):
 
     def is_supported_operation(self, optree, language = C_Code, debug = False,  key_getter = lambda self, optree: self.get_operation_keys(optree)):
         """ return whether or not the operation performed by optree is supported by any level of the processor hierarchy """
-        return self.is_map_supported_operation(self.simplified_rec_op_map, optree, language, debug = debug, key_getter = key_getter)
+        if debug:
+            # the original scan reports why the operation is not supported
+            return self.is_map_supported_operation(self.simplified_rec_op_map, optree, language, debug = debug, key_getter = key_getter)
+        op_class, interface, codegen_key = key_getter(self, optree)
+        return not self.get_support_index().lookup(language, op_class, codegen_key, interface, optree) is None
 
     ## Test if an operation class with given prototype is supported
     def test_operation_support(self, op_class, out_format, in_formats, specifier = None):
@@ -238,6 +313,24 @@ def test_is_processor(proc_class):
     return issubclass(proc_class, AbstractBackend) and not proc_class is AbstractBackend
 
 
+## Processor instances shared by every processor hierarchy
+#  (parent architectures are only used through their tables)
+SHARED_PROC_INSTANCE_MAP = {}
+
+def get_shared_proc_instance(proc_class, *args):
+    """ return an instance of proc_class built with args, shared with
+        every other hierarchy which contains proc_class """
+    try:
+        return SHARED_PROC_INSTANCE_MAP[(proc_class, args)]
+    except KeyError:
+        proc_instance = proc_class(*args)
+        SHARED_PROC_INSTANCE_MAP[(proc_class, args)] = proc_instance
+        return proc_instance
+    except TypeError:
+        # unhashable arguments, the instance can not be shared
+        return proc_class(*args)
+
+
 def get_parent_proc_class_list(proc_class):
     return [parent for parent in proc_class.__bases__ if test_is_processor(parent)]
     
@@ -52,6 +52,9 @@ from .code_function import CodeFunction
 
 class CCodeGenerator(object):
     language = C_Code
+    # declare constants and tables with internal linkage (static), used when
+    # the same symbol may be defined in several translation units
+    static_symbols = False
 
     """ C language code generator """
     def __init__(self, processor, declare_cst = True, disable_debug = False, libm_compliant = False, default_rounding_mode = ML_GlobalRoundMode, default_silent = None, language = C_Code):
@@ -342,6 +345,8 @@ class CCodeGenerator(object):
     def generate_declaration(self, symbol, symbol_object, initial = True, final = True):
         if isinstance(symbol_object, Constant):
             initial_symbol = (symbol_object.get_precision().get_code_name(language = self.language) + " ") if initial else ""
+            if initial and self.static_symbols:
+                initial_symbol = "static " + initial_symbol
             final_symbol = ";\n" if final else ""
             return "%s%s = %s%s" % (initial_symbol, symbol, symbol_object.get_precision().get_cst(symbol_object.get_value(), language = self.language), final_symbol) 
 
@@ -352,11 +357,12 @@ class CCodeGenerator(object):
 
         elif isinstance(symbol_object, ML_Table):
             # TODO: check @p initial effect
+            storage_symbol = "static " if (initial and self.static_symbols) else ""
             if symbol_object.is_empty():
-              initial_symbol = (symbol_object.get_definition(symbol, final = "", language = self.language)) if initial else ""
+              initial_symbol = (storage_symbol + symbol_object.get_definition(symbol, final = "", language = self.language)) if initial else ""
               return "{};\n".format(initial_symbol)
             else:
-              initial_symbol = (symbol_object.get_definition(symbol, final = "", language = self.language) + " ") if initial else ""
+              initial_symbol = (storage_symbol + symbol_object.get_definition(symbol, final = "", language = self.language) + " ") if initial else ""
               table_content_init = symbol_object.get_content_init(language = self.language)
               return "%s = %s;\n" % (initial_symbol, table_content_init)
 
@@ -188,6 +188,24 @@ class FunctionGroup(object):
         return self
 
 
+    def split(self, function_num=1):
+        """ Split @p self into a list of FunctionGroup-s containing at
+            most @p function_num functions each (e.g. one group per
+            translation unit). Core and sub function status are
+            preserved """
+        group_list = []
+        function_list = [(fct, False) for fct in self.sub_function_list] + \
+                        [(fct, True) for fct in self.core_function_list]
+        for index in range(0, len(function_list), max(function_num, 1)):
+            group = FunctionGroup()
+            for fct, core in function_list[index:index + max(function_num, 1)]:
+                if core:
+                    group.add_core_function(fct)
+                else:
+                    group.add_sub_function(fct)
+            group_list.append(group)
+        return group_list
+
     def get_code_function_by_name(self, function_name):
         for fct in self.core_function_list + self.sub_function_list:
             if fct.name == function_name:
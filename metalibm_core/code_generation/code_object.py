@@ -100,21 +100,19 @@ class SymbolTable(object):
         self.reverse_map[symbol_object] = name
 
     def generate_declaration(self, code_generator):
-        code_object = ""
-        for symbol in self.table:
-            symbol_object = self.table[symbol]
-            code_object += code_generator.generate_declaration(symbol, symbol_object)
-        return code_object
+        return "".join(
+            code_generator.generate_declaration(symbol, self.table[symbol])
+            for symbol in self.table
+        )
 
     def generate_initialization(self, code_generator):
         """ generate symbol initialization, only necessary
             if symbols require a specific initialization procedure
             after declaration (e.g. mpfr_t variable) """
-        code_object = ""
-        for symbol in self.table:
-            symbol_object = self.table[symbol]
-            code_object += code_generator.generate_initialization(symbol, symbol_object)
-        return code_object
+        return "".join(
+            code_generator.generate_initialization(symbol, self.table[symbol])
+            for symbol in self.table
+        )
 
 
 class MultiSymbolTable(object):
@@ -262,19 +260,77 @@ class MultiSymbolTable(object):
 
 
     def generate_declarations(self, code_generator, exclusion_list = []):
-        code_object = ""
-        for table_tag in self.table_list:
-            if table_tag in exclusion_list + self.default_exclusion_list:
-                continue
-            code_object += self.table_list[table_tag].generate_declaration(code_generator)
-        return code_object
+        excluded_tags = exclusion_list + self.default_exclusion_list
+        return "".join(
+            self.table_list[table_tag].generate_declaration(code_generator)
+            for table_tag in self.table_list if not table_tag in excluded_tags
+        )
 
     def generate_initializations(self, code_generator, init_required_list = []):
-        code_object = ""
-        for table_tag in init_required_list:
-            code_object += self.table_list[table_tag].generate_initialization(code_generator)
-        return code_object
+        return "".join(
+            self.table_list[table_tag].generate_initialization(code_generator)
+            for table_tag in init_required_list
+        )
+
+
+class CodeFragmentList(object):
+    """ Rope-like storage for generated code: fragments are accumulated
+        in a list and only joined once, when the full code is requested,
+        which avoids the quadratic cost of repeated string concatenation """
+    __slots__ = ("fragment_list", "length")
+    def __init__(self):
+        self.fragment_list = []
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def append(self, fragment):
+        """ append string <fragment> at the end of the code """
+        if fragment:
+            self.fragment_list.append(fragment)
+            self.length += len(fragment)
+
+    def extend(self, fragment_list):
+        """ append every fragment of CodeFragmentList <fragment_list> """
+        self.fragment_list.extend(fragment_list.fragment_list)
+        self.length += fragment_list.length
+
+    def get_suffix(self, size):
+        """ return the last <size> characters of the code (or less
+            if the code is shorter) without joining every fragment """
+        suffix = ""
+        for fragment in reversed(self.fragment_list):
+            suffix = fragment + suffix
+            if len(suffix) >= size:
+                break
+        return suffix[-size:] if size else ""
+
+    def ends_with(self, suffix):
+        return self.get_suffix(len(suffix)) == suffix
+
+    def remove_suffix(self, size):
+        """ remove the last <size> characters of the code """
+        size = min(size, self.length)
+        self.length -= size
+        while size > 0:
+            last_fragment = self.fragment_list.pop()
+            if len(last_fragment) > size:
+                self.fragment_list.append(last_fragment[:-size])
+                size = 0
+            else:
+                size -= len(last_fragment)
 
+    def get(self):
+        """ join every fragment into a single string, the result is kept as
+            the unique fragment so that a subsequent call is cheap """
+        if len(self.fragment_list) > 1:
+            self.fragment_list = ["".join(self.fragment_list)]
+        return self.fragment_list[0] if self.fragment_list else ""
+
+
+# trailing whitespaces removed by CodeObject.reindent
+TRAILING_WHITESPACE_REGEX = re.compile(" +\n")
 
 def get_git_tag():
     """ extract git commit tag """
@@ -290,7 +346,7 @@ class CodeObject(object):
     GENERAL_PREFIX = ""
     def __init__(self, language, shared_tables = None, parent_tables = None, rounding_mode = ML_GlobalRoundMode, uniquifier = "", main_code_level = None, var_ctor = None):
         """ code object initialization """
-        self.expanded_code = ""
+        self.code_fragments = CodeFragmentList()
         self.uniquifier = uniquifier
         self.tablevel = 0
         self.header_list = []
@@ -300,25 +356,33 @@ class CodeObject(object):
         self.header_comment = []
         self.default_var_ctor = var_ctor
 
+    @property
+    def expanded_code(self):
+        """ code inserted so far, as a single string """
+        return self.code_fragments.get()
+
     def add_header_comment(self, comment):
         self.header_comment.append(comment)
 
     def is_empty(self):
-        return len(self.header_list) == 0 and len(self.library_list) == 0 and self.symbol_table.is_empty() and len(self.header_comment) == 0 and len(self.expanded_code) == 0
+        return len(self.header_list) == 0 and len(self.library_list) == 0 and self.symbol_table.is_empty() and len(self.header_comment) == 0 and len(self.code_fragments) == 0
 
     def get_symbol_table(self):
         return self.symbol_table
 
     def reindent(self, line):
         """ re indent code line <line> with proper current indentation level """
+        if not "\n" in line:
+            return line
         # inserting proper indentation level
-        codeline = re.sub("\n", lambda _: ("\n" + self.tablevel * CodeObject.tab), line)
+        codeline = line.replace("\n", "\n" + self.tablevel * CodeObject.tab)
         # removing trailing whitespaces
-        codeline = re.sub(" +\n", "\n", codeline) 
+        if " \n" in codeline:
+            codeline = TRAILING_WHITESPACE_REGEX.sub("\n", codeline)
         return codeline
 
     def append_code(self, code):
-        self.expanded_code += code
+        self.code_fragments.append(code)
         return self
 
     def __lshift__(self, added_code):
@@ -329,14 +393,14 @@ class CodeObject(object):
     def inc_level(self):
         """ increase indentation level """
         self.tablevel += 1
-        self.expanded_code += CodeObject.tab
+        self.code_fragments.append(CodeObject.tab)
 
     def dec_level(self):
         """ decrease indentation level """
         self.tablevel -= 1
         # deleting last inserted tab
-        if self.expanded_code[-len(CodeObject.tab):] == CodeObject.tab:
-            self.expanded_code = self.expanded_code[:-len(CodeObject.tab)]
+        if self.code_fragments.ends_with(CodeObject.tab):
+            self.code_fragments.remove_suffix(len(CodeObject.tab))
 
     def open_level(self, inc=True, header=None):
         """ open nested block """
@@ -449,20 +513,20 @@ class CodeObject(object):
 
     def get(self, code_generator, static_cst = False, static_table = False, headers = False, skip_function = False):
         """ generate unrolled code content """
-        result = ""
+        result = CodeFragmentList()
 
         if headers:
-            result += self.generate_header_code()
-            result += "\n\n"
+            result.append(self.generate_header_code())
+            result.append("\n\n")
 
         declaration_exclusion_list = [MultiSymbolTable.ConstantSymbol] if static_cst else []
         declaration_exclusion_list += [MultiSymbolTable.TableSymbol] if static_table else []
         declaration_exclusion_list += [MultiSymbolTable.FunctionSymbol] if skip_function else []
-        result += self.symbol_table.generate_declarations(code_generator, exclusion_list = declaration_exclusion_list)
-        result += self.symbol_table.generate_initializations(code_generator, init_required_list = [MultiSymbolTable.ConstantSymbol, MultiSymbolTable.VariableSymbol])
-        result += "\n" if result != "" else ""
-        result += self.expanded_code
-        return result
+        result.append(self.symbol_table.generate_declarations(code_generator, exclusion_list = declaration_exclusion_list))
+        result.append(self.symbol_table.generate_initializations(code_generator, init_required_list = [MultiSymbolTable.ConstantSymbol, MultiSymbolTable.VariableSymbol]))
+        result.append("\n" if len(result) else "")
+        result.extend(self.code_fragments)
+        return result.get()
 
     def push_into_parent_code(self, parent_code, code_generator, static_cst = False, static_table = False, headers = False, skip_function = False):
         if headers:
@@ -587,11 +651,11 @@ class LLVMCodeObject(CodeObject):
         return result
 
     def get(self, code_generator, static_cst=False, static_table=False, headers=False, skip_function = True):
-        result = ""
+        result = CodeFragmentList()
 
         if headers: 
-            result += self.generate_header_code()
-            result += "\n\n"
+            result.append(self.generate_header_code())
+            result.append("\n\n")
 
         # symbol exclusion list
         declaration_exclusion_list = [MultiSymbolTable.ConstantSymbol] if static_cst else []
@@ -604,17 +668,17 @@ class LLVMCodeObject(CodeObject):
         ]
 
         # declaration generation
-        result += self.symbol_table.generate_declarations(code_generator, exclusion_list=declaration_exclusion_list)
-        result += self.symbol_table.generate_initializations(
+        result.append(self.symbol_table.generate_declarations(code_generator, exclusion_list=declaration_exclusion_list))
+        result.append(self.symbol_table.generate_initializations(
             code_generator,
             init_required_list=[
                 MultiSymbolTable.ConstantSymbol, MultiSymbolTable.VariableSymbol
             ]
-        )
-        result += "\n" if result != "" else ""
-        result += self.expanded_code
-        result += "\n"
-        return result
+        ))
+        result.append("\n" if len(result) else "")
+        result.extend(self.code_fragments)
+        result.append("\n")
+        return result.get()
 
     def push_into_parent_code(self, parent_code, code_generator, static_cst = False, static_table = False, headers = False, skip_function=True):
         # symbol exclusion list
@@ -636,7 +700,7 @@ class VHDLCodeObject(object):
     tab = "    "
     def __init__(self, language, shared_tables = None, parent_tables = None, rounding_mode = ML_GlobalRoundMode, uniquifier = "", main_code_level = False, var_ctor = None):
         """ code object initialization """
-        self.expanded_code = ""
+        self.code_fragments = CodeFragmentList()
         self.uniquifier = uniquifier
         self.tablevel = 0
         self.header_list = []
@@ -648,30 +712,37 @@ class VHDLCodeObject(object):
         self.main_code_level = main_code_level
         self.default_var_ctor = var_ctor
 
+    @property
+    def expanded_code(self):
+        """ code inserted so far, as a single string """
+        return self.code_fragments.get()
+
     def add_header_comment(self, comment):
         self.header_comment.append(comment)
 
     def is_empty(self):
-        return len(self.header_list) == 0 and len(self.library_list) == 0 and self.symbol_table.is_empty() and len(self.header_comment) == 0 and len(self.expanded_code) == 0
+        return len(self.header_list) == 0 and len(self.library_list) == 0 and self.symbol_table.is_empty() and len(self.header_comment) == 0 and len(self.code_fragments) == 0
 
     def get_symbol_table(self):
         return self.symbol_table
 
     def __lshift__(self, added_code):
         """ implicit code insertion through << operator """
-        self.expanded_code += re.sub("\n", lambda _: ("\n" + self.tablevel * CodeObject.tab), added_code)
+        self.code_fragments.append(
+            added_code.replace("\n", "\n" + self.tablevel * CodeObject.tab)
+        )
 
     def inc_level(self):
         """ increase indentation level """
         self.tablevel += 1
-        self.expanded_code += CodeObject.tab
+        self.code_fragments.append(CodeObject.tab)
 
     def dec_level(self):
         """ decrease indentation level """
         self.tablevel -= 1
         # deleting last inserted tab
-        if self.expanded_code[-len(CodeObject.tab):] == CodeObject.tab:
-            self.expanded_code = self.expanded_code[:-len(CodeObject.tab)]
+        if self.code_fragments.ends_with(CodeObject.tab):
+            self.code_fragments.remove_suffix(len(CodeObject.tab))
 
     def open_level(self, inc = True, header=None):
         """ open nested block """
@@ -796,11 +867,11 @@ class VHDLCodeObject(object):
 
     def get(self, code_generator, static_cst = False, static_table = False, headers = False, skip_function = False):
         """ generate unrolled code content """
-        result = ""
+        result = CodeFragmentList()
 
         if headers:
-            result += self.generate_header_code()
-            result += "\n\n"
+            result.append(self.generate_header_code())
+            result.append("\n\n")
 
         # Entities are always excluded from generation
         # They will be processed in a separate manner (see ML_EntityBasis)
@@ -814,12 +885,12 @@ class VHDLCodeObject(object):
         if self.shared_symbol_table_f:
             declaration_exclusion_list.append(MultiSymbolTable.SignalSymbol)
 
-        result += self.symbol_table.generate_declarations(code_generator, exclusion_list = declaration_exclusion_list)
-        result += self.symbol_table.generate_initializations(code_generator, init_required_list = [MultiSymbolTable.ConstantSymbol, MultiSymbolTable.VariableSymbol])
-        result += "begin\n" if not self.main_code_level else ""
-        result += "\n" if result != "" else ""
-        result += self.expanded_code
-        return result
+        result.append(self.symbol_table.generate_declarations(code_generator, exclusion_list = declaration_exclusion_list))
+        result.append(self.symbol_table.generate_initializations(code_generator, init_required_list = [MultiSymbolTable.ConstantSymbol, MultiSymbolTable.VariableSymbol]))
+        result.append("begin\n" if not self.main_code_level else "")
+        result.append("\n" if len(result) else "")
+        result.extend(self.code_fragments)
+        return result.get()
 
     def push_into_parent_code(self, parent_code, code_generator, static_cst = False, static_table = False, headers = False, skip_function = False):
         """ generate unrolled code content """
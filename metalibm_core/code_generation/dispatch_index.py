@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Compiled dispatch index for backend instruction selection
+
+    A backend code generation table is a nested dictionnary
+        table[language][op_class][codegen_key][condition][interface_condition]
+    which used to be scanned for every node at every level of the processor
+    hierarchy. A DispatchIndex flattens the tables of a list of hierarchy
+    levels into one ordered candidate list per
+        (language, op_class, codegen_key, interface formats)
+    key. Interface conditions marked as interface-only (see
+    generator_utility.interface_only) are evaluated once, when the candidate
+    list is built, and are memoized by the key; the other predicates still
+    depend on the node and are evaluated at each lookup, in the same order as
+    the original scan.
+
+    Environment variables:
+        ML_DISPATCH_PROFILE: if defined, time every predicate evaluation
+                             (reported with --verbose Info:dispatch)
+"""
+
+import atexit
+import inspect
+import os
+import timeit
+import weakref
+
+from ..utility.log_report import Log
+
+LOG_DISPATCH_INFO = Log.LogLevel("Info", "dispatch")
+
+
+def is_interface_only(predicate):
+    """ return True if <predicate> result only depends on the interface
+        formats (and not on the node being matched) """
+    return getattr(predicate, "interface_only", False)
+
+
+def get_predicate_description(predicate):
+    """ return a short string describing where <predicate> was defined """
+    try:
+        # predicate objects are described by the location of their class
+        src_obj = predicate if inspect.isfunction(predicate) else predicate.__class__
+        src_file = inspect.getsourcefile(src_obj)
+        _, lineno = inspect.getsourcelines(src_obj)
+        return "{}@{}:{}".format(getattr(src_obj, "__name__", "<predicate>"), os.path.basename(src_file), lineno)
+    except (TypeError, IOError, OSError):
+        return repr(predicate)
+
+
+class DispatchIndex(object):
+    """ Index of the implementations available in a list of code generation
+        tables (one per processor hierarchy level, in priority order) """
+    # enable per-predicate timing
+    profile_predicates = "ML_DISPATCH_PROFILE" in os.environ
+    # every index alive, used to report statistics
+    index_set = weakref.WeakSet()
+
+    def __init__(self, name, table_list):
+        """ <name> is used in reports, <table_list> is the ordered list of
+            code generation tables indexed by self """
+        self.name = name
+        self.table_list = table_list
+        # (language, op_class, codegen_key, interface) -> candidate list
+        self.candidate_map = {}
+        self.hit_count = 0
+        self.miss_count = 0
+        self.unhashable_count = 0
+        # predicate -> [evaluation count, cumulated time]
+        self.predicate_stats = {}
+        DispatchIndex.index_set.add(self)
+
+    def invalidate(self):
+        """ drop every compiled candidate list, must be called when one
+            of the indexed tables is modified """
+        self.candidate_map.clear()
+
+    def eval_predicate(self, predicate, *args, **kw):
+        """ evaluate <predicate>, recording its cost if profiling
+            is enabled """
+        if not self.profile_predicates:
+            return predicate(*args, **kw)
+        start = timeit.default_timer()
+        try:
+            return predicate(*args, **kw)
+        finally:
+            elapsed = timeit.default_timer() - start
+            stats = self.predicate_stats.setdefault(predicate, [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+
+    def eval_interface_predicate(self, interface_condition, op_class, interface, optree):
+        """ evaluate an interface condition on the formats of <interface> """
+        try:
+            return self.eval_predicate(interface_condition, *interface, optree=optree)
+        except TypeError as e:
+            Log.report(Log.Error, "Type Error for interface_condition on {}, {}", op_class, [str(ifce) for ifce in interface], error=e)
+
+    def build_candidate_list(self, language, op_class, codegen_key, interface):
+        """ build the ordered list of (condition, [(interface_condition,
+            implementation)]) which may implement the key, interface-only
+            conditions are resolved here and replaced by None when verified """
+        candidate_list = []
+        for table in self.table_list:
+            try:
+                condition_map = table[language][op_class][codegen_key]
+            except KeyError:
+                continue
+            for condition in condition_map:
+                interface_list = []
+                for interface_condition in condition_map[condition]:
+                    implementation = condition_map[condition][interface_condition]
+                    if not is_interface_only(interface_condition):
+                        interface_list.append((interface_condition, implementation))
+                    elif self.eval_interface_predicate(interface_condition, op_class, interface, None):
+                        interface_list.append((None, implementation))
+                if interface_list:
+                    candidate_list.append((condition, interface_list))
+        return candidate_list
+
+    def get_candidate_list(self, language, op_class, codegen_key, interface):
+        """ return the (memoized) candidate list for the given key """
+        index_key = (language, op_class, codegen_key, interface)
+        try:
+            candidate_list = self.candidate_map[index_key]
+            self.hit_count += 1
+            return candidate_list
+        except KeyError:
+            self.miss_count += 1
+            candidate_list = self.build_candidate_list(language, op_class, codegen_key, interface)
+            self.candidate_map[index_key] = candidate_list
+            return candidate_list
+        except TypeError:
+            # some formats are not hashable, the list can not be memoized
+            self.unhashable_count += 1
+            return self.build_candidate_list(language, op_class, codegen_key, interface)
+
+    def lookup(self, language, op_class, codegen_key, interface, optree):
+        """ return the first implementation matching <optree> (whose
+            keys are op_class, codegen_key and interface), or None """
+        for condition, interface_list in self.get_candidate_list(language, op_class, codegen_key, interface):
+            if self.eval_predicate(condition, optree):
+                for interface_condition, implementation in interface_list:
+                    if interface_condition is None or self.eval_interface_predicate(interface_condition, op_class, interface, optree):
+                        return implementation
+        return None
+
+    def get_hit_rate(self):
+        """ return the ratio of lookups served by a memoized candidate list """
+        lookup_count = self.hit_count + self.miss_count + self.unhashable_count
+        return (self.hit_count / float(lookup_count)) if lookup_count else 0.0
+
+    def get_slowest_predicates(self, num=5):
+        """ return the list of the <num> predicates with the largest
+            cumulated evaluation time, as (description, count, time) """
+        stats_list = sorted(self.predicate_stats.items(), key=lambda item: item[1][1], reverse=True)
+        return [(get_predicate_description(predicate), count, elapsed) for predicate, (count, elapsed) in stats_list[:num]]
+
+    def get_stats(self):
+        """ return a dict of usage statistics """
+        return {
+            "hit": self.hit_count,
+            "miss": self.miss_count,
+            "unhashable": self.unhashable_count,
+            "hit_rate": self.get_hit_rate(),
+            "entries": len(self.candidate_map),
+            "slowest_predicates": self.get_slowest_predicates(),
+        }
+
+    def __str__(self):
+        stats = self.get_stats()
+        return "dispatch index {}: {} hit(s), {} miss(es), {} unhashable, hit rate {:.1f}%, {} entries".format(
+            self.name, stats["hit"], stats["miss"], stats["unhashable"],
+            stats["hit_rate"] * 100, stats["entries"])
+
+    @staticmethod
+    def report_all_stats():
+        """ report statistics of every index used """
+        for index in list(DispatchIndex.index_set):
+            if index.hit_count + index.miss_count + index.unhashable_count == 0:
+                continue
+            Log.report(LOG_DISPATCH_INFO, "{}", index)
+            for description, count, elapsed in index.get_slowest_predicates():
+                Log.report(LOG_DISPATCH_INFO, "  {}: {} call(s), {:.6f}s", description, count, elapsed)
+
+atexit.register(DispatchIndex.report_all_stats)
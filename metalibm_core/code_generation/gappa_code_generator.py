@@ -41,7 +41,10 @@ from .generator_utility import C_Code, Gappa_Code, RoundOperator
 from ..core.attributes import ML_Debug
 from .code_object import Gappa_Unknown, GappaCodeObject
 
-from ..utility.gappa_utils import execute_gappa_script_extract
+from ..utility.gappa_utils import (
+    execute_gappa_script_extract, execute_gappa_script_extract_async,
+    wait_all
+)
 from ..utility.log_report import Log
 
 
@@ -317,6 +320,28 @@ class GappaCodeGenerator(object):
     def get_eval_error_v2(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, gappa_filename = "gappa_tmp.g", relative_error = False):
         """ helper to compute the evaluation error of <pre_optree> bounded by tagged-node in variable_map, 
             assuming variable_map[v] is the liverange of node v """
+        # (gappa may be executed synchronously by the _async call)
+        try:
+          return self.get_eval_error_v2_async(
+            opt_engine, pre_optree, variable_copy_map, goal_precision,
+            gappa_filename, relative_error).result()
+        except ValueError:
+          Log.report(Log.Error, "Unable to compute evaluation error with gappa")
+
+    def get_eval_error_v2_async(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, gappa_filename = "gappa_tmp.g", relative_error = False):
+        """ asynchronous version of get_eval_error_v2: the gappa script is
+            generated immediately and dispatched to gappa's executor,
+            the returned future's result() is the evaluation error """
+        gappa_code = self.get_eval_error_v2_code(
+            opt_engine, pre_optree, variable_copy_map, goal_precision,
+            relative_error)
+        return execute_gappa_script_extract_async(
+            gappa_code.get(self), gappa_filename=gappa_filename
+        ).then(lambda result_map: result_map["goal"])
+
+    def get_eval_error_v2_code(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, relative_error = False):
+        """ generate the GappaCodeObject of the evaluation error of
+            <pre_optree> (see get_eval_error_v2) """
         # registering initial bounds
         bound_list = []
         bound_unique_list = []
@@ -373,14 +398,22 @@ class GappaCodeGenerator(object):
         self.add_goal(gappa_code, goal)
 
         self.clear_memoization_map()
+        return gappa_code
+
+
+    def get_eval_error_v3(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, gappa_filename = "gappa_tmp.g", dichotomy = [], relative_error = False):
+        # (gappa may be executed synchronously by the _async call)
         try:
-          eval_error = execute_gappa_script_extract(gappa_code.get(self), gappa_filename = gappa_filename)["goal"]
-          return eval_error
+          return wait_all(self.get_eval_error_v3_async(
+            opt_engine, pre_optree, variable_copy_map, goal_precision,
+            gappa_filename, dichotomy, relative_error))
         except ValueError:
           Log.report(Log.Error, "Unable to compute evaluation error with gappa")
-          
 
-    def get_eval_error_v3(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, gappa_filename = "gappa_tmp.g", dichotomy = [], relative_error = False):
+    def get_eval_error_v3_async(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, gappa_filename = "gappa_tmp.g", dichotomy = [], relative_error = False):
+        """ asynchronous version of get_eval_error_v3, return the list
+            of evaluation error futures (one per dichotomy case), every
+            case is proved concurrently """
         # storing initial interval values
         init_interval = {}
         for op in variable_copy_map:
@@ -402,12 +435,22 @@ class GappaCodeGenerator(object):
                     clean_copy_map[op].set_interval(init_interval[op])
                     
             # computing evaluation error in local conditions
-            eval_error = self.get_eval_error_v2(opt_engine, pre_optree, clean_copy_map, goal_precision, ("c%d_" % case_id) + gappa_filename, relative_error = relative_error)
+            eval_error = self.get_eval_error_v2_async(opt_engine, pre_optree, clean_copy_map, goal_precision, ("c%d_" % case_id) + gappa_filename, relative_error = relative_error)
             eval_error_list.append(eval_error)
             case_id += 1
 
         return eval_error_list
 
+    def get_eval_error_batch(self, opt_engine, request_list):
+        """ prove every evaluation error request of @p request_list
+            concurrently and wait (once) for all of them.
+            Each request is a dict of get_eval_error_v2 keyword arguments
+            (pre_optree, variable_copy_map, goal_precision, ...).
+            Return the list of evaluation errors (in request order) """
+        return wait_all([
+            self.get_eval_error_v2_async(opt_engine, **request) for request in request_list
+        ])
+
 
     def get_interval_code(self, pre_goal, variable_copy_map = {}, goal_precision = ML_Exact, update_handle = True):
         # registering initial bounds
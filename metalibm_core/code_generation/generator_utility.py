@@ -874,14 +874,24 @@ class RoundOperator(FunctionOperator):
         else:
            return FunctionOperator.assemble_code(self, code_generator, code_object, optree, var_arg_list, generate_pre_process = generate_pre_process, force_variable_storing = force_variable_storing, **kwords) 
         
+def interface_only(predicate):
+  """ mark <predicate> as an interface-only predicate: its result only
+      depends on the interface formats (never on the optree keyword) and
+      can be memoized by the backend dispatch index """
+  predicate.interface_only = True
+  return predicate
+
+@interface_only
 def type_all_match(*args, **kwords):
   """ match any type parameters """
   return True
 
+@interface_only
 def type_std_integer_match(*arg, **kwords):
   """ check that argument are all integers """
   return all(map(is_std_integer_format, arg))
 
+@interface_only
 def type_table_index_match(*arg, **kwords):
   """ check that argument are all integers """
   return all(map(is_table_index_format, arg))
@@ -915,6 +925,8 @@ class type_strict_match(object):
         as arguments were given to the initializer (minus one for the result)
         AND if the node precision matches the first format argument, and if each
         node's argument matches the other format arguments respectively """
+    interface_only = True
+
     def __init__(self, *type_tuple):
         """ check that argument and constrain type match strictly """
         self.type_tuple = type_tuple
@@ -927,6 +939,8 @@ class type_strict_match_list(object):
     """ Build a type matching predicate from list of formats,
         result and operands must match one of the item of the list formats
         corresponding to their position """
+    interface_only = True
+
     def __init__(self, *type_tuple_list):
         """ check that argument and constrain type match strictly """
         self.type_tuple_list = type_tuple_list
@@ -945,11 +959,13 @@ def type_strict_match_or_list(type_tuple_list):
             if constraint_tuple == arg_tuple:
                 return True
         return False
-    return match_function
+    return interface_only(match_function)
 
 class type_fixed_match(object):
     """ type_strict_match + match any instance of ML_Fixed_Format to 
         ML_Fixed_Format descriptor """
+    interface_only = True
+
     def __init__(self, *type_tuple):
         self.type_tuple = type_tuple
 
@@ -959,6 +975,8 @@ class type_fixed_match(object):
 class type_custom_match(object):
     """ Callable class that checks whether all arguments match with their
         respective custom matching function. """
+    interface_only = True
+
     def __init__(self, *type_tuple):
         self.type_tuple = type_tuple
 
@@ -973,6 +991,8 @@ class type_custom_match(object):
 
 class type_relax_match(object):
     """ implement a relaxed type comparison including ML_Exact as possible true answer """
+    interface_only = True
+
     def __init__(self, *type_tuple):
         self.type_tuple = type_tuple
 
@@ -984,6 +1004,8 @@ class type_relax_match(object):
         # return reduce(lambda acc, v: acc and (v[0] == v[1] or v[1] == ML_Exact), zip(self.type_tuple, arg_tuple))
 
 class type_result_match(object):
+    interface_only = True
+
     def __init__(self, result_type):
         self.result_type = result_type
 
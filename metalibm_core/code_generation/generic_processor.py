@@ -41,6 +41,7 @@ from ..core.ml_formats import *
 from ..core.ml_table import *
 from ..core.ml_operations import *
 from ..core.legalizer import min_legalizer, max_legalizer
+from ..core.latency_model import LatencyModel
 
 from ..core.multi_precision import (
     legalize_mp_2elt_comparison, legalize_mp_3elt_comparison
@@ -1156,6 +1157,11 @@ class GenericProcessor(AbstractBackend):
     
     return [" -I{} ".format(support_lib_dir)]
 
+  ## Return the latency/throughput model of @p self arithmetic operations
+  #  (used to compare evaluation schemes)
+  def get_latency_model(self):
+    return LatencyModel()
+
 
 if __name__ == "__main__":
     print(FunctionOperator("ml_is_nan_or_inff", arity = 1).arg_map)
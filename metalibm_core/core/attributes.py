@@ -114,6 +114,7 @@ class ML_AdvancedDebug(ML_Debug):
 
 ## Object to keep track of ML's node accross the several optimizations passes
 class Handle(object):
+    __slots__ = ("node",)
     def __init__(self, node = None):
         self.node = node
 
@@ -137,23 +138,44 @@ class AttributeCtor:
     return self.build_function(attr_init(init_map, self.name, self.default_value, required = self.required))
 
 ## Base class to store Node's attributes
+#  Frequently set attributes are stored in slots, the others are stored in a
+#  per-object sparse map (allocated when a non-default value is first set),
+#  their default values being shared in Attributes.sparse_default_map
 class Attributes(object):
     """ Attribute management class for Metalibm's Operation """
+    __slots__ = (
+        "precision", "interval", "tag", "silent", "rounding_mode",
+        "handle", "owner", "sparse_map",
+    )
     default_precision     = [None]
     default_rounding_mode = [None]
     default_silent        = [None]
     str_del               = "| "
     dynamic_attribute_map = {}
+    # default values of the attributes not stored in slots
+    sparse_default_map = {
+        "debug": None,
+        "exact": None,
+        "max_abs_error": None,
+        "clearprevious": None,
+        "rounding_mode_dependant": None,
+        "prevent_optimization": None,
+        "unbreakable": False,
+    }
 
     ## allow to add a new dynamic attribute
     @staticmethod
     def add_dyn_attribute(attr_ctor):
       Attributes.dynamic_attribute_map[attr_ctor.get_name()] = attr_ctor
+      Attributes.sparse_default_map.setdefault(attr_ctor.get_name(), None)
 
     def get_dyn_attribute(self, attr_name):
       return getattr(self, attr_name)
 
     def __init__(self, **init_map):
+        self.sparse_map = None
+        # node owning the attributes (target of the lazily allocated handle)
+        self.owner = None
         self.precision  = attr_init(init_map, "precision", Attributes.default_precision[0])
         self.interval   = attr_init(init_map, "interval")
         self.debug      = attr_init(init_map, "debug")
@@ -161,16 +183,58 @@ class Attributes(object):
         self.tag        = attr_init(init_map, "tag")
         self.max_abs_error = attr_init(init_map, "max_abs_error")
         self.silent     = attr_init(init_map, "silent", Attributes.default_silent[0])
-        self.handle     = attr_init(init_map, "handle", Handle())
+        # handle is allocated on first access (see get_handle)
+        self.handle     = attr_init(init_map, "handle")
         self.clearprevious = attr_init(init_map, "clearprevious")
         # rounding mode (if applicable) of the operation
         self.rounding_mode = attr_init(init_map, "rounding_mode", Attributes.default_rounding_mode[0])
-        self.rounding_mode_dependant = None
         self.prevent_optimization = attr_init(init_map, "prevent_optimization")
         self.unbreakable  = attr_init(init_map, "unbreakable", False)
         for dyn_attr in Attributes.dynamic_attribute_map:
           self.__setattr__(dyn_attr, Attributes.dynamic_attribute_map[dyn_attr].attr_init(init_map))
 
+    def __getattr__(self, attr_name):
+        """ lookup of the attributes not stored in slots """
+        if attr_name == "sparse_map":
+            # slot not initialized yet (e.g. during unpickling)
+            raise AttributeError(attr_name)
+        sparse_map = self.sparse_map
+        if not sparse_map is None and attr_name in sparse_map:
+            return sparse_map[attr_name]
+        try:
+            return Attributes.sparse_default_map[attr_name]
+        except KeyError:
+            raise AttributeError(attr_name)
+
+    def __setattr__(self, attr_name, value):
+        if attr_name in Attributes.__slots__:
+            object.__setattr__(self, attr_name, value)
+            return
+        sparse_map = self.sparse_map
+        if attr_name in Attributes.sparse_default_map and value is Attributes.sparse_default_map[attr_name]:
+            # default values are not stored
+            if not sparse_map is None:
+                sparse_map.pop(attr_name, None)
+            return
+        if sparse_map is None:
+            sparse_map = {}
+            object.__setattr__(self, "sparse_map", sparse_map)
+        sparse_map[attr_name] = value
+
+    def get_attribute_map(self):
+        """ return a dict of every attribute value (suitable as
+            constructor keyword arguments) """
+        attribute_map = dict(
+            (attr_name, getattr(self, attr_name)) for attr_name in Attributes.sparse_default_map
+        )
+        if not self.sparse_map is None:
+            attribute_map.update(self.sparse_map)
+        attribute_map.update(
+            precision=self.precision, interval=self.interval, tag=self.tag,
+            silent=self.silent, rounding_mode=self.rounding_mode,
+            handle=self.get_handle()
+        )
+        return attribute_map
 
     def get_str(self, tab_level = 0):
         """ string conversion for operation graph 
@@ -190,7 +254,7 @@ class Attributes(object):
           tag = self.tag, 
           max_abs_error = self.max_abs_error, 
           silent = self.silent, 
-          handle = self.handle, 
+          handle = self.get_handle(), 
           clearprevious = self.clearprevious, 
           rounding_mode = self.rounding_mode, 
           prevent_optimization = self.prevent_optimization
@@ -201,7 +265,7 @@ class Attributes(object):
         return copied_attibute
 
     def get_light_copy(self):
-        return Attributes(precision = self.precision, debug = self.debug, tag = self.tag, silent = self.silent, handle = self.handle, clearprevious = self.clearprevious, rounding_mode = self.rounding_mode, prevent_optimization = self.prevent_optimization)
+        return Attributes(precision = self.precision, debug = self.debug, tag = self.tag, silent = self.silent, handle = self.get_handle(), clearprevious = self.clearprevious, rounding_mode = self.rounding_mode, prevent_optimization = self.prevent_optimization)
 
     def set_attr(self, **init_map):
         """ generic attribute setter """
@@ -268,7 +332,9 @@ class Attributes(object):
         """ handle setter """
         self.handle = new_handle
     def get_handle(self):
-        """ handle getter """
+        """ handle getter (the handle is allocated on first access) """
+        if self.handle is None:
+            self.handle = Handle(self.owner)
         return self.handle
 
     def get_clearprevious(self):
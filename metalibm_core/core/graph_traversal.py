@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Explicit-stack traversals of operation graphs
+
+    Recursive walkers hit python's recursion limit on deep graphs (e.g.
+    wide RTL operators) and pay the cost of one python frame per node.
+    The iterators of this module traverse a graph with an explicit work
+    list while yielding nodes in the same order as the equivalent
+    recursive walk (inputs being visited from first to last).
+
+    Traversal customization:
+        input_getter(node) returns the list of nodes to be traversed
+            from <node>; it is called exactly once per node, when the node
+            is first reached (before any of its inputs is traversed), so
+            it can also be used as a pre-visit hook.
+        skip(node) is tested when a node is reached, a node for which it
+            returns True is neither expanded nor yielded (it is generally
+            used to test a pass memoization map).
+        visited is the set of already reached nodes, it can be shared
+            between several traversals.
+"""
+
+
+def get_node_inputs(node):
+    """ default input getter: operands of <node> (leaf nodes
+        have no inputs attribute) """
+    return getattr(node, "inputs", ())
+
+
+def iterate_post_order_with_context(root_list, input_getter, visited=None, skip=None):
+    """ Post-order traversal carrying a context along edges.
+        <root_list> is a list of (node, context) pairs, input_getter(node,
+        context) returns the list of (input, input_context) pairs of
+        node. Yields (node, context) once all its inputs have been
+        yielded; each node is yielded once, with the context of the first
+        path which reached it """
+    visited = set() if visited is None else visited
+    for root, root_context in root_list:
+        if root in visited or (skip and skip(root)):
+            continue
+        visited.add(root)
+        stack = [(root, root_context, iter(input_getter(root, root_context)))]
+        while stack:
+            node, context, input_iter = stack[-1]
+            for op, op_context in input_iter:
+                if not op in visited and not (skip and skip(op)):
+                    visited.add(op)
+                    stack.append((op, op_context, iter(input_getter(op, op_context))))
+                    break
+            else:
+                stack.pop()
+                yield node, context
+
+
+def iterate_post_order(root_list, input_getter=get_node_inputs, visited=None, skip=None):
+    """ yield every node reachable from <root_list>, each node being
+        yielded after all its inputs (inputs first order) """
+    for node, _ in iterate_post_order_with_context(
+            [(root, None) for root in root_list],
+            lambda node, _: [(op, None) for op in input_getter(node)],
+            visited=visited, skip=skip):
+        yield node
+
+
+def iterate_pre_order(root_list, input_getter=get_node_inputs, visited=None, skip=None):
+    """ yield every node reachable from <root_list>, each node being yielded
+        before its inputs. input_getter is called after the node has been
+        yielded, so the consumer may modify a node's inputs before they are
+        traversed """
+    visited = set() if visited is None else visited
+    stack = list(reversed(root_list))
+    while stack:
+        node = stack.pop()
+        if node in visited or (skip and skip(node)):
+            continue
+        visited.add(node)
+        yield node
+        stack.extend(reversed(list(input_getter(node))))
+
+
+def walk_pre_order(root_list, expand):
+    """ Pre-order walk without memoization: expand(node, context) is called
+        on every (node, context) pair, in the order of the equivalent
+        recursive walk, and returns the list of (input, input_context)
+        pairs to walk next. A node reached through several paths is
+        expanded several times, expand is responsible for pruning """
+    stack = list(reversed(root_list))
+    while stack:
+        node, context = stack.pop()
+        stack.extend(reversed(list(expand(node, context))))
+
+
+def topological_sort(root_list, input_getter=get_node_inputs, users_first=False):
+    """ return the list of nodes reachable from <root_list> in topological
+        order: every node appears after its inputs (or before them if
+        <users_first> is set) """
+    node_list = list(iterate_post_order(root_list, input_getter))
+    if users_first:
+        node_list.reverse()
+    return node_list
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 17th, 2026
+# last-modified:    Oct 17th, 2026
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Latency/throughput model of arithmetic operations
+
+    Coarse per-target cost model (see get_latency_model of targets) used
+    to compare evaluation schemes (e.g. polynomial evaluation trees)
+    without building and benchmarking them. """
+
+class LatencyModel(object):
+    """ latency (in cycles) of floating-point operations and number of
+        such operations issued per cycle """
+    def __init__(self, add_latency=4, mul_latency=4, fma_latency=None, issue_width=1):
+        self.add_latency = add_latency
+        self.mul_latency = mul_latency
+        # None if the target has no fused multiply-add
+        self.fma_latency = fma_latency
+        # number of independent arithmetic operations issued per cycle
+        self.issue_width = issue_width
+
+    def has_fma(self):
+        return not self.fma_latency is None
+
+    def __str__(self):
+        return "LatencyModel(add={}, mul={}, fma={}, issue_width={})".format(
+            self.add_latency, self.mul_latency, self.fma_latency, self.issue_width)
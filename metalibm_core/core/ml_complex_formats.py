@@ -72,6 +72,19 @@ class ML_Pointer_Format(ML_Format):
   def get_data_precision(self):
     return self.data_precision
 
+class ML_Restrict_Pointer_Format(ML_Pointer_Format):
+  """ restrict-qualified pointer format, the pointed data can also be
+      const-qualified """
+  def __init__(self, data_precision, const = False):
+    ML_Pointer_Format.__init__(self, data_precision)
+    self.const = const
+
+  def get_name(self, language = C_Code):
+    return "%s%s* restrict" % (
+      "const " if self.const else "",
+      self.get_data_precision().get_name(language)
+    )
+
 def is_pointer(_format):
   """ boolean test to check whether _format is a pointer _format """
   return isinstance(_format, ML_Pointer_Format)
@@ -313,7 +313,8 @@ class ML_EntityBasis(object):
       self.vhdl_code_generator.set_debug_code_object(self.debug_code_object)
 
     # pass scheduler instanciation
-    self.pass_scheduler = PassScheduler()
+    self.pass_scheduler = PassScheduler(profile=not arg_template.pass_profile is None)
+    self.pass_profile = arg_template.pass_profile
     # recursive pass dependency
     pass_dep = PassDependency()
     for pass_uplet in arg_template.passes:
@@ -558,6 +559,8 @@ class ML_EntityBasis(object):
       PassScheduler.JustBeforeCodeGen,
       entity_execute_pass
     )
+    if not self.pass_profile is None:
+      self.pass_scheduler.report_profile(None if self.pass_profile == "-" else self.pass_profile)
 
     # generate VHDL code to implement scheme
     self.generate_code(code_entity_list, language = self.language)
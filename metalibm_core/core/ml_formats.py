@@ -1311,6 +1311,8 @@ VECTOR_TYPE_MAP = {
 ###############################################################################
 
 ML_Void = ML_FormatConstructor(0, "void", "ERROR", lambda _: None)
+## C's size_t (array sizes)
+ML_SizeT = ML_FormatConstructor(64, "size_t", "%zu", lambda _, value: "%d" % value)
 
 
 class FP_Context(object):
@@ -33,20 +33,25 @@
 # author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
 ###############################################################################
 
+import copy
+import ctypes
+import inspect
 import os
 import random
 import subprocess
+import sys
 
 from sollya import *
 
 from metalibm_core.core.ml_formats import *
 from metalibm_core.core.ml_optimization_engine import OptimizationEngine
 from metalibm_core.core.ml_operations import *
-from metalibm_core.core.ml_table import ML_NewTable
-from metalibm_core.core.ml_complex_formats import ML_Mpfr_t
+from metalibm_core.core.ml_table import ML_NewTable, ML_MappedTable
+from metalibm_core.core.ml_complex_formats import ML_Mpfr_t, ML_Restrict_Pointer_Format
 from metalibm_core.core.ml_call_externalizer import CallExternalizer
 from metalibm_core.core.ml_vectorizer import StaticVectorizer
 from metalibm_core.core.precisions import *
+from metalibm_core.core.polynomials import PolynomialSchemeSelector
 
 from metalibm_core.code_generation.code_object import (
     NestedCode, CodeObject, LLVMCodeObject, MultiSymbolTable
@@ -74,9 +79,14 @@ from metalibm_core.opt.p_function_typing import (
 from metalibm_core.code_generation.gappa_code_generator import GappaCodeGenerator
 
 from metalibm_core.utility.log_report import Log
+from metalibm_core.utility.gappa_utils import is_gappa_installed
 from metalibm_core.utility.debug_utils import *
 from metalibm_core.utility.ml_template import DefaultArgTemplate
-from metalibm_core.utility.build_utils import SourceFile
+from metalibm_core.utility.build_utils import SourceFile, BuildProject
+from metalibm_core.utility.multi_target import host_supports_target, generate_dispatcher_source
+from metalibm_core.utility.test_vector_file import write_test_vector_file
+from metalibm_core.utility.test_reference import compute_reference_values
+from metalibm_core.utility.error_analysis import get_error_analysis
 
 
 
@@ -93,6 +103,28 @@ class ValidError(Exception):
     pass
 
 
+class MPFRReferenceTable(object):
+    """ Stand-in for the output table of a test wrapper when expected
+        values are computed at run time with MPFR
+        (--auto-test-reference mpfr) """
+    def __init__(self, input_table, reference_function_list):
+        """ Args:
+                input_table: table of test inputs
+                reference_function_list: list of FunctionObject computing
+                    each expected output value from a test input """
+        self.input_table = input_table
+        self.reference_function_list = reference_function_list
+
+    def get_reference_value(self, index, value_index):
+        """ return the operation computing expected value @p value_index
+            of test @p index """
+        input_value = TableLoad(
+            self.input_table, index,
+            precision=self.input_table.get_storage_precision()
+        )
+        return self.reference_function_list[value_index](input_value)
+
+
 ## standardized function name geneation
 #  @param base_name string name of the mathematical function
 #  @param io_precisions list of output, input formats (outputs followed by inputs)
@@ -142,14 +174,29 @@ class ML_FunctionBasis(object):
     # XOR -> None to select [se;f.precision] * self.get_arity()
     self.input_precisions = [self.precision] * self.get_arity() if args.input_precisions is None else args.input_precisions
 
+    # exhaustive test (every binary32 input) rather than random test cases
+    self.exhaustive_test = args.exhaustive_test
+    self.exhaustive_threads = args.exhaustive_threads
+    self.exhaustive_failure_num = args.exhaustive_failure_num
     # enable the generation of numeric/functionnal auto-test
-    self.auto_test_enable = (args.auto_test != False or args.auto_test_std != False)
+    self.auto_test_enable = (args.auto_test != False or args.auto_test_std != False or self.exhaustive_test)
     self.auto_test_number = args.auto_test
     self.auto_test_range = args.auto_test_range
     self.auto_test_std   = args.auto_test_std 
+    self.auto_test_file  = args.auto_test_file
+    # source of expected test outputs: python (sollya) or mpfr (at run time)
+    self.auto_test_reference = args.auto_test_reference
 
     # enable the computation of maximal error during functional testing
     self.compute_max_error = args.compute_max_error
+    # ulp error analysis of functional tests (histograms, worst cases),
+    # results are stored in error_analysis_result after execution
+    self.error_analysis = args.error_analysis
+    self.error_analysis_dump = args.error_analysis_dump
+    self.error_analysis_result = None
+    # shared object loaded by --execute (LoadedBinary), can be used to
+    # evaluate the generated function from python (e.g. NumpyHarness)
+    self.loaded_binary = None
     self.break_error = args.break_error
 
     # enable and configure the generation of a performance bench
@@ -161,6 +208,9 @@ class ML_FunctionBasis(object):
 
     # source building
     self.build_enable = args.build_enable
+    # number of functions per translation unit (None: single source file)
+    self.build_split = args.build_split
+    self.build_jobs = args.build_jobs
     # binary execution
     self.execute_trigger = args.execute_trigger
 
@@ -179,6 +229,15 @@ class ML_FunctionBasis(object):
 
     self.vector_size = args.vector_size
     self.sub_vector_size = args.sub_vector_size
+    # array entry point (CodeFunction) and scalar implementation used for
+    # its tail when the main implementation is vectorized
+    self.array_entry = args.array_entry
+    self.array_implementation = None
+    self.scalar_implementation = None
+    # multi-versioning: list of targets (None: single target generation),
+    # variants are generated from a copy of args
+    self.multi_target = args.multi_target
+    self.args = args
 
     # TODO: FIX which i/o precision to select
     # TODO: incompatible with fixed-point formats
@@ -234,8 +293,10 @@ class ML_FunctionBasis(object):
             PassScheduler.Typing,
             PassScheduler.Optimization, 
             PassScheduler.JustBeforeCodeGen
-        ]
+        ],
+        profile=not args.pass_profile is None
     )
+    self.pass_profile = args.pass_profile
 
 
     Log.report(Log.Info, "inserting sub-expr sharing pass\n")
@@ -357,6 +418,31 @@ class ML_FunctionBasis(object):
   def generate_emulate(self):
     raise NotImplementedError
 
+  ## @return True if the meta-function overloads generate_emulate with
+  #          the (result_ternary, result, mpfr_x, mpfr_rnd) signature
+  #          (MPFR emulation is available)
+  def has_mpfr_emulate(self):
+    base_emulate = ML_FunctionBasis.generate_emulate
+    if getattr(self.generate_emulate, "__func__", None) is getattr(base_emulate, "__func__", base_emulate):
+      return False
+    # some meta-functions implement a legacy generate_emulate(result,
+    # mpfr_x, mpfr_rnd) without ternary output
+    if sys.version_info >= (3, 0):
+      parameter_list = inspect.signature(self.generate_emulate).parameters.values()
+      if any(parameter.kind == parameter.VAR_POSITIONAL for parameter in parameter_list):
+        return True
+      arg_num = len([
+        parameter for parameter in parameter_list
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)
+      ])
+    else:
+      arg_spec = inspect.getargspec(self.generate_emulate)
+      if not arg_spec.varargs is None:
+        return True
+      # bound method: self is listed
+      arg_num = len(arg_spec.args) - 1
+    return arg_num >= 4
+
   ## generation the wrapper to the emulation code
   #  @param test_input Variable where the test input is read from
   #  @param mpfr_rnd Variable object used as precision paramater for mpfr calls
@@ -433,6 +519,58 @@ class ML_FunctionBasis(object):
     return scheme
 
 
+  def generate_fastest_polynomial_scheme(self, polynomial_object, variable,
+                                         error_bound=None, unified_precision=None,
+                                         independent_evaluation_num=None):
+    """ return the evaluation scheme of @p polynomial_object on
+        @p variable with the lowest estimated cost (target latency model)
+        whose evaluation error (proved by gappa over variable's interval)
+        is at most @p error_bound
+
+        Candidates are Horner's and Estrin's schemes and hybrid schemes
+        (Estrin splits at various depths, Horner below), see
+        PolynomialSchemeSelector. independent_evaluation_num (number of
+        overlapping evaluations) defaults to the vector size. """
+    unified_precision = unified_precision or variable.get_precision()
+    selector = PolynomialSchemeSelector(
+        self.processor.get_latency_model(), fuse_fma=self.fuse_fma,
+        independent_evaluation_num=independent_evaluation_num or self.get_vector_size()
+    )
+    candidate_list = selector.get_candidate_list(polynomial_object, variable, unified_precision)
+    if error_bound is None:
+        return candidate_list[0].scheme
+    if not is_gappa_installed():
+        Log.report(Log.Warning, "gappa is not installed, polynomial scheme evaluation error is not checked")
+        return candidate_list[0].scheme
+
+    # every candidate evaluation error is proved concurrently,
+    # any gappa failure rejects the candidate
+    gappa_variable = Variable(
+        variable.get_tag() or "x", precision=variable.get_precision(), interval=variable.get_interval())
+    error_future_map = {}
+    for candidate in candidate_list:
+        optimized_scheme = self.optimise_scheme(candidate.scheme, copy={variable: variable})
+        try:
+            error_future_map[candidate] = self.gappa_engine.get_eval_error_v2_async(
+                self.opt_engine, optimized_scheme, {variable: gappa_variable},
+                gappa_filename="{}_poly_{}.g".format(self.function_name, candidate.name)
+            )
+        except Exception as e:
+            Log.report(Log.Warning, "unable to compute evaluation error of {} scheme: {}", candidate.name, e)
+
+    def accept(candidate):
+        if not candidate in error_future_map:
+            return False
+        try:
+            eval_error = error_future_map[candidate].result()
+        except Exception as e:
+            Log.report(Log.Warning, "unable to compute evaluation error of {} scheme: {}", candidate.name, e)
+            return False
+        Log.report(Log.Info, "{} scheme: evaluation error {}", candidate, eval_error)
+        return sup(abs(eval_error)) <= error_bound
+
+    return selector.select(candidate_list, accept=accept).scheme
+
   ##
   #  @return main code object associted with function implementation
   def get_main_code_object(self):
@@ -513,6 +651,86 @@ class ML_FunctionBasis(object):
     output_stream.write(self.result.get(self.main_code_generator))
     output_stream.close()
 
+  ## generate a standalone C source file
+  #  @param source_name name of the generated source file
+  #  @param declared_group FunctionGroup whose functions are declared
+  #  @param defined_group FunctionGroup whose functions are defined
+  #  @param optimization_level compiler optimization level of the source
+  #  @return SourceFile
+  def generate_C_source_file(self, source_name, declared_group, defined_group, optimization_level="-O2", language=C_Code, library_list=None):
+    """ Generate a C source file defining the functions of @p defined_group
+        and declaring every function of @p declared_group. Constants and
+        tables are defined (static) in the source file using them, so several
+        such files can be linked together """
+    # dedicated code generator so memoized code is not shared between sources
+    code_generator = self.get_codegen_class(language)(
+        self.processor, declare_cst=False, disable_debug=not self.debug_flag,
+        libm_compliant=self.libm_compliant, language=language
+    )
+    code_generator.static_symbols = True
+    code_object = NestedCode(
+        code_generator, static_cst=True,
+        uniquifier="{0}_".format(self.function_name),
+        code_ctor=self.get_codeobject_ctor(language),
+        shared_symbol_list=[
+            MultiSymbolTable.ConstantSymbol,
+            MultiSymbolTable.TableSymbol,
+            MultiSymbolTable.FunctionSymbol,
+            MultiSymbolTable.EntitySymbol
+        ])
+    for header in self.main_code_object.main_code.header_list:
+        code_object.add_header(header)
+    declared_group.apply_to_all_functions(
+        lambda fct_group, fct: fct.add_declaration(code_generator, language, code_object)
+    )
+    defined_group.apply_to_all_functions(
+        lambda fct_group, fct: fct.add_definition(code_generator, language, code_object, static_cst=True)
+    )
+    code_object.add_header("support_lib/ml_special_values.h")
+    code_object.add_header("math.h")
+    code_object.add_header("stdio.h")
+    code_object.add_header("inttypes.h")
+
+    Log.report(Log.Info, "Generating C code in " + source_name)
+    with open(source_name, "w") as output_stream:
+        output_stream.write(code_object.get(code_generator))
+    return SourceFile(source_name, defined_group, optimization_level=optimization_level, library_list=library_list)
+
+  ## @return list of the libraries required to link the test/bench harness
+  def get_harness_library_list(self):
+    if self.auto_test_enable and self.exhaustive_test:
+      return ["mpfr", "gmp", "pthread"]
+    if self.auto_test_enable and self.auto_test_reference == "mpfr":
+      return ["mpfr", "gmp"]
+    return []
+
+  ## generate C code for function implementation split into several
+  #  translation units (which can be compiled concurrently)
+  #  @param function_group FunctionGroup to be generated
+  #  @param function_num maximal number of functions per translation unit
+  #  @param declared_group FunctionGroup of extra functions to be declared
+  #  @return list of SourceFile (one per translation unit)
+  def generate_translation_units(self, function_group, function_num=1, declared_group=None, language=C_Code):
+    """ Generate one C source file for each group of (at most) @p function_num
+        functions of @p function_group. Every unit declares all the functions
+        of the group """
+    full_group = FunctionGroup().merge_with_group(function_group, demote_sub_core=False)
+    if not declared_group is None:
+        full_group.merge_with_group(declared_group, demote_sub_core=False)
+    output_prefix, output_ext = os.path.splitext(self.output_file)
+    return [
+        self.generate_C_source_file(
+            "{}_tu{}{}".format(output_prefix, tu_index, output_ext),
+            full_group, tu_group, language=language
+        ) for tu_index, tu_group in enumerate(function_group.split(function_num))
+    ]
+
+  ## @return name of the source file where test and bench harness
+  #          are generated
+  def get_harness_file(self):
+    output_prefix, output_ext = os.path.splitext(self.output_file)
+    return "{}_harness{}".format(output_prefix, output_ext)
+
   def gen_implementation(self, display_after_gen=False,
                          display_after_opt=False,
                          enable_subexpr_sharing=True):
@@ -525,6 +743,14 @@ class ML_FunctionBasis(object):
                optimization
 
         """
+    if self.multi_target:
+        self.gen_multi_target_implementation(
+            display_after_gen=display_after_gen,
+            display_after_opt=display_after_opt,
+            enable_subexpr_sharing=enable_subexpr_sharing
+        )
+        return
+
     # generate scheme
     function_group = self.generate_function_list()
 
@@ -553,6 +779,9 @@ class ML_FunctionBasis(object):
             scalar_scheme, scalar_arg_list, self.get_vector_size()
         )
 
+    if self.array_entry:
+        function_group.add_core_function(self.generate_array_function())
+
     # format instantiation
     Log.report(Log.Info, "Applying <Typing> stage passes")
     _ = self.pass_scheduler.get_full_execute_from_slot(
@@ -576,10 +805,18 @@ class ML_FunctionBasis(object):
         PassScheduler.JustBeforeCodeGen,
         execute_pass_on_fct_group
     )
+    if not self.pass_profile is None:
+        self.pass_scheduler.report_profile(None if self.pass_profile == "-" else self.pass_profile)
 
     main_pre_statement = Statement()
     main_statement = Statement()
 
+    # test and bench wrappers (and their data tables) are generated in a
+    # dedicated source file, compiled without optimization, so that the
+    # function under test keeps its own compilation flags
+    separate_harness = self.language is C_Code
+    harness_group = FunctionGroup() if separate_harness else function_group
+
     CstError = Constant(1, precision=ML_Int32)
     CstSuccess = Constant(0, precision=ML_Int32)
 
@@ -602,13 +839,17 @@ class ML_FunctionBasis(object):
 
     # generate auto-test wrapper
     if self.auto_test_enable:
-        auto_test_function_group = self.generate_test_wrapper(
-            test_num = self.auto_test_number if self.auto_test_number else 0,
-            test_range = self.auto_test_range
-        )
-        auto_test_function_group.apply_to_all_functions(add_fct_call_check_in_main)
-        # appending auto-test wrapper to general code_function_list
-        function_group.merge_with_group(auto_test_function_group)
+        if self.exhaustive_test:
+            auto_test_function_group = self.generate_exhaustive_test_wrapper()
+        else:
+            auto_test_function_group = self.generate_test_wrapper(
+                test_num = self.auto_test_number if self.auto_test_number else 0,
+                test_range = self.auto_test_range
+            )
+        # sub-functions (e.g. MPFR emulation) are only called by the test wrapper
+        auto_test_function_group.apply_to_core_functions(add_fct_call_check_in_main)
+        # appending auto-test wrapper to harness code_function_list
+        harness_group.merge_with_group(auto_test_function_group)
 
     if self.bench_enabled:
         bench_function_group = self.generate_bench_wrapper(
@@ -622,8 +863,8 @@ class ML_FunctionBasis(object):
         bench_function_group.apply_to_all_functions(
             lambda fct_group, cf: add_fct_call_check_in_main(fct_group, cf, bench_check)
         )
-        # appending bench wrapper to general code_function_list
-        function_group.merge_with_group(bench_function_group)
+        # appending bench wrapper to harness code_function_list
+        harness_group.merge_with_group(bench_function_group)
 
     # adding main function
     if self.bench_enabled or self.auto_test_enable:
@@ -635,18 +876,40 @@ class ML_FunctionBasis(object):
                 Return(CstSuccess)
             )
         )
-        function_group.add_core_function(main_function)
+        harness_group.add_core_function(main_function)
 
     # generate C code to implement scheme
     self.generate_code(function_group, language=self.language)
 
+    harness_source = None
+    if separate_harness and (self.bench_enabled or self.auto_test_enable):
+        harness_source = self.generate_C_source_file(
+            self.get_harness_file(),
+            FunctionGroup().merge_with_group(function_group, demote_sub_core=False),
+            harness_group, optimization_level="-O0",
+            library_list=self.get_harness_library_list()
+        )
+
     build_trigger = self.build_enable or self.execute_trigger
     link_trigger = self.execute_trigger
 
     if build_trigger:
-        source_file = SourceFile(self.output_file, function_group)
         bin_name = "./testlib_%s.so" % self.function_name
-        bin_file = source_file.build(self.processor, bin_name, shared_object=True)
+        if self.build_split is None:
+            source_list = [SourceFile(self.output_file, function_group)]
+        else:
+            source_list = self.generate_translation_units(
+                function_group, self.build_split, declared_group=harness_group
+            )
+        if not harness_source is None:
+            source_list.append(harness_source)
+        if len(source_list) == 1:
+            bin_file = source_list[0].build(self.processor, bin_name, shared_object=True)
+        else:
+            bin_file = BuildProject(source_list).build(
+                self.processor, bin_name, shared_object=True,
+                job_num=self.build_jobs
+            )
 
         if bin_file is None:
             Log.report(Log.Error, "build failed: \n", error=BuildError())
@@ -657,6 +920,7 @@ class ML_FunctionBasis(object):
         # only executing if build was successful
         if not(bin_file is None) and self.execute_trigger:
             loaded_module = bin_file.load()
+            self.loaded_binary = loaded_module
             # test_command = " %s " % self.processor.get_execution_command(test_file)
             #Log.report(Log.Info, "VALIDATION {} command line: {}".format(
             #    self.get_name(), test_command
@@ -666,6 +930,9 @@ class ML_FunctionBasis(object):
                 print("imported cpe_measure={}".format(cpe_measure))
             if self.auto_test_enable:
                 test_result = loaded_module.get_function_handle("test_wrapper")()
+                if self.error_analysis:
+                    self.error_analysis_result = get_error_analysis(loaded_module)
+                    Log.report(Log.Info, "error analysis:\n{}", self.error_analysis_result)
                 if not test_result:
                     Log.report(Log.Info, "VALIDATION SUCCESS")
                 else:
@@ -673,6 +940,66 @@ class ML_FunctionBasis(object):
 
 
 
+  def gen_multi_target_implementation(self, **kwords):
+    """ generate a variant <function>_<target name> of @p self for each
+        target of self.multi_target (each in its own source file, validated
+        by its own auto-test when the host cpu supports the target) and a
+        dispatcher (self.output_file) exposing <function> (and
+        <function>_array) which selects the best variant supported by the
+        cpu at load time """
+    output_prefix, output_ext = os.path.splitext(self.output_file)
+    variant_object_list = []
+    for target in self.multi_target:
+        suffix = target.target_name
+        host_support = host_supports_target(target)
+        variant_args = copy.copy(self.args)
+        variant_args.multi_target = None
+        variant_args.target = target
+        variant_args.function_name = "{}_{}".format(self.function_name, suffix)
+        variant_args.output_file = "{}_{}{}".format(output_prefix, suffix, output_ext)
+        # variants the host cpu can not execute are only built
+        variant_args.build_enable = self.build_enable or self.execute_trigger
+        variant_args.execute_trigger = self.execute_trigger and host_support
+        if self.execute_trigger and not host_support:
+            Log.report(Log.Warning, "host cpu does not support target {}: variant is not tested", suffix)
+        Log.report(Log.Info, "generating variant for target {}", suffix)
+        variant_object = self.__class__(variant_args)
+        variant_object.gen_implementation(**kwords)
+        variant_object_list.append(variant_object)
+
+    variant_list = [(variant.processor, variant.processor.target_name) for variant in variant_object_list]
+    entry_list = [(
+        self.function_name,
+        variant_object_list[0].implementation,
+        dict((variant.processor.target_name, variant.implementation.get_name()) for variant in variant_object_list)
+    )]
+    if self.array_entry:
+        entry_list.append((
+            "{}_array".format(self.function_name),
+            variant_object_list[0].array_implementation,
+            dict((variant.processor.target_name, variant.array_implementation.get_name()) for variant in variant_object_list)
+        ))
+    with open(self.output_file, "w") as dispatcher_stream:
+        dispatcher_stream.write(generate_dispatcher_source(entry_list, variant_list))
+
+    if self.build_enable or self.execute_trigger:
+        source_list = [
+            SourceFile(variant.output_file, FunctionGroup([variant.implementation]), target=variant.processor)
+            for variant in variant_object_list
+        ] + [SourceFile(self.output_file, FunctionGroup())]
+        bin_file = BuildProject(source_list).build(
+            self.processor, "./lib{}.so".format(self.function_name),
+            shared_object=True, job_num=self.build_jobs
+        )
+        if bin_file is None:
+            Log.report(Log.Error, "multi-target build failed: \n", error=BuildError())
+        elif self.execute_trigger:
+            self.loaded_binary = bin_file.load()
+            get_variant = self.loaded_binary.loaded_module["{}_get_variant".format(self.function_name)]
+            get_variant.restype = ctypes.c_char_p
+            Log.report(Log.Info, "dispatcher selects variant {}", get_variant().decode())
+
+
   ## externalized an optree: generate a CodeFunction which compute the 
   #  given optree inside a sub-function and returns it as a result
   # @param optree ML_Operation object to be externalized
@@ -806,6 +1133,7 @@ class ML_FunctionBasis(object):
     scalar_scheme.set_tag("scalar_scheme")
 
     scalar_callback          = scalar_callback_function.get_function_object()
+    self.scalar_implementation = scalar_callback_function
 
     Log.report(Log.Info, "[SV] vectorizing scheme")
     vec_arg_list, vector_scheme, vector_mask = \
@@ -856,6 +1184,54 @@ class ML_FunctionBasis(object):
     Log.report(Log.Info, "[SV] end of generate_vector_implementation")
     return FunctionGroup([self.implementation], [scalar_callback_function])
 
+  def generate_array_function(self):
+    """ generate the array entry point of @p self implementation:
+          void <function>_array(const T* restrict in, T* restrict out, size_t n)
+        (inputs are named in0, in1, ... for multi-input functions)
+        which evaluates the vector implementation on the largest multiple
+        of the vector size and the scalar implementation on the tail
+        (see support_lib/ml_array_function.h) """
+    arity = self.get_arity()
+    if self.language != C_Code or arity > 3:
+      Log.report(Log.Error, "array entry point is only supported for C functions with at most 3 inputs")
+    array_function = CodeFunction(
+      "{}_array".format(self.implementation.get_name()), output_format = ML_Void
+    )
+    input_name_list = ["in"] if arity == 1 else ["in%d" % i for i in range(arity)]
+    input_list = [
+      array_function.add_input_variable(
+        input_name, ML_Restrict_Pointer_Format(self.get_input_precision(i), const = True)
+      ) for i, input_name in enumerate(input_name_list)
+    ]
+    output = array_function.add_input_variable("out", ML_Restrict_Pointer_Format(self.get_output_precision()))
+    size = array_function.add_input_variable("n", ML_SizeT)
+    array_arg_list = input_list + [output, size]
+
+    vector_function = self.implementation
+    scalar_function = self.scalar_implementation if self.get_vector_size() != 1 else self.implementation
+    # vector operand and result formats (C type names)
+    format_list = [arg.get_precision() for arg in vector_function.get_arg_list()] + [vector_function.get_output_format()]
+    arg_map = {
+      0: vector_function.get_name(),
+      1: scalar_function.get_name(),
+      2: str(self.get_vector_size()),
+    }
+    for precision in format_list:
+      arg_map[len(arg_map)] = precision.get_name(language = C_Code)
+    for index in range(len(array_arg_list)):
+      arg_map[len(arg_map)] = FO_Arg(index)
+    loop_name = "ML_ARRAY_LOOP_%d" % arity
+    loop_function = FunctionObject(
+      loop_name, [arg.get_precision() for arg in array_arg_list], ML_Void,
+      FunctionOperator(
+        loop_name, arg_map = arg_map, void_function = True,
+        require_header = ["support_lib/ml_array_function.h"]
+      )
+    )
+    array_function.set_scheme(Statement(loop_function(*array_arg_list)))
+    self.array_implementation = array_function
+    return array_function
+
 
   # Currently mostly empty, to be populated someday
   def gen_emulation_code(self, precode, code, postcode):
@@ -915,19 +1291,7 @@ class ML_FunctionBasis(object):
     sollya_precision = self.precision.get_sollya_object()
     interval_size = high_input - low_input 
 
-    input_tables = [
-      ML_NewTable(
-        dimensions = [test_total], 
-        storage_precision = self.get_input_precision(i), 
-        tag = self.uniquify_name("input_table_arg%d" % i)
-      ) for i in range(self.get_arity())
-    ]
-    ## output values required to check results are stored in output table
     num_output_value = self.accuracy.get_num_output_value()
-    output_table = ML_NewTable(dimensions = [test_total, num_output_value], storage_precision = self.precision, tag = self.uniquify_name("output_table"))
-
-    # general index for input/output tables
-    table_index = 0
 
     test_case_list = []
 
@@ -952,16 +1316,33 @@ class ML_FunctionBasis(object):
         input_list.append(input_value)
       test_case_list.append(tuple(input_list))
 
-    # generating output from the concatenated list
-    # of all inputs
-    for table_index, input_tuple in enumerate(test_case_list):
-      # storing inputs
-      for in_id in range(self.get_arity()):
-        input_tables[in_id][table_index] = input_tuple[in_id]
-      # computing and storing output values
-      output_values = self.accuracy.get_output_check_value(self, input_tuple)
-      for o in range(num_output_value):
-        output_table[table_index][o] = output_values[o]
+    # statement executed before the test loop
+    test_init = Statement()
+    # functions required by the test wrapper
+    test_sub_functions = []
+    if self.auto_test_reference == "mpfr":
+      if not self.auto_test_file is None:
+        Log.report(Log.Error, "--auto-test-file is not compatible with --auto-test-reference mpfr")
+      input_tables = self.generate_input_tables(test_case_list)
+      # expected values are computed at run time with MPFR
+      output_table, emulate_function = self.generate_mpfr_reference(input_tables)
+      test_sub_functions.append(emulate_function)
+    elif self.auto_test_file is None:
+      input_tables = self.generate_input_tables(test_case_list)
+      ## output values required to check results are stored in output table
+      output_table = ML_NewTable(dimensions = [test_total, num_output_value], storage_precision = self.precision, tag = self.uniquify_name("output_table"))
+
+      # generating output from the concatenated list
+      # of all inputs
+      output_value_list = compute_reference_values(self, test_case_list)
+      for table_index, output_values in enumerate(output_value_list):
+        for o in range(num_output_value):
+          output_table[table_index][o] = output_values[o]
+    else:
+      # test vectors are dumped into a binary file mapped at run time
+      input_tables, output_table = self.generate_test_vector_file(
+        self.auto_test_file, test_case_list, test_init
+      )
 
     if self.implementation.get_output_format().is_vector_format():
       # vector implementation test
@@ -970,14 +1351,280 @@ class ML_FunctionBasis(object):
       # scalar implemetation test
       test_loop = self.get_scalar_test_wrapper(test_total, tested_function, input_tables, output_table)
 
+    if self.error_analysis:
+      # the error analysis loop is executed before the test loop
+      # (which stops on the first failure)
+      test_init.add(self.get_error_analysis_statement(test_total, test_range, tested_function, input_tables, output_table))
+
     # common test scheme between scalar and vector functions
     test_scheme = Statement(
+      test_init,
       test_loop,
       printf_success_function(),
       Return(Constant(0, precision = ML_Int32))
     )
     auto_test.set_scheme(test_scheme)
-    return FunctionGroup([auto_test])
+    return FunctionGroup([auto_test], test_sub_functions)
+
+  ## build the loop measuring the error of every test
+  #  (see support_lib/ml_error_analysis.h)
+  #  @param test_num number of tests
+  #  @param test_range range of test inputs (sub-range histogram)
+  #  @return Statement
+  def get_error_analysis_statement(self, test_num, test_range, tested_function, input_tables, output_table):
+    format_suffix = {ML_Binary32: "binary32", ML_Binary64: "binary64"}
+    if not self.precision in format_suffix or self.get_input_precision(0) != self.precision:
+      Log.report(Log.Error, "--error-analysis is only supported for binary32 and binary64 functions")
+    def c_double_literal(value):
+      value = float(value)
+      if value != value or value in [float("inf"), float("-inf")]:
+        return "NAN" if value != value else ("INFINITY" if value > 0 else "-INFINITY")
+      return value.hex()
+    header = ["support_lib/ml_error_analysis.h"]
+    init_function = FunctionObject(
+      "ml_error_analysis_init", [], ML_Void,
+      FunctionOperator(
+        "ml_error_analysis_init",
+        arg_map = {
+          0: str(self.precision.get_bit_size()),
+          1: c_double_literal(inf(test_range)),
+          2: c_double_literal(sup(test_range))
+        }, void_function = True, require_header = header)
+    )
+    record_name = "ml_error_analysis_record_" + format_suffix[self.precision]
+    record_function = FunctionObject(
+      record_name, [ML_Int32] + [self.precision] * 4, ML_Void,
+      FunctionOperator(record_name, arg_map = dict((i, FO_Arg(i)) for i in range(5)), void_function = True, require_header = header)
+    )
+    function_name_str = "\"%s\"" % self.function_name
+    finish_statement = Statement(
+      FunctionObject(
+        "ml_error_analysis_report", [], ML_Void,
+        FunctionOperator("ml_error_analysis_report", arg_map = {0: function_name_str}, void_function = True, require_header = header)
+      )()
+    )
+    if not self.error_analysis_dump is None:
+      dump_str = "\"{}\"".format(
+        os.path.abspath(self.error_analysis_dump).replace("\\", "\\\\").replace("\"", "\\\""))
+      finish_statement.add(
+        FunctionObject(
+          "ml_error_analysis_dump", [], ML_Void,
+          FunctionOperator("ml_error_analysis_dump", arg_map = {0: dump_str}, void_function = True, require_header = header)
+        )()
+      )
+
+    def get_expected_interval(index):
+      output_values = [self.get_output_value_load(output_table, index, i) for i in range(self.accuracy.get_num_output_value())]
+      # correctly rounded accuracy: a single expected value
+      return output_values[0], output_values[-1]
+
+    vi = Variable("i", precision = ML_Int32, var_type = Variable.Local)
+    loop_increment = self.get_vector_size()
+    loop_body = Statement()
+    vector_format = self.implementation.get_output_format()
+    if vector_format.is_vector_format():
+      local_inputs = [
+        Variable("ea_vec_x_{}".format(i), precision = vector_format, var_type = Variable.Local)
+        for i in range(self.get_arity())
+      ]
+      for input_index, local_input in enumerate(local_inputs):
+        loop_body.push(local_input)
+        for k in range(self.get_vector_size()):
+          loop_body.push(ReferenceAssign(VectorElementSelection(local_input, k), TableLoad(input_tables[input_index], vi + k)))
+      local_result = tested_function(*local_inputs)
+      for k in range(self.get_vector_size()):
+        expected_low, expected_high = get_expected_interval(vi + k)
+        loop_body.push(
+          record_function(
+            vi + k,
+            VectorElementSelection(local_inputs[0], k, precision = self.precision),
+            VectorElementSelection(local_result, k, precision = self.precision),
+            expected_low, expected_high
+          )
+        )
+    else:
+      local_inputs = tuple(TableLoad(input_tables[in_id], vi) for in_id in range(self.get_arity()))
+      expected_low, expected_high = get_expected_interval(vi)
+      loop_body.push(record_function(vi, local_inputs[0], tested_function(*local_inputs), expected_low, expected_high))
+
+    return Statement(
+      init_function(),
+      Loop(
+        ReferenceAssign(vi, Constant(0, precision = ML_Int32)),
+        vi < Constant(test_num, precision = ML_Int32),
+        Statement(
+          loop_body,
+          ReferenceAssign(vi, vi + loop_increment)
+        ),
+      ),
+      finish_statement
+    )
+
+  ## Generate a test wrapper checking the @p self function on every
+  #  binary32 input (multi-threaded, against the MPFR emulation)
+  def generate_exhaustive_test_wrapper(self):
+    if self.get_arity() != 1 or self.precision != ML_Binary32 or self.get_input_precision(0) != ML_Binary32 \
+       or self.get_vector_size() != 1 or self.language != C_Code:
+      Log.report(Log.Error, "--exhaustive is only supported for scalar unary binary32 functions generated in C")
+    if isinstance(self.accuracy, ML_CorrectlyRounded):
+      check_mode = "ML_EXHAUSTIVE_CR"
+    elif isinstance(self.accuracy, ML_Faithful):
+      check_mode = "ML_EXHAUSTIVE_FAITHFUL"
+    else:
+      Log.report(Log.Error, "--exhaustive does not support accuracy {}", self.accuracy)
+    if not self.has_mpfr_emulate():
+      Log.report(Log.Error, "--exhaustive requires an MPFR emulation, {} does not implement generate_emulate(result_ternary, result, mpfr_x, mpfr_rnd)", self.function_name)
+    function_name = self.implementation.get_name()
+    emulate_function = self.generate_mpfr_emulate_function()
+    exhaustive_op = FunctionOperator(
+      "ml_exhaustive_binary32",
+      arg_map = {
+        0: "\"%s\"" % function_name,
+        1: function_name,
+        2: emulate_function.get_name(),
+        3: check_mode,
+        4: str(self.exhaustive_threads),
+        5: str(self.exhaustive_failure_num),
+      },
+      require_header = ["support_lib/ml_exhaustive.h"]
+    )
+    exhaustive_function = FunctionObject("ml_exhaustive_binary32", [], ML_Int32, exhaustive_op)
+
+    auto_test = CodeFunction("test_wrapper", output_format = ML_Int32)
+    auto_test.set_scheme(Statement(Return(exhaustive_function())))
+    return FunctionGroup([auto_test], [emulate_function])
+
+  ## build the input tables of the test wrapper
+  #  @param test_case_list list of input tuples
+  #  @return list of ML_NewTable (one per function input)
+  def generate_input_tables(self, test_case_list):
+    input_tables = [
+      ML_NewTable(
+        dimensions = [len(test_case_list)], 
+        storage_precision = self.get_input_precision(i), 
+        tag = self.uniquify_name("input_table_arg%d" % i)
+      ) for i in range(self.get_arity())
+    ]
+    for table_index, input_tuple in enumerate(test_case_list):
+      for in_id in range(self.get_arity()):
+        input_tables[in_id][table_index] = input_tuple[in_id]
+    return input_tables
+
+  ## wrap the MPFR emulation code (generate_emulate) into a function
+  #  int32_t <fct>_mpfr_emulate(mpfr_t result, mpfr_t x, int32_t rnd)
+  #  (ml_mpfr_emulate_t, see support_lib/ml_mpfr_reference.h)
+  #  @return CodeFunction
+  def generate_mpfr_emulate_function(self):
+    emulate_function = CodeFunction(self.uniquify_name("mpfr_emulate"), output_format = ML_Int32)
+    mpfr_result = emulate_function.add_input_variable("result", ML_Mpfr_t)
+    mpfr_x = emulate_function.add_input_variable("x", ML_Mpfr_t)
+    mpfr_rnd = emulate_function.add_input_variable("rnd", ML_Int32)
+    ternary = Variable("ternary", precision = ML_Int32, var_type = Variable.Local)
+    emulate_function.set_scheme(
+      Statement(
+        self.generate_emulate(ternary, mpfr_result, mpfr_x, mpfr_rnd),
+        Return(ternary)
+      )
+    )
+    return emulate_function
+
+  ## build the MPFR emulation function (from generate_emulate) used
+  #  to compute expected test outputs at run time
+  #  @param input_tables list of test input tables
+  #  @return MPFRReferenceTable (to be used as output table), CodeFunction
+  def generate_mpfr_reference(self, input_tables):
+    if self.get_arity() != 1 or self.language != C_Code:
+      Log.report(Log.Error, "--auto-test-reference mpfr is only supported for unary functions generated in C")
+    reference_function_name = {
+      ML_Binary32: "ml_mpfr_reference_binary32",
+      ML_Binary64: "ml_mpfr_reference_binary64",
+    }
+    if not self.precision in reference_function_name or self.get_input_precision(0) != self.precision:
+      Log.report(Log.Error, "--auto-test-reference mpfr is not supported for precision {}", self.precision)
+    if not self.has_mpfr_emulate():
+      Log.report(Log.Error, "--auto-test-reference mpfr requires an MPFR emulation, {} does not implement generate_emulate(result_ternary, result, mpfr_x, mpfr_rnd)", self.function_name)
+    try:
+      rounding_mode_list = self.accuracy.get_mpfr_rounding_modes()
+    except NotImplementedError:
+      Log.report(Log.Error, "--auto-test-reference mpfr does not support accuracy {}", self.accuracy)
+
+    emulate_function = self.generate_mpfr_emulate_function()
+    reference_function_list = [
+      FunctionObject(
+        reference_function_name[self.precision], [self.precision], self.precision,
+        FunctionOperator(
+          reference_function_name[self.precision],
+          arg_map = {0: emulate_function.get_name(), 1: FO_Arg(0), 2: rounding_mode},
+          require_header = ["support_lib/ml_mpfr_reference.h"]
+        )
+      ) for rounding_mode in rounding_mode_list
+    ]
+    return MPFRReferenceTable(input_tables[0], reference_function_list), emulate_function
+
+  ## dump test inputs and expected outputs into a binary test vector file
+  #  and build the tables mapping it at run time
+  #  @param filename name of the test vector file
+  #  @param test_case_list list of input tuples
+  #  @param test_init Statement where file mapping is added
+  #  @return list of input tables, output table (ML_MappedTable)
+  def generate_test_vector_file(self, filename, test_case_list, test_init):
+    test_total = len(test_case_list)
+    num_output_value = self.accuracy.get_num_output_value()
+    output_values = compute_reference_values(self, test_case_list)
+    write_test_vector_file(
+      filename, self.get_input_precisions(), self.precision,
+      [[input_tuple[in_id] for input_tuple in test_case_list] for in_id in range(self.get_arity())],
+      output_values
+    )
+    self.main_code_object.add_header("support_lib/ml_test_vectors.h")
+
+    # absolute path so that the test can be executed from any directory
+    path_str = "\"{}\"".format(
+      os.path.abspath(filename).replace("\\", "\\\\").replace("\"", "\\\""))
+    open_function = FunctionObject(
+      "ml_test_vector_open", [ML_UInt32, ML_UInt64], ML_Int32,
+      FunctionOperator("ml_test_vector_open", arg_map={0: path_str, 1: FO_Arg(0), 2: FO_Arg(1)})
+    )
+    column_num = self.get_arity() + 1
+    test_init.add(
+      ConditionBlock(
+        Comparison(
+          open_function(Constant(column_num, precision=ML_UInt32), Constant(test_total, precision=ML_UInt64)),
+          Constant(0, precision=ML_Int32), specifier=Comparison.NotEqual, precision=ML_Bool
+        ),
+        Return(Constant(1, precision=ML_Int32))
+      )
+    )
+
+    def map_column(index, dimensions, storage_precision, tag):
+      table = ML_MappedTable(self.uniquify_name(tag), dimensions, storage_precision)
+      column_function = FunctionObject(
+        "ml_test_vector_column", [ML_UInt32], table.get_precision(),
+        FunctionOperator("ml_test_vector_column", arg_map={0: FO_Arg(0)})
+      )
+      test_init.add(ReferenceAssign(table, column_function(Constant(index, precision=ML_UInt32))))
+      return table
+
+    input_tables = [
+      map_column(in_id, [test_total], self.get_input_precision(in_id), "input_table_arg%d" % in_id)
+      for in_id in range(self.get_arity())
+    ]
+    output_table = map_column(
+      self.get_arity(), [test_total * num_output_value], self.precision, "output_table")
+    return input_tables, output_table
+
+  ## load an expected output value from the output table of a test wrapper
+  #  @param output_table output table (ML_NewTable with one row per test
+  #         or ML_MappedTable storing all the values contiguously)
+  #  @param index test index
+  #  @param value_index index of the value for this test
+  def get_output_value_load(self, output_table, index, value_index):
+    if isinstance(output_table, MPFRReferenceTable):
+      return output_table.get_reference_value(index, value_index)
+    if isinstance(output_table, ML_MappedTable):
+      num_output_value = self.accuracy.get_num_output_value()
+      return TableLoad(output_table, index * num_output_value + value_index)
+    return TableLoad(output_table, index, value_index)
 
   ## return a FunctionObject display
   #  an error index, a list of argument values
@@ -1049,7 +1696,7 @@ class ML_FunctionBasis(object):
       elt_inputs  = [VectorElementSelection(local_inputs[input_id], k) for input_id in range(self.get_arity())]
       elt_result = VectorElementSelection(local_result, k)
 
-      output_values = [TableLoad(output_table, vi + k, i) for i in range(self.accuracy.get_num_output_value())]
+      output_values = [self.get_output_value_load(output_table, vi + k, i) for i in range(self.accuracy.get_num_output_value())]
 
       failure_test = self.accuracy.get_output_check_test(elt_result, output_values)
 
@@ -1112,7 +1759,7 @@ class ML_FunctionBasis(object):
         elt_inputs = [VectorElementSelection(local_inputs[input_id], k) for input_id in range(self.get_arity())]
         elt_result = VectorElementSelection(local_result, Constant(k, precision = ML_Integer))
 
-        output_values = [TableLoad(output_table, vi + k, i) for i in range(self.accuracy.get_num_output_value())]
+        output_values = [self.get_output_value_load(output_table, vi + k, i) for i in range(self.accuracy.get_num_output_value())]
 
         local_error = self.accuracy.compute_error(elt_result, output_values, relative = True)
 
@@ -1162,7 +1809,7 @@ class ML_FunctionBasis(object):
 
     local_inputs  = tuple(TableLoad(input_tables[in_id], vi) for in_id in range(self.get_arity()))
     local_result = tested_function(*local_inputs)
-    output_values = [TableLoad(output_table, vi, i) for i in range(self.accuracy.get_num_output_value())]
+    output_values = [self.get_output_value_load(output_table, vi, i) for i in range(self.accuracy.get_num_output_value())]
 
     failure_test = self.accuracy.get_output_check_test(local_result, output_values)
 
@@ -1217,7 +1864,7 @@ class ML_FunctionBasis(object):
       local_inputs  = tuple(TableLoad(input_tables[in_id], vi) for in_id in range(self.get_arity()))
 
       local_result  = tested_function(*local_inputs)
-      stored_values = [TableLoad(output_table, vi, i) for i in range(self.accuracy.get_num_output_value())]
+      stored_values = [self.get_output_value_load(output_table, vi, i) for i in range(self.accuracy.get_num_output_value())]
       local_error = self.accuracy.compute_error(local_result, stored_values, relative = True)
       error_comp = Comparison(local_error, eval_error, specifier = Comparison.Greater, precision = ML_Bool)
       error_loop = Loop(
@@ -1302,7 +1949,10 @@ class ML_FunctionBasis(object):
         input_value = self.precision.round_sollya_object(input_value, RN)
         input_tables[in_id][i] = input_value
 
-    if self.implementation.get_output_format().is_vector_format():
+    if not self.array_implementation is None:
+      # array entry point bench
+      test_loop = self.get_array_bench_wrapper(test_num, input_tables, output_table)
+    elif self.implementation.get_output_format().is_vector_format():
       # vector implementation bench
       test_loop = self.get_vector_bench_wrapper(test_num, tested_function, input_tables, output_table)
     else: 
@@ -1362,6 +2012,17 @@ class ML_FunctionBasis(object):
     return FunctionGroup([auto_test])
 
 
+  ## generate a bench loop calling the array entry point once on every
+  #  test input
+  #  @param test_num number of elementary tests to be executed
+  #  @param input_tables list of ML_NewTable object containing test inputs
+  #  @param output_table ML_NewTable object containing test outputs
+  def get_array_bench_wrapper(self, test_num, input_tables, output_table):
+    array_function = self.array_implementation.get_function_object()
+    return Statement(
+      array_function(*(input_tables + [output_table, Constant(test_num, precision = ML_SizeT)]))
+    )
+
   ## generate a test loop for vector tests
   #  @param test_num number of elementary tests to be executed
   #  @param tested_function FunctionObject to be tested
@@ -45,6 +45,7 @@ import sollya
 
 from ..utility.log_report import Log
 from .attributes import Attributes, attr_init
+from .graph_traversal import iterate_post_order
 from .ml_formats import (
     ML_Binary32, ML_SingleSingle, ML_Binary64, ML_DoubleDouble, ML_TripleDouble,
     ML_Int32, ML_UInt32, ML_Void,
@@ -99,7 +100,7 @@ def std_merge_abstract_format(*args):
 ## parent to Metalibm's operation
 #  @brief Every operation class must inherit from this class
 class ML_Operation(object):
-    pass
+    __slots__ = ()
 
 
 ## implicit operation conversion (from number to Constant when required)
@@ -129,16 +130,31 @@ def implicit_op(op):
 ## Parent for abstract operations
 #  @brief parent to Metalibm's abstract operation
 class AbstractOperation(ML_Operation):
+    # fields common to every node are stored in slots, specific fields
+    # (specifier, ...) are stored in the sub-classes __dict__
+    __slots__ = ("attributes", "index", "inputs")
     name = "AbstractOperation"
     extra_inputs = []
     global_index = 0
     str_del = "  "
+    # if False, node intervals are evaluated when nodes are built
+    lazy_interval = True
+    # (interval,) result of the last range function evaluation
+    # (None if the interval has not been evaluated or has been invalidated)
+    evaluated_interval = None
+    # set of nodes whose memoized interval was evaluated from this node's
+    # interval (they must be invalidated when this node is modified)
+    interval_user_set = None
 
     ## init operation handle
     def __init__(self, **init_map):
         self.attributes = Attributes(**init_map)
+        self.attributes.owner = self
         self.index = AbstractOperation.global_index; AbstractOperation.global_index += 1
-        self.get_handle().set_node(self)
+        # the handle is allocated lazily (pointing to its owner), an
+        # explicit handle is redirected to the new node
+        if "handle" in init_map and not init_map["handle"] is None:
+            init_map["handle"].set_node(self)
 
     ## extract the High part of the Node
     @property
@@ -310,15 +326,67 @@ class AbstractOperation(ML_Operation):
         input_list = list(self.inputs) 
         input_list[index] = new_input
         self.inputs = tuple(input_list)
+        self.invalidate_interval()
 
     ##
-    #  @return the node evaluated live-range (when available) 
+    #  @return the node live-range (when available): the interval set
+    #          explicitly if any, else the memoized result of the node's
+    #          range function
     def get_interval(self):
-        return self.attributes.get_interval()
+        interval = self.attributes.get_interval()
+        if interval is None and self.requires_interval_evaluation():
+            # inputs are evaluated bottom-up so that deep graphs do not
+            # recurse through range functions
+            for node in iterate_post_order([self], get_unevaluated_interval_inputs):
+                node.evaluate_interval()
+        if interval is None and not self.evaluated_interval is None:
+            interval = self.evaluated_interval[0]
+        return interval
     ## set the node live-range interval
     def set_interval(self, new_interval):
+        self.invalidate_interval()
         return self.attributes.set_interval(new_interval)
 
+    ## test if the node interval must be (re-)evaluated by its
+    #  range function
+    def requires_interval_evaluation(self):
+        return self.evaluated_interval is None and \
+            self.attributes.get_interval() is None and \
+            hasattr(self, "range_function") and hasattr(self, "inputs")
+
+    ## evaluate the node range function and memoize the result
+    #  (inputs intervals are assumed to be up-to-date)
+    def evaluate_interval(self):
+        for op in self.inputs:
+            if isinstance(op, AbstractOperation):
+                if op.interval_user_set is None:
+                    op.interval_user_set = set()
+                op.interval_user_set.add(self)
+        self.evaluated_interval = (self.range_function(self.inputs),)
+
+    ## evaluate the node interval at construction time
+    #  if lazy interval evaluation is disabled
+    def init_interval(self):
+        if not AbstractOperation.lazy_interval and self.attributes.get_interval() is None:
+            self.evaluate_interval()
+
+    ## invalidate the memoized interval of the node and of every node
+    #  whose memoized interval depends on it (must be called when the
+    #  node is modified without set_input / set_interval / change_to)
+    def invalidate_interval(self):
+        self.evaluated_interval = None
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            user_set = node.interval_user_set
+            if user_set is None:
+                continue
+            node.interval_user_set = None
+            for user in user_set:
+                if not user.evaluated_interval is None:
+                    user.evaluated_interval = None
+                    stack.append(user)
+
     ## wrapper for getting the exact field of node's attributes
     #  @return the node exact flag value
     def get_exact(self):
@@ -381,11 +449,15 @@ class AbstractOperation(ML_Operation):
             self.set_likely(kwords["likely"])
             kwords.pop("likely")
         self.attributes.set_attr(**kwords)
+        if "interval" in kwords:
+            self.invalidate_interval()
 
     ## modify the values of some node's attributes and return the current node
     #  @return current node
     def modify_attributes(self, **kwords):
         self.attributes.set_attr(**kwords)
+        if "interval" in kwords:
+            self.invalidate_interval()
         return self
 
     ## 
@@ -449,6 +521,7 @@ class AbstractOperation(ML_Operation):
         self.attributes = optree.attributes
         if isinstance(optree, SpecifierOperation):
             self.specifier = optree.specifier
+        self.invalidate_interval()
 
     def __str__(self):
         """ Default conversion of a ML_Operation object to a string """
@@ -547,8 +620,7 @@ class ML_ArithmeticOperation(AbstractOperation):
     """ init function for abstract operation """
     AbstractOperation.__init__(self, **init_map)
     self.inputs = tuple(implicit_op(op) for op in ops)
-    if self.get_interval() == None:
-        self.set_interval(self.range_function(self.inputs))
+    self.init_interval()
 
 ## Parent for AbstractOperation with no expected input
 class ML_LeafNode(AbstractOperation):
@@ -721,6 +793,15 @@ class InstanciatedOperation(ML_Operation):
 
 
 
+def copy_inputs_bottom_up(self, copy_map):
+  """ copy the operands of <self> which are not in copy_map yet, inputs
+      first, with an explicit stack, so that the copy of <self> only
+      finds its operands' copies in copy_map rather than recursing
+      through the whole graph """
+  for op in iterate_post_order(self.inputs, skip=lambda op: op in copy_map):
+    op.copy(copy_map)
+
+
 def AbstractOperation_copy(self, copy_map = None):
   """ base function to copy an abstract operation object,
       copy_map is a memoization hashtable which can be use to factorize
@@ -729,6 +810,7 @@ def AbstractOperation_copy(self, copy_map = None):
   # test for previous definition in memoization map
   if self in copy_map:
     return copy_map[self]
+  copy_inputs_bottom_up(self, copy_map)
   # else define a new and free copy
   new_copy = self.__class__(*tuple(op.copy(copy_map) for op in self.inputs), __copy = True)
   new_copy.attributes = self.attributes.get_copy()
@@ -763,6 +845,14 @@ def interval_wrapper(self, interval_op, ops):
         return None
 
 
+## input getter for bottom-up interval evaluation
+#  @return the list of @p node's inputs whose interval must be evaluated
+def get_unevaluated_interval_inputs(node):
+    return [
+        op for op in node.inputs
+        if isinstance(op, AbstractOperation) and op.requires_interval_evaluation()
+    ]
+
 ## Wraps the operation on intervals @p interval_op
 #  to an object method which inputs operations trees
 def interval_func(interval_op):
@@ -779,8 +869,7 @@ def AbstractOperation_init(self, *ops, **init_map):
   """ init function for abstract operation """
   AbstractOperation.__init__(self, **init_map)
   self.inputs = tuple(implicit_op(op) for op in ops)
-  if self.get_interval() == None:
-      self.set_interval(self.range_function(self.inputs))
+  self.init_interval()
 
 class GeneralOperation(AbstractOperation):
     arity = 2
@@ -791,8 +880,7 @@ class GeneralOperation(AbstractOperation):
     def __init__(self, *ops, **init_map):
         AbstractOperation.__init__(self, **init_map)
         self.inputs = tuple(implicit_op(op) for op in ops)
-        if self.get_interval() == None:
-            self.set_interval(self.range_function(self.inputs))
+        self.init_interval()
     def get_codegen_key(self):
         return None
     def copy(self, copy_map=None):
@@ -803,6 +891,7 @@ class GeneralOperation(AbstractOperation):
         # test for previous definition in memoization map
         if self in copy_map:
             return copy_map[self]
+        copy_inputs_bottom_up(self, copy_map)
         # else define a new and free copy
         new_copy = self.__class__(*tuple(op.copy(copy_map) for op in self.inputs), __copy = True)
         new_copy.attributes = self.attributes.get_copy()
@@ -1896,6 +1985,7 @@ class FunctionCall(GeneralOperation):
     def copy(self, copy_map = {}):
         # test for previous definition in memoization map
         if self in copy_map: return copy_map[self]
+        copy_inputs_bottom_up(self, copy_map)
         # else define a new and free copy
         new_copy = self.__class__(self.function_object, *tuple(op.copy(copy_map) for op in self.inputs), __copy = True)
         new_copy.attributes = self.attributes.get_copy()
@@ -36,7 +36,8 @@
 from sollya import Interval
 
 from .ml_operations import (
-    ML_LeafNode, BitLogicAnd, BitLogicRightShift, TypeCast, Constant
+    ML_LeafNode, BitLogicAnd, BitLogicRightShift, TypeCast, Constant,
+    Variable
 )
 from .attributes import Attributes, attr_init
 from .ml_formats import (
@@ -200,7 +201,7 @@ class ML_Table(ML_LeafNode):
         if self in copy_map:
             return copy_map[self]
         else:
-            kwords = self.attributes.__dict__.copy()
+            kwords = self.attributes.get_attribute_map()
             kwords.update({
                 'dimensions' : self.dimensions,
                 'storage_precision' : self.storage_precision,
@@ -247,6 +248,24 @@ class ML_NewTable(ML_Table):
     return self.precision
 
 
+## Table whose content is not embedded in the generated code but
+#  pointed to at run time (e.g. test vectors mapped from a file).
+#  It is implemented as a local pointer variable (1-dimension tables only)
+#  which must be assigned before being loaded from
+class ML_MappedTable(Variable):
+    def __init__(self, tag, dimensions=None, storage_precision=None, **kw):
+        kw.setdefault("var_type", Variable.Local)
+        if not dimensions is None:
+            kw["precision"] = ML_TableFormat(storage_precision, dimensions)
+        Variable.__init__(self, tag, **kw)
+
+    def get_storage_precision(self):
+        return self.get_precision().get_storage_precision()
+
+    def get_dimensions(self):
+        return self.get_precision().get_dimensions()
+
+
 ## Table specifically used to described an approximation i.e a seed-like
 #  instruction.
 #  This class has source-info information to retrieve declaration location
@@ -26,7 +26,16 @@
 ###############################################################################
 
 import sys
+import json
+import timeit
+try:
+  import tracemalloc
+except ImportError:
+  # python2: peak memory is not profiled
+  tracemalloc = None
+
 from metalibm_core.utility.log_report import Log
+from metalibm_core.core.graph_traversal import iterate_post_order
 
 """ custom warning log level for pass management """
 LOG_PASS_INFO = Log.LogLevel("Info", "passes")
@@ -38,26 +47,30 @@ class PassDependency:
     #  @return boolean True if dependency is resolved, False otherwise
     def is_dep_resolved(self, pass_scheduler):
         return True
+    ## @return the list of execution keys (see PassScheduler.get_pass_keys)
+    #          whose execution may resolve @p self
+    def get_trigger_keys(self):
+        return []
 
 class AfterPassByClass(PassDependency):
   def __init__(self, pass_class):
     self.pass_class = pass_class
 
   def is_dep_resolved(self, pass_scheduler):
-    for pass_obj in pass_scheduler.get_executed_passes():
-      if isinstance(pass_obj, self.pass_class):
-        return True
-    return False
+    return self.pass_class in pass_scheduler.executed_key_set
+
+  def get_trigger_keys(self):
+    return [self.pass_class]
 
 class AfterPassById(PassDependency):
   def __init__(self, pass_id):
     self.pass_id = pass_id
 
   def is_dep_resolved(self, pass_scheduler):
-    for pass_obj in pass_scheduler.get_executed_passes():
-      if pass_obj.get_pass_id() == self.pass_id:
-        return True
-    return False
+    return self.pass_id in pass_scheduler.executed_key_set
+
+  def get_trigger_keys(self):
+    return [self.pass_id]
 
 class CombineAnd(PassDependency):
   def __init__(self, lhs, rhs):
@@ -68,6 +81,10 @@ class CombineAnd(PassDependency):
     return lhs.is_dep_resolved(pass_scheduler) and \
            rhs.is_dep_resolved(pass_scheduler)
 
+  def get_trigger_keys(self):
+    lhs, rhs = self.ops
+    return lhs.get_trigger_keys() + rhs.get_trigger_keys()
+
 class CombineOr(PassDependency):
   def __init__(self, lhs, rhs):
     self.ops = lhs, rhs
@@ -77,10 +94,16 @@ class CombineOr(PassDependency):
     return lhs.is_dep_resolved(pass_scheduler) or \
            rhs.is_dep_resolved(pass_scheduler)
 
+  def get_trigger_keys(self):
+    lhs, rhs = self.ops
+    return lhs.get_trigger_keys() + rhs.get_trigger_keys()
+
 class PassWrapper:
-  def __init__(self, pass_object, dependency):
+  def __init__(self, pass_object, dependency, index=0):
     self.pass_object = pass_object
     self.dependency  = dependency
+    # registration order (used to order passes ready at the same time)
+    self.index = index
   def get_dependency(self):
     return self.dependency
   def get_pass_object(self):
@@ -91,6 +114,52 @@ class PassWrapper:
 def default_execute_pass(pass_scheduler, pass_object, inputs):
   return [pass_object.execute(pass_input) for pass_input in inputs]
 
+
+## count the number of operation nodes reachable from pass inputs
+#  (function group, list of code entities or of nodes)
+def count_pass_input_nodes(inputs):
+  root_list = []
+  def add_fct_scheme(fct_group, fct):
+    root_list.append(fct.get_scheme())
+  if hasattr(inputs, "apply_to_all_functions"):
+    inputs.apply_to_all_functions(add_fct_scheme)
+  else:
+    for pass_input in inputs:
+      root_list.append(pass_input.get_scheme() if hasattr(pass_input, "get_scheme") else pass_input)
+  return sum(1 for _ in iterate_post_order(root_list))
+
+
+## Execution profile of a single pass
+class PassProfile(object):
+  def __init__(self, pass_object, pass_slot):
+    self.pass_tag = pass_object.pass_tag
+    self.pass_id = pass_object.get_pass_id()
+    self.pass_slot = None if pass_slot is None else pass_slot.tag
+    # wall time (s)
+    self.time = 0.0
+    # peak memory allocated during pass execution (bytes, None if unavailable)
+    self.peak_memory = None
+    self.node_count_before = None
+    self.node_count_after = None
+
+  def get_dict(self):
+    return {
+      "pass": self.pass_tag,
+      "id": self.pass_id,
+      "slot": self.pass_slot,
+      "time": self.time,
+      "peak_memory": self.peak_memory,
+      "node_count_before": self.node_count_before,
+      "node_count_after": self.node_count_after,
+    }
+
+  def __str__(self):
+    return "{:<28} {:<16} {:10.4f}s {:>12} {:>8} -> {:<8}".format(
+      self.pass_tag, self.pass_slot, self.time,
+      "-" if self.peak_memory is None else "{:.1f}KiB".format(self.peak_memory / 1024.0),
+      self.node_count_before, self.node_count_after)
+
+
 class PassScheduler:
   class Start: 
     tag = "start"
@@ -119,7 +188,7 @@ class PassScheduler:
       PassScheduler.AfterPipelining.tag: PassScheduler.AfterPipelining,
     }[tag]
 
-  def __init__(self, pass_tag_list=None):
+  def __init__(self, pass_tag_list=None, profile=False):
     pass_tag_list = pass_tag_list or [
         PassScheduler.Start, PassScheduler.Whenever, PassScheduler.JustBeforeCodeGen,
         PassScheduler.BeforePipelining, PassScheduler.AfterPipelining
@@ -130,8 +199,14 @@ class PassScheduler:
     for pass_tag in pass_tag_list:
         self.pass_map[pass_tag] = []
     self.executed_passes = []
+    # ids and classes of the executed passes
+    self.executed_key_set = set()
     self.ready_passes    = []
     self.waiting_pass_wrappers  = []
+    self.registered_pass_num = 0
+    # per-pass profiling
+    self.profile = profile
+    self.profile_list = []
 
   def register_pass(self, pass_object, pass_dep=PassDependency(), pass_slot=None):
     """ Register a new pass to be executed
@@ -142,12 +217,23 @@ class PassScheduler:
             pass_slot
         )
     )
-    self.pass_map[pass_slot].append(PassWrapper(pass_object, pass_dep)) 
+    self.pass_map[pass_slot].append(PassWrapper(pass_object, pass_dep, self.registered_pass_num))
+    self.registered_pass_num += 1
     return pass_object.get_pass_id()
 
   def get_executed_passes(self):
     return self.executed_passes
 
+  @staticmethod
+  def get_pass_keys(pass_object):
+    """ return the list of keys resolved by the execution of pass_object:
+        its id and every class it is an instance of """
+    return [pass_object.get_pass_id()] + list(pass_object.__class__.__mro__)
+
+  def set_executed(self, pass_object):
+    self.executed_passes.append(pass_object)
+    self.executed_key_set.update(self.get_pass_keys(pass_object))
+
   def get_rdy_pass_list(self):
     annotated_list = [(pass_wrapper, pass_wrapper.get_dependency().is_dep_resolved(self)) for pass_wrapper in self.waiting_pass_wrappers ]
     self.ready_passes += [pass_wrapper.get_pass_object() for (pass_wrapper, rdy_flag) in annotated_list if rdy_flag]
@@ -163,16 +249,76 @@ class PassScheduler:
     self.waiting_pass_wrappers += self.pass_map[pass_slot]
     self.pass_map[pass_slot] = []
 
+  def build_schedule(self):
+    """ build the dependency DAG of the waiting passes and return the
+        list of passes in execution order: passes are executed by waves,
+        a wave being made of the passes whose dependencies are resolved by
+        the previous waves (in registration order). Passes whose dependencies
+        can not be resolved remain in the waiting list """
+    # execution key -> waiting passes which may be resolved by this key
+    trigger_map = {}
+    wave = []
+    for pass_wrapper in self.waiting_pass_wrappers:
+      if pass_wrapper.get_dependency().is_dep_resolved(self):
+        wave.append(pass_wrapper)
+      else:
+        for key in pass_wrapper.get_dependency().get_trigger_keys():
+          trigger_map.setdefault(key, []).append(pass_wrapper)
+    schedule = []
+    scheduled_set = set()
+    # the key set is updated as if passes were executed, and restored
+    # once the schedule is built
+    executed_key_set = self.executed_key_set
+    self.executed_key_set = set(executed_key_set)
+    while wave:
+      schedule += wave
+      scheduled_set.update(wave)
+      candidate_list = []
+      for pass_wrapper in wave:
+        for key in self.get_pass_keys(pass_wrapper.get_pass_object()):
+          self.executed_key_set.add(key)
+          candidate_list += trigger_map.pop(key, [])
+      wave = sorted(
+        set(candidate for candidate in candidate_list
+            if not candidate in scheduled_set and candidate.get_dependency().is_dep_resolved(self)),
+        key=lambda pass_wrapper: pass_wrapper.index)
+    self.executed_key_set = executed_key_set
+    self.waiting_pass_wrappers = [pass_wrapper for pass_wrapper in self.waiting_pass_wrappers if not pass_wrapper in scheduled_set]
+    return [pass_wrapper.get_pass_object() for pass_wrapper in schedule]
+
+  def execute_profiled_pass(self, pass_object, pass_slot, inputs, execution_function):
+    """ execute pass_object, recording its profile """
+    profile = PassProfile(pass_object, pass_slot)
+    profile.node_count_before = count_pass_input_nodes(inputs)
+    memory_tracing = not tracemalloc is None and not tracemalloc.is_tracing()
+    if memory_tracing:
+      tracemalloc.start()
+    start = timeit.default_timer()
+    try:
+      return execution_function(self, pass_object, inputs)
+    finally:
+      profile.time = timeit.default_timer() - start
+      if memory_tracing:
+        profile.peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+      profile.node_count_after = count_pass_input_nodes(inputs)
+      self.profile_list.append(profile)
+      Log.report(LOG_PASS_INFO, "pass profile: {}", profile)
+
   ## @param pass_slot, add all remaining passes supposed to 
   #  start after pass_slot to the waiting list
   #  than update the ready passe list and execute ready passes
   #  each updating @p pass_input in turn
   #  the final result is returned
-  def execute_pass_list(self, pass_list, inputs, execution_function):
+  def execute_pass_list(self, pass_list, inputs, execution_function, pass_slot=None):
     inter_values = inputs
     for pass_object in pass_list:
       Log.report(LOG_PASS_INFO, "executing pass: {}", pass_object.pass_tag)
-      inter_values = execution_function(self, pass_object, inputs)
+      if self.profile:
+        inter_values = self.execute_profiled_pass(pass_object, pass_slot, inputs, execution_function)
+      else:
+        inter_values = execution_function(self, pass_object, inputs)
+      self.set_executed(pass_object)
     return inter_values
 
   def flush_rdy_pass_list(self):
@@ -191,18 +337,37 @@ class PassScheduler:
       execution_function = default_execute_pass
     ):
     self.enqueue_slot_to_waiting(pass_slot = pass_slot)
-    passes_to_execute = self.update_rdy_pass_list()
-    intermediary_values = inputs
-    while len(passes_to_execute) > 0:
-      intermediary_values = self.execute_pass_list(
-        passes_to_execute, 
-        intermediary_values,
-        execution_function
-      )
-      self.executed_passes += passes_to_execute
-      self.flush_rdy_pass_list()
-      passes_to_execute = self.update_rdy_pass_list()
-    return intermediary_values
+    passes_to_execute = self.build_schedule()
+    if not passes_to_execute:
+      return inputs
+    return self.execute_pass_list(
+      passes_to_execute, 
+      inputs,
+      execution_function,
+      pass_slot=pass_slot
+    )
+
+  def get_profile(self):
+    """ return the list of per-pass profiles (as dicts) """
+    return [profile.get_dict() for profile in self.profile_list]
+
+  def report_profile(self, output=None):
+    """ print the pass profile table (output is None), or write it in file
+        <output> (dumped as JSON if <output> ends with .json) """
+    if not output is None and output.endswith(".json"):
+      with open(output, "w") as profile_file:
+        json.dump(self.get_profile(), profile_file, indent=2)
+      Log.report(Log.Info, "pass profile dumped in {}", output)
+      return
+    line_list = ["{:<28} {:<16} {:>11} {:>12} {:>20}".format("pass", "slot", "time", "peak memory", "nodes (before->after)")]
+    line_list += [str(profile) for profile in self.profile_list]
+    line_list.append("total pass time: {:.4f}s".format(sum(profile.time for profile in self.profile_list)))
+    if output is None:
+      print("\n".join(line_list))
+    else:
+      with open(output, "w") as profile_file:
+        profile_file.write("\n".join(line_list) + "\n")
+      Log.report(Log.Info, "pass profile written in {}", output)
 
 
 ## System to manage dynamically defined optimization pass
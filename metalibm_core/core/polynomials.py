@@ -36,6 +36,9 @@ import sollya
 from sollya import SollyaObject, coeff
 S2 = SollyaObject(2)
 from ..utility.log_report import Log
+from ..utility.disk_cache import (
+    DiskCache, serialize_sollya_object, deserialize_sollya_object
+)
 
 
 def is_cst_with_value(coeff, value):
@@ -64,7 +67,10 @@ except ImportError:
   cpge_available = False
   Log.report(Log.Warning, "CPGE import failed")
 
-from .ml_operations import Constant, Variable, Multiplication, Addition, Subtraction
+from .ml_operations import (
+    Constant, Variable, Multiplication, Addition, Subtraction, FusedMultiplyAdd
+)
+from .graph_traversal import iterate_post_order
 from .ml_formats import ML_Format, ML_FP_Format, ML_Fixed_Format
 
 
@@ -75,6 +81,56 @@ class SollyaError(Exception):
     """ Exception to indicate an error in pythonsollya """
     pass
 
+
+## on-disk cache of sollya's approximation results (fpminimax, supnorm,
+#  guessdegree), shared across metalibm runs
+approx_cache = DiskCache("sollya_approx")
+
+
+def get_approx_cache_key(*args):
+    """ build a canonical cache key from a list of sollya objects and python
+        values, sollya objects are serialized exactly (hexadecimal display).
+        sollya's settings which may impact the result (working precision,
+        number of sample points) are part of the key """
+    def canonicalize(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(canonicalize(v) for v in value)
+        elif isinstance(value, SollyaObject):
+            return serialize_sollya_object(value)
+        else:
+            return repr(value)
+    settings_key = (
+        serialize_sollya_object(sollya.settings.prec),
+        serialize_sollya_object(sollya.settings.points),
+    )
+    return settings_key + canonicalize(args)
+
+
+def cached_guessdegree(function, approx_interval, error_goal, *extra_args):
+    """ memoized version of sollya.guessdegree, the result is cached on disk """
+    cache_key = get_approx_cache_key(
+        "guessdegree", function, approx_interval, error_goal, extra_args)
+    degree_str = approx_cache.get(cache_key)
+    if degree_str is None:
+        degree = sollya.guessdegree(function, approx_interval, error_goal, *extra_args)
+        approx_cache.put(cache_key, serialize_sollya_object(degree))
+        return degree
+    return deserialize_sollya_object(degree_str)
+
+
+def get_precision_list(coeff_formats):
+    """ convert a list of metalibm coefficient formats into the list of
+        precisions expected by sollya's fpminimax """
+    precision_list = []
+    for c in coeff_formats:
+        if isinstance(c, ML_FP_Format):
+            precision_list.append(c.get_sollya_object())
+        elif isinstance(c, ML_Fixed_Format):
+            precision_list.append(c.get_bit_size())
+        else:
+            precision_list.append(c)
+    return precision_list
+
 class Polynomial(object):
     """ Mathematical polynomial object class """
 
@@ -177,14 +233,14 @@ class Polynomial(object):
     def build_from_approximation(function, poly_degree, coeff_formats, approx_interval, *modifiers):
         """ construct a polynomial object from a function approximation using sollya's fpminimax """
         Log.report(Log.Info,  "approx_interval: %s" % approx_interval)
-        precision_list = []
-        for c in coeff_formats:
-          if isinstance(c, ML_FP_Format):
-            precision_list.append(c.get_sollya_object())
-          elif isinstance(c, ML_Fixed_Format):
-            precision_list.append(c.get_bit_size())
-          else:
-            precision_list.append(c)
+        precision_list = get_precision_list(coeff_formats)
+
+        cache_key = get_approx_cache_key(
+            "fpminimax", function, poly_degree, precision_list,
+            approx_interval, modifiers)
+        cached_poly = approx_cache.get(cache_key)
+        if not cached_poly is None:
+            return Polynomial.deserialize_coeff_list(cached_poly)
 
         sollya_poly = sollya.fpminimax(function, poly_degree, precision_list,
                                        approx_interval, *modifiers)
@@ -213,7 +269,25 @@ class Polynomial(object):
             #   * slightly relax approx_interval bounds
             raise SollyaError
 
-        return Polynomial(sollya_poly)
+        poly_object = Polynomial(sollya_poly)
+        approx_cache.put(cache_key, poly_object.serialize_coeff_list())
+        return poly_object
+
+    def serialize_coeff_list(self):
+        """ return an exact and picklable description of self's coefficients
+            (used to store polynomials in approximation cache) """
+        return tuple(
+            (int(index), serialize_sollya_object(coeff_value))
+            for index, coeff_value in self.get_ordered_coeff_list()
+        )
+
+    @staticmethod
+    def deserialize_coeff_list(coeff_list):
+        """ build a Polynomial from the output of serialize_coeff_list """
+        return Polynomial(dict(
+            (index, deserialize_sollya_object(coeff_str))
+            for index, coeff_str in coeff_list
+        ))
 
 
     ## Approximation computation with built-in approximation error computation
@@ -231,7 +305,9 @@ class Polynomial(object):
     #  @param modifiers tuple of extra arguments (see (python)sollya's fpminimax
     #         documentation for more information, e.g absolute)
     #  @param kwords dictionnary of extra arguments for the approximation
-    #         computation (e.g tightness, error_function)
+    #         computation (e.g tightness, error_function). When a custom
+    #         error_function is given, the result is only cached if an
+    #         error_function_id string identifying it is also given
     @staticmethod
     def build_from_approximation_with_error(
             function, poly_degree, coeff_formats, approx_interval,
@@ -240,12 +316,20 @@ class Polynomial(object):
             sollya's fpminimax """
         tightness = kwords["tightness"] if "tightness" in kwords else S2**-24
         error_function = kwords["error_function"] if "error_function" in kwords else lambda p, f, ai, mod, t: sollya.supnorm(p, f, ai, mod, t)
-        precision_list = []
-        for c in coeff_formats:
-            if isinstance(c, ML_FP_Format):
-                precision_list.append(c.get_sollya_object())
-            else:
-                precision_list.append(c)
+        # a custom error_function can only be cached if it is identified
+        # by an error_function_id string (e.g. "dirtyinfnorm")
+        error_function_id = kwords.get("error_function_id", None) if "error_function" in kwords else "supnorm"
+        precision_list = get_precision_list(coeff_formats)
+
+        cache_key = get_approx_cache_key(
+            "fpminimax_with_error", error_function_id, function, poly_degree,
+            precision_list, approx_interval, modifiers, tightness)
+        if not error_function_id is None:
+            cached_result = approx_cache.get(cache_key)
+            if not cached_result is None:
+                coeff_list, error_str = cached_result
+                return Polynomial.deserialize_coeff_list(coeff_list), deserialize_sollya_object(error_str)
+
         sollya_poly = sollya.fpminimax(function, poly_degree, precision_list, approx_interval, *modifiers)
         if sollya_poly.is_error():
             print("function: {}, poly_degree: {}, precision_list: {}, approx_interval: {}, modifiers: {}".format(function, poly_degree, precision_list, approx_interval, modifiers))
@@ -254,7 +338,13 @@ class Polynomial(object):
         fpnorm_modifiers = sollya.absolute if sollya.absolute in modifiers else sollya.relative
         #approx_error = sollya.supnorm(sollya_poly, function, approx_interval, fpnorm_modifiers, tightness)
         approx_error = error_function(sollya_poly, function, approx_interval, fpnorm_modifiers, tightness)
-        return Polynomial(sollya_poly), approx_error
+        poly_object = Polynomial(sollya_poly)
+        if not error_function_id is None:
+            approx_cache.put(
+                cache_key,
+                (poly_object.serialize_coeff_list(), serialize_sollya_object(approx_error))
+            )
+        return poly_object, approx_error
 
 def generate_power(variable, power, power_map = {}, precision = None):
     """ generate variable^power, using power_map for memoization
@@ -404,17 +494,44 @@ class PolynomialSchemeEvaluator(object):
                 power_node = generate_power(variable, index, power_map, unified_precision)
                 return Multiplication(coeff_node, power_node, precision = unified_precision)
         else:
-            min_degree = int(polynomial_object.get_min_monomial_degree())
-            max_degree = int(polynomial_object.get_degree())
-            poly_degree = (max_degree - min_degree + 2) // 2 + min_degree - 1
-            offset_degree = poly_degree + 1 - min_degree
-            sub_poly_lo = polynomial_object.sub_poly(stop_index = poly_degree)
-            sub_poly_hi = polynomial_object.sub_poly(start_index = poly_degree + 1, offset = offset_degree)
-            lo_node = PolynomialSchemeEvaluator.generate_estrin_scheme(sub_poly_lo, variable, unified_precision, power_map)
-            hi_node = PolynomialSchemeEvaluator.generate_estrin_scheme(sub_poly_hi, variable, unified_precision, power_map)
-
-            offset_degree_monomial = generate_power(variable, offset_degree, power_map, unified_precision)
-            return Addition(lo_node, Multiplication(offset_degree_monomial, hi_node, precision = unified_precision), precision = unified_precision)
+            return PolynomialSchemeEvaluator.generate_estrin_split(
+                polynomial_object, variable, unified_precision, power_map,
+                lambda sub_poly: PolynomialSchemeEvaluator.generate_estrin_scheme(
+                    sub_poly, variable, unified_precision, power_map)
+            )
+
+    @staticmethod
+    def generate_estrin_split(polynomial_object, variable, unified_precision, power_map, sub_scheme_generator):
+        """ split polynomial_object as lo + x^k * hi (one level of Estrin's
+            scheme), lo and hi evaluation schemes are built by
+            sub_scheme_generator(sub_polynomial) """
+        min_degree = int(polynomial_object.get_min_monomial_degree())
+        max_degree = int(polynomial_object.get_degree())
+        poly_degree = (max_degree - min_degree + 2) // 2 + min_degree - 1
+        offset_degree = poly_degree + 1 - min_degree
+        sub_poly_lo = polynomial_object.sub_poly(stop_index = poly_degree)
+        sub_poly_hi = polynomial_object.sub_poly(start_index = poly_degree + 1, offset = offset_degree)
+        lo_node = sub_scheme_generator(sub_poly_lo)
+        hi_node = sub_scheme_generator(sub_poly_hi)
+
+        offset_degree_monomial = generate_power(variable, offset_degree, power_map, unified_precision)
+        return Addition(lo_node, Multiplication(offset_degree_monomial, hi_node, precision = unified_precision), precision = unified_precision)
+
+    @staticmethod
+    def generate_hybrid_scheme(polynomial_object, variable, unified_precision, estrin_depth, power_map_ = None):
+        """ generate an evaluation scheme splitting the polynomial as Estrin's
+            scheme over the first <estrin_depth> levels and evaluating the
+            resulting sub-polynomials with Horner's scheme (estrin_depth=0
+            is Horner's scheme, a large enough depth is Estrin's scheme) """
+        power_map = power_map_ if power_map_ != None else {}
+        if estrin_depth == 0 or polynomial_object.get_coeff_num() == 1:
+            return PolynomialSchemeEvaluator.generate_horner_scheme(
+                polynomial_object, variable, unified_precision, power_map)
+        return PolynomialSchemeEvaluator.generate_estrin_split(
+            polynomial_object, variable, unified_precision, power_map,
+            lambda sub_poly: PolynomialSchemeEvaluator.generate_hybrid_scheme(
+                sub_poly, variable, unified_precision, estrin_depth - 1, power_map)
+        )
 
     @staticmethod
     def generate_cgpe_scheme(polynomial_object, variable,
@@ -476,3 +593,127 @@ class PolynomialSchemeEvaluator(object):
                 raise ValueError
 
         return cgpe_to_metalibm(scheme)
+
+
+class PolynomialSchemeCandidate(object):
+    """ polynomial evaluation scheme and its estimated cost """
+    def __init__(self, name, scheme, latency, op_num, cost):
+        self.name = name
+        self.scheme = scheme
+        # critical path latency (cycles)
+        self.latency = latency
+        # number of arithmetic operations
+        self.op_num = op_num
+        # estimated cycles per evaluation
+        self.cost = cost
+
+    def __str__(self):
+        return "{}: latency={}, op_num={}, cost={}".format(
+            self.name, self.latency, self.op_num, self.cost)
+
+
+class PolynomialSchemeSelector(object):
+    """ selection of a polynomial evaluation scheme among Horner, Estrin and
+        hybrid schemes (Estrin splits over the first levels, Horner below)
+        according to a target latency model (LatencyModel) """
+    def __init__(self, latency_model, fuse_fma = False, independent_evaluation_num = 1):
+        """ Args:
+                latency_model (LatencyModel): target cost model
+                fuse_fma (bool): multiplications feeding a single addition
+                    are expected to be fused (if the target has FMA)
+                independent_evaluation_num (int): number of independent
+                    evaluations whose latencies overlap (1 for latency-bound
+                    scalar code, more for throughput-bound loops) """
+        self.latency_model = latency_model
+        self.fuse_fma = fuse_fma and latency_model.has_fma()
+        self.independent_evaluation_num = independent_evaluation_num
+
+    def get_scheme_cost(self, scheme):
+        """ return (critical path latency, operation number) of <scheme> """
+        model = self.latency_model
+        node_list = list(iterate_post_order([scheme]))
+        use_count = {}
+        for node in node_list:
+            for op in getattr(node, "inputs", ()):
+                use_count[op] = use_count.get(op, 0) + 1
+
+        # multiplications fused into their single user (addition or
+        # subtraction, at most one per user)
+        fused_set = set()
+        if self.fuse_fma:
+            for node in node_list:
+                if isinstance(node, (Addition, Subtraction)):
+                    for op in node.inputs:
+                        if isinstance(op, Multiplication) and use_count[op] == 1:
+                            fused_set.add(op)
+                            break
+
+        def is_fused(node):
+            return node in fused_set
+
+        latency = {}
+        op_num = 0
+        for node in node_list:
+            input_latency = [latency[op] for op in getattr(node, "inputs", ())]
+            if isinstance(node, (Addition, Subtraction)) and any(is_fused(op) for op in node.inputs):
+                # fused multiply-add: the multiplication operands feed the fma
+                fma_input_latency = []
+                for op in node.inputs:
+                    if is_fused(op):
+                        fma_input_latency += [latency[mul_op] for mul_op in op.inputs]
+                    else:
+                        fma_input_latency.append(latency[op])
+                latency[node] = max(fma_input_latency) + model.fma_latency
+                op_num += 1
+            elif isinstance(node, FusedMultiplyAdd):
+                latency[node] = max(input_latency) + (model.fma_latency or model.mul_latency + model.add_latency)
+                op_num += 1
+            elif isinstance(node, Multiplication):
+                # the latency of fused multiplications is accounted by their user
+                latency[node] = max(input_latency) + (0 if is_fused(node) else model.mul_latency)
+                op_num += 0 if is_fused(node) else 1
+            elif isinstance(node, (Addition, Subtraction)):
+                latency[node] = max(input_latency) + model.add_latency
+                op_num += 1
+            else:
+                latency[node] = max(input_latency) if input_latency else 0
+        return latency[scheme], op_num
+
+    def get_candidate_list(self, polynomial_object, variable, unified_precision):
+        """ return the list of PolynomialSchemeCandidate for
+            <polynomial_object> sorted by increasing estimated cost (Horner
+            first among equal costs) """
+        coeff_span = int(polynomial_object.get_degree()) - int(polynomial_object.get_min_monomial_degree()) + 1
+        # Estrin's scheme: splitting until sub-polynomials have at most
+        # two coefficients
+        max_depth = 0
+        while (2 << max_depth) < coeff_span:
+            max_depth += 1
+        candidate_list = []
+        for depth in range(max_depth + 1):
+            scheme = PolynomialSchemeEvaluator.generate_hybrid_scheme(
+                polynomial_object, variable, unified_precision, depth)
+            latency, op_num = self.get_scheme_cost(scheme)
+            # throughput bound: operations of independent evaluations share
+            # the issue slots
+            cost = max(
+                float(latency) / self.independent_evaluation_num,
+                float(op_num) / self.latency_model.issue_width)
+            name = "horner" if depth == 0 else ("estrin" if depth == max_depth else "estrin_depth{}".format(depth))
+            if any(candidate.latency == latency and candidate.op_num == op_num for candidate in candidate_list):
+                # same cost as a shallower split
+                continue
+            candidate_list.append(PolynomialSchemeCandidate(name, scheme, latency, op_num, cost))
+        return sorted(candidate_list, key = lambda candidate: (candidate.cost, candidate.op_num))
+
+    def select(self, candidate_list, accept = None):
+        """ return the cheapest candidate of <candidate_list> (as returned by
+            get_candidate_list) accepted by predicate <accept>
+            (PolynomialSchemeCandidate -> bool, e.g. an evaluation error
+            check), Horner's scheme if no candidate is accepted """
+        for candidate in candidate_list:
+            Log.report(Log.Verbose, "polynomial scheme candidate {}", candidate)
+            if accept is None or accept(candidate):
+                return candidate
+        Log.report(Log.Warning, "no polynomial scheme candidate accepted, falling back to Horner's scheme")
+        return [candidate for candidate in candidate_list if candidate.name == "horner"][0]
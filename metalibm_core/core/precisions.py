@@ -54,6 +54,11 @@ class ML_FunctionPrecision(object):
   def get_output_check_value(self, emulated_function, input_values):
     """ return the reference values required to check result """
     raise NotImplementedError
+  ## return the tuple of MPFR rounding modes to be used to compute
+  #  (at run time) the output values required to check a test,
+  #  in the order of get_output_check_value
+  def get_mpfr_rounding_modes(self):
+    raise NotImplementedError
   ## return an Operation graph for testing if test_result
   #  fails numeric test defined by @p self accuracy and @p stored_outputs
   #  numeric output values
@@ -137,6 +142,8 @@ class ML_CorrectlyRounded(ML_FunctionPrecision):
   def get_output_check_value(self, emulated_function, input_values):
     expected_value = self.precision.round_sollya_object(emulated_function.numeric_emulate(*input_values), sollya.RN)
     return (expected_value,)
+  def get_mpfr_rounding_modes(self):
+    return ("MPFR_RNDN",)
 
   def compute_error(self, local_result, output_values, relative = False):
     precision = local_result.get_precision()
@@ -186,6 +193,8 @@ class ML_Faithful(ML_TwoFactorPrecision):
     def get_check_value_high_bound(self, emulated_function, input_values):
         high_bound = self.precision.round_sollya_object(emulated_function.numeric_emulate(*input_values), sollya.RU)
         return high_bound
+    def get_mpfr_rounding_modes(self):
+        return ("MPFR_RNDD", "MPFR_RNDU")
 
 ## Degraded accuracy function output precision indication
 class ML_DegradedAccuracy(ML_TwoFactorPrecision):
@@ -46,3 +46,18 @@ class TargetRegister(object):
     @staticmethod
     def register_new_target(target_name, target_build_function):
         TargetRegister.target_map[target_name] = target_build_function
+
+
+class LazyTargetInstance(object):
+    """ Class attribute descriptor building a target object on first
+        access, used for default targets so that importing a module does
+        not instantiate a whole processor hierarchy """
+    def __init__(self, target_class, *args):
+        self.target_class = target_class
+        self.args = args
+        self.target_object = None
+
+    def __get__(self, instance, owner):
+        if self.target_object is None:
+            self.target_object = self.target_class(*self.args)
+        return self.target_object
@@ -34,6 +34,7 @@
 
 from metalibm_core.core.passes import FunctionPass, Pass, LOG_PASS_INFO
 from metalibm_core.core.ml_operations import ML_LeafNode
+from metalibm_core.core.graph_traversal import iterate_post_order
 
 from metalibm_core.utility.log_report import Log
 
@@ -86,22 +87,34 @@ class Pass_NodeTransformation(FunctionPass):
 
 
     def transform_graph(self, node, *args):
+        """ transform the graph rooted at node, inputs being processed
+            before their users (with an explicit stack, see
+            core.graph_traversal). Returns the transformed node or None
+            if node can not be transformed """
         if self.has_memoization(node):
             return self.get_memoization_value(node)
-        elif not self.can_be_transformed(node):
+        # nodes which can be transformed, can_be_transformed is evaluated
+        # when a node is first reached, as in a recursive pre-order visit
+        transformable_set = set()
+        def input_getter(op):
+            if self.can_be_transformed(op):
+                transformable_set.add(op)
+                return op.get_inputs()
             # associate None to node in memoization_map
-            self.set_memoization_value(node, None)
-            # recursively process node's inputs
-            if not isinstance(node, ML_LeafNode):
-                for index, op_input in enumerate(node.get_inputs()):
-                    new_input = self.transform_graph(op_input)
+            self.set_memoization_value(op, None)
+            return () if isinstance(op, ML_LeafNode) else op.get_inputs()
+
+        for op in iterate_post_order([node], input_getter, skip=self.has_memoization):
+            if op in transformable_set:
+                transformed_inputs = [self.get_memoization_value(op_input) for op_input in op.get_inputs()]
+                new_node = self.transform_node(op, transformed_inputs)
+                self.set_memoization_value(op, new_node)
+            elif not isinstance(op, ML_LeafNode):
+                for index, op_input in enumerate(op.get_inputs()):
+                    new_input = self.get_memoization_value(op_input)
                     if not new_input is None:
-                        node.set_input(index, self.reconstruct_from_transformed(op_input, new_input))
-        else:
-            transformed_inputs = [self.transform_graph(op_input) for op_input in node.get_inputs()]
-            new_node = self.transform_node(node, transformed_inputs)
-            self.set_memoization_value(node, new_node)
-            return new_node
+                        op.set_input(index, self.reconstruct_from_transformed(op_input, new_input))
+        return self.get_memoization_value(node)
 
     def execute_on_optree(self, optree, fct, fct_group, memoization_map):
         return self.transform_graph(optree)
@@ -37,6 +37,7 @@ from metalibm_core.core.ml_hdl_operations import (
 from metalibm_core.core.advanced_operations import (
     FixedPointPosition
 )
+from metalibm_core.core.graph_traversal import iterate_post_order
 from metalibm_core.utility.log_report import Log
 
 CP_LOG2_CST = math.log(2.0)
@@ -186,6 +187,21 @@ OPERATION_CLASS_TIMING_MODEL = {
 
 
 
+def get_critical_path_inputs(optree):
+    """ return the list of nodes whose critical path is used
+        to evaluate the critical path of optree """
+    if isinstance(optree, (Variable, Signal, Constant, FixedPointPosition)):
+        return []
+    elif isinstance(optree, TypeCast):
+        return [optree.get_input(0)]
+    elif isinstance(optree, SpecificOperation):
+        return [optree.get_input(0)] if optree.specifier is SpecificOperation.CopySign else []
+    elif isinstance(optree, ReferenceAssign):
+        return [optree.get_input(1)]
+    else:
+        return optree.get_inputs()
+
+
 class Pass_CriticalPathEval(OptreeOptimization):
     """ Evaluate the critical path length (timing) for each node of
         an implementation """
@@ -208,6 +224,19 @@ class Pass_CriticalPathEval(OptreeOptimization):
     #  @return boolean support
     def evaluate_critical_path(self, optree):
         """  evalute the critical path of optree towards any input """
+        if optree in self.memoization_map:
+            return self.memoization_map[optree]
+        # evaluate optree's inputs first with an explicit stack, so that
+        # optree evaluation only finds already evaluated inputs
+        for op in iterate_post_order(
+                get_critical_path_inputs(optree), get_critical_path_inputs,
+                skip=lambda op: op in self.memoization_map):
+            self.evaluate_node_critical_path(op)
+        return self.evaluate_node_critical_path(optree)
+
+    def evaluate_node_critical_path(self, optree):
+        """  evalute the critical path of optree, assuming its inputs
+             have already been evaluated """
         if optree in self.memoization_map:
             return self.memoization_map[optree]
         elif isinstance(optree, Statement):
@@ -48,6 +48,7 @@ from metalibm_core.core.ml_operations import (
 from metalibm_core.core.ml_hdl_operations import (
     Process, Loop, ComponentInstance, Assert, Wait, PlaceHolder
 )
+from metalibm_core.core.graph_traversal import walk_pre_order
 from metalibm_core.core.passes import (
     Pass, LOG_PASS_INFO, FunctionPass
 )
@@ -236,11 +237,7 @@ def fuse_multiply_add(optree, silence=False, memoization=None, change_handle=Tru
 
 def subexpression_sharing(optree, sharing_map=None, level_sharing_map=None, current_parent_list=None):
     """ reseach and factorize sub-graphs between branches """
-    # init
-    sharing_map = sharing_map or {}
-    level_sharing_map = level_sharing_map or [{}]
-    current_parent_list = current_parent_list or []
-    def search_level_map(optree):
+    def search_level_map(optree, level_sharing_map):
         """ search if optree has been defined among the active node """
         for level in level_sharing_map:
             if optree in level: return True
@@ -254,49 +251,57 @@ def subexpression_sharing(optree, sharing_map=None, level_sharing_map=None, curr
                 return b
         return None
 
-    if isinstance(optree, ConditionBlock):
-        optree.set_parent_list(current_parent_list)
-        # condition
-        subexpression_sharing(optree.inputs[0], sharing_map, level_sharing_map, current_parent_list + [optree])
-        # branches
-        for op in optree.inputs[1:]:
-            subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list + [optree])
-
-    elif isinstance(optree, SwitchBlock):
-        optree.set_parent_list(current_parent_list)
-
-        # switch value
-        subexpression_sharing(optree.inputs[0], sharing_map, level_sharing_map, current_parent_list + [optree])
-        # case_statement
-        case_map = optree.get_case_map()
-        for case in case_map:
-            op = case_map[case]
-            subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list + [optree])
-
-    elif isinstance(optree, Statement):
-        if not optree.get_prevent_optimization(): 
-          for op in optree.inputs:
-              subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list)
-
-    elif isinstance(optree, Loop):
-        pass
-        #for op in optree.inputs:
-        #    subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list)
-
-    elif isinstance(optree, ML_LeafNode):
-        pass
-    else:
-        if optree in sharing_map:
-            if not search_level_map(optree): 
-                # parallel branch sharing possibility
-                ancestor = common_ancestor(sharing_map[optree], current_parent_list)            
-                if ancestor != None:
-                    ancestor.add_to_pre_statement(optree)
+    def expand(optree, context):
+        """ process optree and return the list of (node, context) to be
+            processed next, context is (sharing_map, level_sharing_map,
+            current_parent_list) """
+        sharing_map, level_sharing_map, current_parent_list = context
+        # init
+        sharing_map = sharing_map or {}
+        level_sharing_map = level_sharing_map or [{}]
+        if isinstance(optree, ConditionBlock):
+            optree.set_parent_list(current_parent_list)
+            # condition
+            return [(optree.inputs[0], (sharing_map, level_sharing_map, current_parent_list + [optree]))] + [
+                # branches
+                (op, (sharing_map, [{}] + level_sharing_map, current_parent_list + [optree])) for op in optree.inputs[1:]
+            ]
+
+        elif isinstance(optree, SwitchBlock):
+            optree.set_parent_list(current_parent_list)
+
+            # switch value
+            # case_statement
+            case_map = optree.get_case_map()
+            return [(optree.inputs[0], (sharing_map, level_sharing_map, current_parent_list + [optree]))] + [
+                (case_map[case], (sharing_map, [{}] + level_sharing_map, current_parent_list + [optree])) for case in case_map
+            ]
+
+        elif isinstance(optree, Statement):
+            if not optree.get_prevent_optimization(): 
+                return [(op, (sharing_map, [{}] + level_sharing_map, current_parent_list)) for op in optree.inputs]
+            return []
+
+        elif isinstance(optree, Loop):
+            return []
+
+        elif isinstance(optree, ML_LeafNode):
+            return []
         else:
-            sharing_map[optree] = current_parent_list
-            level_sharing_map[0][optree] = current_parent_list
-            for op in optree.inputs:
-                subexpression_sharing(op, sharing_map, level_sharing_map, current_parent_list)
+            if optree in sharing_map:
+                if not search_level_map(optree, level_sharing_map): 
+                    # parallel branch sharing possibility
+                    ancestor = common_ancestor(sharing_map[optree], current_parent_list)            
+                    if ancestor != None:
+                        ancestor.add_to_pre_statement(optree)
+                return []
+            else:
+                sharing_map[optree] = current_parent_list
+                level_sharing_map[0][optree] = current_parent_list
+                return [(op, (sharing_map, level_sharing_map, current_parent_list)) for op in optree.inputs]
+
+    # explicit-stack walk (nodes are expanded in the recursive walk order)
+    walk_pre_order([(optree, (sharing_map, level_sharing_map, current_parent_list or []))], expand)
 
 
 ## Generic vector promotion pass
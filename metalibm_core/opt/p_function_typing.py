@@ -49,6 +49,7 @@ from metalibm_core.core.ml_operations import (
 from metalibm_core.core.ml_hdl_operations import (
     Process, Loop, ComponentInstance, Assert, Wait, PlaceHolder
 )
+from metalibm_core.core.graph_traversal import iterate_post_order_with_context
 from metalibm_core.core.passes import (
     Pass, LOG_PASS_INFO, FunctionPass
 )
@@ -265,10 +266,52 @@ post_typing_process_rules = {
 }
 
 
+def get_abstract_precision_inputs(optree, default_precision):
+    """ return the list of (input, default_precision) pairs whose abstract
+        precision must be determined before optree's one """
+    if optree.get_precision() != None:
+        if isinstance(optree, ML_LeafNode):
+            return []
+        return [(inp, default_precision) for inp in tuple(optree.inputs) + tuple(optree.get_extra_inputs())]
+    elif isinstance(optree, (Constant, Variable)):
+        return []
+    elif isinstance(optree, TableLoad):
+        return [(inp, ML_Integer) for inp in optree.inputs[1:]]
+    elif isinstance(optree, (ConditionBlock, SwitchBlock)):
+        return [(inp, default_precision) for inp in (optree.get_pre_statement(),) + tuple(optree.inputs) + tuple(optree.get_extra_inputs())]
+    elif isinstance(optree, (Statement, Loop)):
+        return [(inp, default_precision) for inp in optree.inputs]
+    elif isinstance(optree, ReferenceAssign):
+        # the value default precision depends on the variable's one,
+        # it is processed by instantiate_node_abstract_precision
+        return [(optree.inputs[0], default_precision)]
+    else:
+        return [(inp, default_precision) for inp in tuple(optree.inputs) + tuple(optree.get_extra_inputs())]
+
+
 def instantiate_abstract_precision(optree, default_precision=None,
                                    memoization_map=None):
-    """ recursively determine an abstract precision for each node """
-    memoization_map = memoization_map or {}
+    """ determine an abstract precision for each node of the graph
+        rooted at optree. Nodes are processed inputs first with an
+        explicit stack, each node with the default precision of the
+        first path which reaches it """
+    memoization_map = {} if memoization_map is None else memoization_map
+    if optree in memoization_map:
+        return memoization_map[optree]
+    abstract_format = None
+    for node, node_default_precision in iterate_post_order_with_context(
+            [(optree, default_precision)], get_abstract_precision_inputs,
+            skip=lambda node: node in memoization_map):
+        # when node is processed all its inputs have been memoized
+        abstract_format = instantiate_node_abstract_precision(
+            node, node_default_precision, memoization_map)
+    # optree is the last node to be processed
+    return abstract_format
+
+
+def instantiate_node_abstract_precision(optree, default_precision,
+                                        memoization_map):
+    """ determine an abstract precision for optree """
     if optree in memoization_map:
         return memoization_map[optree]
     elif optree.get_precision() != None: 
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Global value numbering (hash-consing) of operation graphs
+
+    Two nodes computing the same operation (class, specifier, precision and
+    attributes) on the same inputs compute the same value and can be merged.
+    Nodes are numbered bottom-up (inputs first) so the key of a node is built
+    from the representatives of its inputs, which allows chains of duplicated
+    sub-graphs to be merged in a single traversal.
+
+    A node is never merged (nor used as representative) if:
+        - it has side effects or describes control-flow
+        - its prevent_optimization attribute is set
+        - its value may change between two evaluations: it reads a variable
+          assigned by a ReferenceAssign, a table modified by a TableStore or
+          memory through a Dereference (directly or through its inputs)
+    A node can only be replaced by a representative from the same or from an
+    enclosing control-flow region (so that the representative value is
+    available wherever the merged node was used).
+"""
+
+import sollya
+
+from metalibm_core.core.ml_operations import (
+    ML_LeafNode, Constant, ControlFlowOperation,
+    Statement, ConditionBlock, SwitchBlock, Loop,
+    ReferenceAssign, Return, FunctionCall, SpecificOperation,
+    TableStore, Dereference,
+    Addition, Multiplication, Max, Min,
+    BitLogicAnd, BitLogicOr, BitLogicXor,
+    LogicalAnd, LogicalOr, Comparison,
+)
+from metalibm_core.core.ml_hdl_operations import (
+    Process, ComponentInstance, Assert, Report, Wait, Event, PlaceHolder
+)
+from metalibm_core.core.bb_operations import PhiNode
+from metalibm_core.core.ml_formats import ML_Void
+from metalibm_core.core.attributes import Attributes
+from metalibm_core.core.graph_traversal import (
+    iterate_post_order, iterate_post_order_with_context
+)
+from metalibm_core.core.passes import (
+    Pass, LOG_PASS_INFO, FunctionPass
+)
+from metalibm_core.utility.disk_cache import serialize_sollya_object
+from metalibm_core.utility.log_report import Log
+
+LOG_GVN_INFO = Log.LogLevel("Info", "gvn")
+
+# operations whose result does not depend on the order of their inputs
+COMMUTATIVE_CLASSES = (
+    Addition, Multiplication, Max, Min,
+    BitLogicAnd, BitLogicOr, BitLogicXor,
+    LogicalAnd, LogicalOr,
+)
+COMMUTATIVE_COMPARISONS = (Comparison.Equal, Comparison.NotEqual)
+
+# operations which must never be merged
+SIDE_EFFECT_CLASSES = (
+    ControlFlowOperation, ReferenceAssign, Return, FunctionCall,
+    SpecificOperation, TableStore, Dereference, PhiNode,
+    Process, ComponentInstance, Assert, Report, Wait, Event, PlaceHolder,
+)
+
+# node fields already taken into account by the value key (or irrelevant)
+IGNORED_NODE_FIELDS = set([
+    "inputs", "extra_inputs", "attributes", "index",
+    "parent_list", "pre_statement", "evaluated_interval", "interval_user_set",
+])
+
+
+def is_commutative(node):
+    """ test if the value of <node> is invariant by input permutation """
+    if isinstance(node, COMMUTATIVE_CLASSES):
+        return True
+    return isinstance(node, Comparison) and node.specifier in COMMUTATIVE_COMPARISONS
+
+
+def has_side_effect(node):
+    """ test if <node> must be kept as is (side effect or no result) """
+    return isinstance(node, SIDE_EFFECT_CLASSES) or node.get_precision() is ML_Void
+
+
+def get_constant_value_key(value):
+    """ return an exact and hashable key for a constant value """
+    if isinstance(value, sollya.SollyaObject):
+        return ("sollya", serialize_sollya_object(value))
+    elif isinstance(value, (bool, int, float, str)):
+        # repr distinguishes 0.0 from -0.0 (which compare equal)
+        return (value.__class__, repr(value))
+    elif isinstance(value, (list, tuple)):
+        return (value.__class__,) + tuple(get_constant_value_key(v) for v in value)
+    else:
+        # unknown value objects are only merged with themselves
+        return ("id", id(value))
+
+
+def get_field_key(value):
+    """ hashable version of a node field (lists are converted to tuples),
+        may still raise TypeError on unhashable fields """
+    if isinstance(value, list):
+        return tuple(value)
+    hash(value)
+    return value
+
+
+def get_attribute_key(node):
+    """ key of the attributes which modify a node's value or its
+        generated code """
+    attributes = node.attributes
+    return (
+        attributes.get_silent(), attributes.get_rounding_mode(),
+        attributes.get_exact(), attributes.get_debug(),
+        attributes.get_unbreakable(),
+    ) + tuple(
+        attributes.get_dyn_attribute(attr_name)
+        for attr_name in sorted(Attributes.dynamic_attribute_map)
+    )
+
+
+def get_value_key(node, input_reps, extra_input_reps):
+    """ return the value key of <node> given the representatives of its
+        inputs, raise TypeError if the key can not be hashed """
+    if isinstance(node, Constant):
+        key = (Constant, node.get_precision(), get_constant_value_key(node.get_value()))
+    else:
+        if is_commutative(node):
+            input_reps = sorted(input_reps, key=id)
+        node_fields = tuple(
+            (field, get_field_key(value)) for field, value in sorted(vars(node).items())
+            if not field in IGNORED_NODE_FIELDS
+        )
+        key = (
+            node.__class__, node.get_codegen_key(), node.get_precision(),
+            tuple(input_reps), tuple(extra_input_reps), node_fields
+        )
+    key += get_attribute_key(node)
+    hash(key)
+    return key
+
+
+def get_mutable_nodes(root):
+    """ return the set of leaf nodes (variables, tables) modified in the
+        graph rooted at <root> """
+    mutable_set = set()
+    for node in iterate_post_order([root], get_node_inputs):
+        if isinstance(node, (ReferenceAssign, TableStore)):
+            mutable_set.add(node.get_input(0))
+    return mutable_set
+
+
+def get_node_inputs(node):
+    """ return the list of standard and extra inputs of <node> """
+    return list(getattr(node, "inputs", ())) + list(node.get_extra_inputs())
+
+
+def get_region_inputs(node, region):
+    """ return the list of (input, region) pairs of <node>, region being the
+        tuple of nested control-flow branches an input belongs to """
+    if isinstance(node, ConditionBlock):
+        return [(node.get_input(0), region)] + [
+            (op, region + ((node, index),)) for index, op in enumerate(node.inputs[1:])
+        ] + [(op, region) for op in node.get_extra_inputs()]
+    elif isinstance(node, SwitchBlock):
+        return [(node.get_input(0), region)] + [
+            (op, region + ((node, index),)) for index, op in enumerate(node.get_extra_inputs())
+        ]
+    elif isinstance(node, Loop):
+        return [(op, region + ((node, 0),)) for op in get_node_inputs(node)]
+    else:
+        return [(op, region) for op in get_node_inputs(node)]
+
+
+def is_enclosing_region(outer, inner):
+    """ test if control-flow region <outer> encloses <inner> """
+    return inner[:len(outer)] == outer
+
+
+def global_value_numbering(optree):
+    """ merge every pair of equivalent nodes of the graph rooted at <optree>,
+        return the number of nodes eliminated """
+    mutable_set = get_mutable_nodes(optree)
+    # node -> representative node
+    rep_map = {}
+    # value key -> list of (region, representative node)
+    value_map = {}
+    # nodes whose value may change between evaluations
+    volatile_set = set()
+    eliminated_count = 0
+
+    for node, region in iterate_post_order_with_context([(optree, ())], get_region_inputs):
+        rep_map[node] = node
+        input_list = list(getattr(node, "inputs", ()))
+        extra_input_list = list(node.get_extra_inputs())
+        input_reps = [rep_map[op] for op in input_list]
+        extra_input_reps = [rep_map[op] for op in extra_input_list]
+        # rewiring inputs to their representatives
+        for index, (rep, op) in enumerate(zip(input_reps, input_list)):
+            if not rep is op:
+                node.set_input(index, rep)
+        if any(not rep is op for rep, op in zip(extra_input_reps, extra_input_list)):
+            node.set_extra_inputs(extra_input_reps)
+
+        if node in mutable_set or isinstance(node, Dereference) or any(op in volatile_set for op in input_reps):
+            volatile_set.add(node)
+            continue
+        if isinstance(node, ML_LeafNode) and not isinstance(node, Constant):
+            # variables and tables are unique by definition
+            continue
+        if has_side_effect(node) or node.get_prevent_optimization():
+            continue
+        try:
+            key = get_value_key(node, input_reps, extra_input_reps)
+        except TypeError:
+            # node state can not be hashed, node is left as is
+            continue
+        candidate_list = value_map.setdefault(key, [])
+        for candidate_region, candidate in candidate_list:
+            if is_enclosing_region(candidate_region, region):
+                rep_map[node] = candidate
+                node.get_handle().set_node(candidate)
+                eliminated_count += 1
+                break
+        else:
+            candidate_list.append((region, node))
+    return eliminated_count
+
+
+class PassGlobalValueNumbering(FunctionPass):
+    """ merge equivalent operation nodes (global value numbering) """
+    pass_tag = "gvn"
+    def __init__(self, target):
+        FunctionPass.__init__(self, "gvn")
+
+    def execute_on_optree(self, optree, fct=None, fct_group=None, memoization_map=None):
+        eliminated_count = global_value_numbering(optree)
+        Log.report(LOG_GVN_INFO, "gvn eliminated {} node(s)", eliminated_count)
+        return optree
+
+
+Log.report(LOG_PASS_INFO, "Registering gvn pass")
+# register pass
+Pass.register(PassGlobalValueNumbering)
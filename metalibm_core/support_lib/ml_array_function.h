@@ -0,0 +1,73 @@
+/*******************************************************************************
+* This file is part of Kalray's Metalibm tool
+* Copyright (2026)
+* All rights reserved
+* created:          Oct 17th, 2026
+* last-modified:    Oct 17th, 2026
+*
+* author(s): metalibm developers
+*******************************************************************************/
+/** Array entry points (--array-entry): loops applying a (vector)
+ *  implementation to arrays of n elements.
+ *
+ *  The main loop evaluates VSIZE elements per call of the vector function
+ *  VFCT, vector operands are loaded from and stored to the arrays through
+ *  memcpy: the arrays only need to be aligned on their element type and the
+ *  compiler selects the adequate (unaligned) vector load/store.
+ *  The remaining n % VSIZE elements (tail) are evaluated by the scalar
+ *  function SFCT.
+ *  For a scalar implementation VFCT and SFCT are the same function and
+ *  VSIZE is 1 (no tail).
+ */
+#include <stddef.h>
+#include <string.h>
+
+#ifndef __ML_ARRAY_FUNCTION_H__
+#define __ML_ARRAY_FUNCTION_H__
+
+/** one input array: out[i] = f(in0[i]) */
+#define ML_ARRAY_LOOP_1(VFCT, SFCT, VSIZE, VIN0, VOUT, in0, out, n) do {\
+  size_t ml_i = 0;\
+  for (; ml_i + (VSIZE) <= (n); ml_i += (VSIZE)) {\
+    VIN0 ml_x0;\
+    VOUT ml_r;\
+    memcpy(&ml_x0, (in0) + ml_i, sizeof(VIN0));\
+    ml_r = VFCT(ml_x0);\
+    memcpy((out) + ml_i, &ml_r, sizeof(VOUT));\
+  }\
+  for (; ml_i < (n); ++ml_i) (out)[ml_i] = SFCT((in0)[ml_i]);\
+} while (0)
+
+/** two input arrays: out[i] = f(in0[i], in1[i]) */
+#define ML_ARRAY_LOOP_2(VFCT, SFCT, VSIZE, VIN0, VIN1, VOUT, in0, in1, out, n) do {\
+  size_t ml_i = 0;\
+  for (; ml_i + (VSIZE) <= (n); ml_i += (VSIZE)) {\
+    VIN0 ml_x0;\
+    VIN1 ml_x1;\
+    VOUT ml_r;\
+    memcpy(&ml_x0, (in0) + ml_i, sizeof(VIN0));\
+    memcpy(&ml_x1, (in1) + ml_i, sizeof(VIN1));\
+    ml_r = VFCT(ml_x0, ml_x1);\
+    memcpy((out) + ml_i, &ml_r, sizeof(VOUT));\
+  }\
+  for (; ml_i < (n); ++ml_i) (out)[ml_i] = SFCT((in0)[ml_i], (in1)[ml_i]);\
+} while (0)
+
+/** three input arrays: out[i] = f(in0[i], in1[i], in2[i]) */
+#define ML_ARRAY_LOOP_3(VFCT, SFCT, VSIZE, VIN0, VIN1, VIN2, VOUT, in0, in1, in2, out, n) do {\
+  size_t ml_i = 0;\
+  for (; ml_i + (VSIZE) <= (n); ml_i += (VSIZE)) {\
+    VIN0 ml_x0;\
+    VIN1 ml_x1;\
+    VIN2 ml_x2;\
+    VOUT ml_r;\
+    memcpy(&ml_x0, (in0) + ml_i, sizeof(VIN0));\
+    memcpy(&ml_x1, (in1) + ml_i, sizeof(VIN1));\
+    memcpy(&ml_x2, (in2) + ml_i, sizeof(VIN2));\
+    ml_r = VFCT(ml_x0, ml_x1, ml_x2);\
+    memcpy((out) + ml_i, &ml_r, sizeof(VOUT));\
+  }\
+  for (; ml_i < (n); ++ml_i) (out)[ml_i] = SFCT((in0)[ml_i], (in1)[ml_i], (in2)[ml_i]);\
+} while (0)
+
+#endif /* __ML_ARRAY_FUNCTION_H__ */
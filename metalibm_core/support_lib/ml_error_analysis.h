@@ -0,0 +1,190 @@
+/*******************************************************************************
+* This file is part of Kalray's Metalibm tool
+* Copyright (2026)
+* All rights reserved
+* created:          Oct 17th, 2026
+* last-modified:    Oct 17th, 2026
+*
+* author(s): metalibm developers
+*******************************************************************************/
+/** Error analysis of functional tests (--error-analysis): the error of each
+ *  test result is measured in ulps (number of floating-point values between
+ *  the result and the closest expected value) and accumulated into
+ *  histograms (per input sub-range and per input exponent) and a list of the
+ *  worst inputs. The results can be read back through ml_get_error_analysis
+ *  (e.g. with ctypes) or dumped into a binary file.
+ *
+ *  The layout of ml_error_analysis_t is mirrored by
+ *  metalibm_core/utility/error_analysis.py, and must be kept in sync.
+ *
+ *  This header defines the (non-static) ml_get_error_analysis accessor and
+ *  must only be included in a single translation unit (the test harness). */
+#include <stdint.h>
+#include <stdio.h>
+#include <string.h>
+#include <math.h>
+
+#ifndef __ML_ERROR_ANALYSIS_H__
+#define __ML_ERROR_ANALYSIS_H__
+
+#define ML_ERROR_ANALYSIS_VERSION 1
+#define ML_ERROR_SUBRANGE_NUM 64
+#define ML_ERROR_EXPONENT_NUM 2048
+#define ML_ERROR_WORST_NUM 16
+
+typedef struct {
+    uint32_t index;
+    uint32_t reserved;
+    double input;
+    double result;
+    double expected_low;
+    double expected_high;
+    double ulp_error;
+} ml_error_case_t;
+
+typedef struct {
+    uint32_t version;
+    /* bit-size of the tested format (32: binary32, 64: binary64) */
+    uint32_t format_size;
+    uint64_t test_num;
+    /* number of tests whose error is not zero */
+    uint64_t error_num;
+    double max_ulp_error;
+    double sum_ulp_error;
+    /* sub-range histogram: [range_low, range_high] is split into
+     * ML_ERROR_SUBRANGE_NUM sub-ranges (indexed by the first input) */
+    double range_low;
+    double range_high;
+    uint64_t subrange_test_num[ML_ERROR_SUBRANGE_NUM];
+    double subrange_max_ulp_error[ML_ERROR_SUBRANGE_NUM];
+    /* exponent histogram, indexed by the biased exponent of the first input */
+    uint64_t exponent_test_num[ML_ERROR_EXPONENT_NUM];
+    double exponent_max_ulp_error[ML_ERROR_EXPONENT_NUM];
+    /* worst cases, sorted by decreasing error */
+    uint32_t worst_num;
+    uint32_t reserved;
+    ml_error_case_t worst_list[ML_ERROR_WORST_NUM];
+} ml_error_analysis_t;
+
+static ml_error_analysis_t ml_error_analysis_state;
+
+/** return the error analysis results of the last test */
+ml_error_analysis_t* ml_get_error_analysis(void) {
+    return &ml_error_analysis_state;
+}
+
+static inline void ml_error_analysis_init(uint32_t format_size, double range_low, double range_high) {
+    memset(&ml_error_analysis_state, 0, sizeof(ml_error_analysis_state));
+    ml_error_analysis_state.version = ML_ERROR_ANALYSIS_VERSION;
+    ml_error_analysis_state.format_size = format_size;
+    ml_error_analysis_state.range_low = range_low;
+    ml_error_analysis_state.range_high = range_high;
+}
+
+/** ulp distance between two ordinal encodings
+ *  (see ml_error_analysis_ordinal32/64) */
+static inline double ml_error_analysis_distance(int64_t lhs, int64_t rhs) {
+    return lhs > rhs ? (double) (lhs - rhs) : (double) (rhs - lhs);
+}
+
+/** map floating-point encodings onto integers such that consecutive
+ *  floating-point values are consecutive integers (-0 and +0 are merged) */
+static inline int64_t ml_error_analysis_ordinal32(float value) {
+    uint32_t encoding;
+    memcpy(&encoding, &value, sizeof(encoding));
+    return (encoding >> 31) ? -(int64_t) (encoding & 0x7fffffffu) : (int64_t) encoding;
+}
+
+static inline int64_t ml_error_analysis_ordinal64(double value) {
+    uint64_t encoding;
+    memcpy(&encoding, &value, sizeof(encoding));
+    return (encoding >> 63) ? -(int64_t) (encoding & UINT64_C(0x7fffffffffffffff)) : (int64_t) encoding;
+}
+
+/** error (in ulps) of @p result with respect to the expected interval
+ *  [expected_low, expected_high] (0 if result is one of the bounds or
+ *  lies between them) */
+static inline double ml_error_analysis_ulp_error(double result, double expected_low, double expected_high,
+                                                 int64_t result_ord, int64_t low_ord, int64_t high_ord) {
+    if (isnan(result) || isnan(expected_low) || isnan(expected_high))
+        return (isnan(result) && isnan(expected_low) && isnan(expected_high)) ? 0.0 : INFINITY;
+    if (result_ord >= low_ord && result_ord <= high_ord) return 0.0;
+    double low_error = ml_error_analysis_distance(result_ord, low_ord);
+    double high_error = ml_error_analysis_distance(result_ord, high_ord);
+    return low_error < high_error ? low_error : high_error;
+}
+
+static inline void ml_error_analysis_update(uint32_t index, double input, uint32_t exponent, double result,
+                                            double expected_low, double expected_high, double ulp_error) {
+    ml_error_analysis_t* state = &ml_error_analysis_state;
+    state->test_num++;
+    state->sum_ulp_error += ulp_error;
+    if (ulp_error > 0.0) state->error_num++;
+    if (ulp_error > state->max_ulp_error) state->max_ulp_error = ulp_error;
+
+    double range_size = state->range_high - state->range_low;
+    if (!isnan(input) && range_size > 0.0) {
+        double position = (input - state->range_low) / range_size * ML_ERROR_SUBRANGE_NUM;
+        int subrange = position < 0.0 ? 0 : (position >= ML_ERROR_SUBRANGE_NUM ? ML_ERROR_SUBRANGE_NUM - 1 : (int) position);
+        state->subrange_test_num[subrange]++;
+        if (ulp_error > state->subrange_max_ulp_error[subrange]) state->subrange_max_ulp_error[subrange] = ulp_error;
+    }
+    state->exponent_test_num[exponent]++;
+    if (ulp_error > state->exponent_max_ulp_error[exponent]) state->exponent_max_ulp_error[exponent] = ulp_error;
+
+    /* insertion into the (sorted) worst case list */
+    if (ulp_error <= 0.0) return;
+    if (state->worst_num == ML_ERROR_WORST_NUM && ulp_error <= state->worst_list[ML_ERROR_WORST_NUM - 1].ulp_error) return;
+    uint32_t position = state->worst_num < ML_ERROR_WORST_NUM ? state->worst_num++ : ML_ERROR_WORST_NUM - 1;
+    while (position > 0 && state->worst_list[position - 1].ulp_error < ulp_error) {
+        state->worst_list[position] = state->worst_list[position - 1];
+        position--;
+    }
+    ml_error_case_t* entry = state->worst_list + position;
+    entry->index = index;
+    entry->reserved = 0;
+    entry->input = input;
+    entry->result = result;
+    entry->expected_low = expected_low;
+    entry->expected_high = expected_high;
+    entry->ulp_error = ulp_error;
+}
+
+/** record the result of test @p index (first input @p input) */
+static inline void ml_error_analysis_record_binary32(uint32_t index, float input, float result,
+                                                     float expected_low, float expected_high) {
+    uint32_t encoding;
+    memcpy(&encoding, &input, sizeof(encoding));
+    double ulp_error = ml_error_analysis_ulp_error(
+        result, expected_low, expected_high, ml_error_analysis_ordinal32(result),
+        ml_error_analysis_ordinal32(expected_low), ml_error_analysis_ordinal32(expected_high));
+    ml_error_analysis_update(index, input, (encoding >> 23) & 0xff, result, expected_low, expected_high, ulp_error);
+}
+
+static inline void ml_error_analysis_record_binary64(uint32_t index, double input, double result,
+                                                     double expected_low, double expected_high) {
+    uint64_t encoding;
+    memcpy(&encoding, &input, sizeof(encoding));
+    double ulp_error = ml_error_analysis_ulp_error(
+        result, expected_low, expected_high, ml_error_analysis_ordinal64(result),
+        ml_error_analysis_ordinal64(expected_low), ml_error_analysis_ordinal64(expected_high));
+    ml_error_analysis_update(index, input, (uint32_t) ((encoding >> 52) & 0x7ff), result, expected_low, expected_high, ulp_error);
+}
+
+/** dump the error analysis results (raw ml_error_analysis_t) into @p filename */
+static inline void ml_error_analysis_dump(const char* filename) {
+    FILE* stream = fopen(filename, "wb");
+    if (stream == NULL || fwrite(&ml_error_analysis_state, sizeof(ml_error_analysis_state), 1, stream) != 1)
+        printf("unable to dump error analysis into %s\n", filename);
+    if (stream != NULL) fclose(stream);
+}
+
+static inline void ml_error_analysis_report(const char* function_name) {
+    const ml_error_analysis_t* state = &ml_error_analysis_state;
+    printf("%s error analysis: max error %.1f ulp(s), mean error %.3f ulp(s), %llu/%llu inexact test(s)\n",
+           function_name, state->max_ulp_error,
+           state->test_num ? state->sum_ulp_error / state->test_num : 0.0,
+           (unsigned long long) state->error_num, (unsigned long long) state->test_num);
+}
+
+#endif /* __ML_ERROR_ANALYSIS_H__ */
@@ -0,0 +1,267 @@
+/*******************************************************************************
+* This file is part of Kalray's Metalibm tool
+* Copyright (2026)
+* All rights reserved
+* created:          Oct 17th, 2026
+* last-modified:    Oct 17th, 2026
+*
+* author(s): metalibm developers
+*******************************************************************************/
+/** Exhaustive validation of unary binary32 functions (--exhaustive):
+ *  the 2^32 inputs are split into contiguous shards evaluated by a pool
+ *  of threads. Each result is compared against the MPFR reference
+ *  (see ml_mpfr_reference.h), the error is measured in ulps as the distance
+ *  between the result and the correctly rounded value (number of binary32
+ *  values between them). */
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <pthread.h>
+#include <unistd.h>
+
+#include "ml_mpfr_reference.h"
+
+#ifndef __ML_EXHAUSTIVE_H__
+#define __ML_EXHAUSTIVE_H__
+
+/** accuracy check modes */
+#define ML_EXHAUSTIVE_CR 0
+#define ML_EXHAUSTIVE_FAITHFUL 1
+
+/** maximal number of failing inputs recorded (and displayed) */
+#define ML_EXHAUSTIVE_MAX_FAILURE_NUM 1024
+
+/** number of inputs per shard (work unit distributed to threads) */
+#define ML_EXHAUSTIVE_SHARD_SIZE (1u << 20)
+
+typedef float (*ml_binary32_fct_t)(float);
+
+/** statistics for inputs sharing the same biased exponent */
+typedef struct {
+    uint64_t test_num;
+    uint64_t failure_num;
+    uint64_t max_ulp_error;
+} ml_exhaustive_bucket_t;
+
+typedef struct {
+    uint32_t input;
+    float result;
+    float expected;
+    uint64_t ulp_error;
+} ml_exhaustive_failure_t;
+
+/** results (per thread, then merged) */
+typedef struct {
+    ml_exhaustive_bucket_t histogram[256];
+    uint64_t failure_num;
+    uint64_t max_ulp_error;
+    uint32_t max_error_input;
+    /* first failing inputs (in increasing input encoding order) */
+    uint32_t recorded_failure_num;
+    ml_exhaustive_failure_t failure_list[ML_EXHAUSTIVE_MAX_FAILURE_NUM];
+} ml_exhaustive_result_t;
+
+typedef struct {
+    ml_binary32_fct_t tested_function;
+    ml_mpfr_emulate_t emulate;
+    int mode;
+    uint32_t max_failure_num;
+    /* next shard to be processed (shared between threads) */
+    uint64_t next_shard;
+    uint64_t shard_num;
+    pthread_mutex_t lock;
+} ml_exhaustive_context_t;
+
+typedef struct {
+    ml_exhaustive_context_t* context;
+    ml_exhaustive_result_t result;
+} ml_exhaustive_worker_t;
+
+static inline uint32_t ml_exhaustive_float_as_uint(float value) {
+    uint32_t result;
+    memcpy(&result, &value, sizeof(result));
+    return result;
+}
+
+static inline float ml_exhaustive_uint_as_float(uint32_t value) {
+    float result;
+    memcpy(&result, &value, sizeof(result));
+    return result;
+}
+
+static inline int ml_exhaustive_is_nan(uint32_t encoding) {
+    return (encoding & 0x7fffffffu) > 0x7f800000u;
+}
+
+/** map binary32 encodings onto integers such that consecutive
+ *  floating-point values are consecutive integers (-0 and +0 are merged) */
+static inline int64_t ml_exhaustive_ordinal(uint32_t encoding) {
+    return (encoding >> 31) ? -(int64_t) (encoding & 0x7fffffffu) : (int64_t) encoding;
+}
+
+/** ulp distance between @p result and @p expected (0 if both are NaN,
+ *  UINT64_MAX if only one is NaN) */
+static inline uint64_t ml_exhaustive_ulp_distance(uint32_t result, uint32_t expected) {
+    int result_nan = ml_exhaustive_is_nan(result);
+    int expected_nan = ml_exhaustive_is_nan(expected);
+    if (result_nan || expected_nan)
+        return (result_nan && expected_nan) ? 0 : UINT64_MAX;
+    int64_t diff = ml_exhaustive_ordinal(result) - ml_exhaustive_ordinal(expected);
+    return diff < 0 ? (uint64_t) -diff : (uint64_t) diff;
+}
+
+static inline void ml_exhaustive_check_input(ml_exhaustive_context_t* context, ml_exhaustive_result_t* stats, uint32_t input) {
+    float x = ml_exhaustive_uint_as_float(input);
+    float result = context->tested_function(x);
+    float expected = ml_mpfr_reference_binary32(context->emulate, x, MPFR_RNDN);
+    uint32_t result_bits = ml_exhaustive_float_as_uint(result);
+    uint32_t expected_bits = ml_exhaustive_float_as_uint(expected);
+    ml_exhaustive_bucket_t* bucket = stats->histogram + ((input >> 23) & 0xff);
+    bucket->test_num++;
+    if (result_bits == expected_bits) return;
+
+    uint64_t ulp_error = ml_exhaustive_ulp_distance(result_bits, expected_bits);
+    /* ulp distance merges -0 and +0: correctly rounded results must match
+     * the expected encoding (any NaN encoding is accepted for a NaN) */
+    int failure = ulp_error != 0 || (context->mode == ML_EXHAUSTIVE_CR && !ml_exhaustive_is_nan(result_bits));
+    if (failure && context->mode == ML_EXHAUSTIVE_FAITHFUL && ulp_error == 1) {
+        /* faithful results are either rounded down or up */
+        float low = ml_mpfr_reference_binary32(context->emulate, x, MPFR_RNDD);
+        float high = ml_mpfr_reference_binary32(context->emulate, x, MPFR_RNDU);
+        failure = ml_exhaustive_float_as_uint(low) != result_bits && ml_exhaustive_float_as_uint(high) != result_bits;
+    }
+    if (ulp_error > bucket->max_ulp_error) bucket->max_ulp_error = ulp_error;
+    if (ulp_error > stats->max_ulp_error) {
+        stats->max_ulp_error = ulp_error;
+        stats->max_error_input = input;
+    }
+    if (!failure) return;
+    bucket->failure_num++;
+    stats->failure_num++;
+    if (stats->recorded_failure_num < context->max_failure_num) {
+        ml_exhaustive_failure_t* entry = stats->failure_list + stats->recorded_failure_num++;
+        entry->input = input;
+        entry->result = result;
+        entry->expected = expected;
+        entry->ulp_error = ulp_error;
+    }
+}
+
+static void* ml_exhaustive_worker(void* arg) {
+    ml_exhaustive_worker_t* worker = (ml_exhaustive_worker_t*) arg;
+    ml_exhaustive_context_t* context = worker->context;
+    while (1) {
+        pthread_mutex_lock(&context->lock);
+        uint64_t shard = context->next_shard++;
+        pthread_mutex_unlock(&context->lock);
+        if (shard >= context->shard_num) break;
+        uint64_t start = shard * ML_EXHAUSTIVE_SHARD_SIZE;
+        for (uint64_t input = start; input < start + ML_EXHAUSTIVE_SHARD_SIZE; ++input)
+            ml_exhaustive_check_input(context, &worker->result, (uint32_t) input);
+    }
+    return NULL;
+}
+
+/** merge @p src statistics into @p dst (failure lists, both sorted by
+ *  increasing input encoding, are merged and truncated to
+ *  @p max_failure_num entries) */
+static inline void ml_exhaustive_merge(ml_exhaustive_result_t* dst, const ml_exhaustive_result_t* src, uint32_t max_failure_num) {
+    for (int i = 0; i < 256; ++i) {
+        dst->histogram[i].test_num += src->histogram[i].test_num;
+        dst->histogram[i].failure_num += src->histogram[i].failure_num;
+        if (src->histogram[i].max_ulp_error > dst->histogram[i].max_ulp_error)
+            dst->histogram[i].max_ulp_error = src->histogram[i].max_ulp_error;
+    }
+    dst->failure_num += src->failure_num;
+    if (src->max_ulp_error > dst->max_ulp_error ||
+        (src->max_ulp_error == dst->max_ulp_error && src->max_error_input < dst->max_error_input)) {
+        dst->max_ulp_error = src->max_ulp_error;
+        dst->max_error_input = src->max_error_input;
+    }
+    ml_exhaustive_failure_t merged_list[ML_EXHAUSTIVE_MAX_FAILURE_NUM];
+    uint32_t dst_index = 0, src_index = 0, merged_num = 0;
+    while (merged_num < max_failure_num &&
+           (dst_index < dst->recorded_failure_num || src_index < src->recorded_failure_num)) {
+        if (src_index >= src->recorded_failure_num ||
+            (dst_index < dst->recorded_failure_num &&
+             dst->failure_list[dst_index].input < src->failure_list[src_index].input))
+            merged_list[merged_num++] = dst->failure_list[dst_index++];
+        else
+            merged_list[merged_num++] = src->failure_list[src_index++];
+    }
+    memcpy(dst->failure_list, merged_list, merged_num * sizeof(ml_exhaustive_failure_t));
+    dst->recorded_failure_num = merged_num;
+}
+
+static inline void ml_exhaustive_report(const char* function_name, const ml_exhaustive_result_t* result) {
+    printf("exhaustive test of %s: %llu failure(s) out of 2^32 inputs\n",
+           function_name, (unsigned long long) result->failure_num);
+    printf("max ulp error: %llu (input %a / 0x%08x)\n",
+           (unsigned long long) result->max_ulp_error,
+           ml_exhaustive_uint_as_float(result->max_error_input), result->max_error_input);
+    printf("exponent  tests       failures    max ulp error\n");
+    for (int i = 0; i < 256; ++i) {
+        const ml_exhaustive_bucket_t* bucket = result->histogram + i;
+        if (bucket->failure_num == 0 && bucket->max_ulp_error == 0) continue;
+        printf("%8d  %10llu  %10llu  %llu\n", i - 127,
+               (unsigned long long) bucket->test_num,
+               (unsigned long long) bucket->failure_num,
+               (unsigned long long) bucket->max_ulp_error);
+    }
+    for (uint32_t i = 0; i < result->recorded_failure_num; ++i) {
+        const ml_exhaustive_failure_t* failure = result->failure_list + i;
+        printf("failure: %s(%a) = %a, expected %a (%llu ulp(s))\n", function_name,
+               ml_exhaustive_uint_as_float(failure->input), failure->result, failure->expected,
+               (unsigned long long) failure->ulp_error);
+    }
+}
+
+/** test @p tested_function on every binary32 input using @p thread_num
+ *  threads (0: number of online processors)
+ *  @return 0 if every result satisfies @p mode accuracy, 1 otherwise */
+static inline int ml_exhaustive_binary32(const char* function_name, ml_binary32_fct_t tested_function,
+                                         ml_mpfr_emulate_t emulate, int mode, int thread_num,
+                                         uint32_t max_failure_num) {
+    if (thread_num <= 0) {
+        long cpu_num = sysconf(_SC_NPROCESSORS_ONLN);
+        thread_num = cpu_num > 0 ? (int) cpu_num : 1;
+    }
+    if (max_failure_num > ML_EXHAUSTIVE_MAX_FAILURE_NUM) max_failure_num = ML_EXHAUSTIVE_MAX_FAILURE_NUM;
+    ml_exhaustive_context_t context;
+    context.tested_function = tested_function;
+    context.emulate = emulate;
+    context.mode = mode;
+    context.max_failure_num = max_failure_num;
+    context.next_shard = 0;
+    context.shard_num = (UINT64_C(1) << 32) / ML_EXHAUSTIVE_SHARD_SIZE;
+    pthread_mutex_init(&context.lock, NULL);
+
+    ml_exhaustive_worker_t* worker_list = (ml_exhaustive_worker_t*) calloc(thread_num, sizeof(ml_exhaustive_worker_t));
+    pthread_t* thread_list = (pthread_t*) calloc(thread_num, sizeof(pthread_t));
+    ml_exhaustive_result_t* result = (ml_exhaustive_result_t*) calloc(1, sizeof(ml_exhaustive_result_t));
+    if (!worker_list || !thread_list || !result) {
+        printf("unable to allocate exhaustive test state\n");
+        free(worker_list); free(thread_list); free(result);
+        return 1;
+    }
+    int created_num = 0;
+    for (int i = 0; i < thread_num; ++i) {
+        worker_list[i].context = &context;
+        if (pthread_create(thread_list + i, NULL, ml_exhaustive_worker, worker_list + i)) break;
+        created_num++;
+    }
+    /* without any thread the calling thread processes every shard */
+    if (created_num == 0) ml_exhaustive_worker(worker_list);
+    for (int i = 0; i < created_num; ++i) pthread_join(thread_list[i], NULL);
+    for (int i = 0; i < (created_num ? created_num : 1); ++i)
+        ml_exhaustive_merge(result, &worker_list[i].result, max_failure_num);
+    pthread_mutex_destroy(&context.lock);
+
+    ml_exhaustive_report(function_name, result);
+    int status = result->failure_num != 0;
+    free(worker_list); free(thread_list); free(result);
+    return status;
+}
+
+#endif /* __ML_EXHAUSTIVE_H__ */
@@ -0,0 +1,77 @@
+/*******************************************************************************
+* This file is part of Kalray's Metalibm tool
+* Copyright (2026)
+* All rights reserved
+* created:          Oct 17th, 2026
+* last-modified:    Oct 17th, 2026
+*
+* author(s): metalibm developers
+*******************************************************************************/
+/** Run-time computation of auto-test reference values with MPFR
+ *  (--auto-test-reference mpfr): the meta-function emulation code
+ *  (generate_emulate) is wrapped into a function of type ml_mpfr_emulate_t
+ *  and evaluated on each test input, the result being rounded to the
+ *  output format (subnormals included) */
+#include <stdint.h>
+#include <mpfr.h>
+
+#ifndef __ML_MPFR_REFERENCE_H__
+#define __ML_MPFR_REFERENCE_H__
+
+/** MPFR variables used by reference functions are thread-local so that
+ *  references can be evaluated concurrently (e.g. exhaustive tests) */
+#if defined(__STDC_VERSION__) && __STDC_VERSION__ >= 201112L && !defined(__STDC_NO_THREADS__)
+#define ML_MPFR_THREAD_LOCAL _Thread_local
+#else
+#define ML_MPFR_THREAD_LOCAL __thread
+#endif
+
+/** emulation function: result = f(x) rounded in direction rnd,
+ *  returns mpfr ternary value */
+typedef int32_t (*ml_mpfr_emulate_t)(mpfr_t result, mpfr_t x, int32_t rnd);
+
+/** evaluate @p emulate on @p x, rounding @p result (whose precision is
+ *  the output format precision) in direction @p rnd within the exponent
+ *  range [emin, emax] of the output format */
+static inline void ml_mpfr_reference_eval(mpfr_t result, ml_mpfr_emulate_t emulate, mpfr_t x,
+                                          mpfr_rnd_t rnd, mpfr_exp_t emin, mpfr_exp_t emax) {
+    mpfr_exp_t old_emin = mpfr_get_emin();
+    mpfr_exp_t old_emax = mpfr_get_emax();
+    mpfr_set_emin(emin);
+    mpfr_set_emax(emax);
+    int ternary = emulate(result, x, rnd);
+    ternary = mpfr_check_range(result, ternary, rnd);
+    mpfr_subnormalize(result, ternary, rnd);
+    mpfr_set_emin(old_emin);
+    mpfr_set_emax(old_emax);
+}
+
+/** binary32 reference value of @p emulate on @p x rounded in direction @p rnd */
+static inline float ml_mpfr_reference_binary32(ml_mpfr_emulate_t emulate, float x, mpfr_rnd_t rnd) {
+    static ML_MPFR_THREAD_LOCAL int initialized = 0;
+    static ML_MPFR_THREAD_LOCAL mpfr_t mp_x, mp_result;
+    if (!initialized) {
+        mpfr_init2(mp_x, 24);
+        mpfr_init2(mp_result, 24);
+        initialized = 1;
+    }
+    mpfr_set_flt(mp_x, x, MPFR_RNDN);
+    ml_mpfr_reference_eval(mp_result, emulate, mp_x, rnd, -148, 128);
+    return mpfr_get_flt(mp_result, rnd);
+}
+
+/** binary64 reference value of @p emulate on @p x rounded in direction @p rnd */
+static inline double ml_mpfr_reference_binary64(ml_mpfr_emulate_t emulate, double x, mpfr_rnd_t rnd) {
+    static ML_MPFR_THREAD_LOCAL int initialized = 0;
+    static ML_MPFR_THREAD_LOCAL mpfr_t mp_x, mp_result;
+    if (!initialized) {
+        mpfr_init2(mp_x, 53);
+        mpfr_init2(mp_result, 53);
+        initialized = 1;
+    }
+    mpfr_set_d(mp_x, x, MPFR_RNDN);
+    ml_mpfr_reference_eval(mp_result, emulate, mp_x, rnd, -1073, 1024);
+    return mpfr_get_d(mp_result, rnd);
+}
+
+#endif /* __ML_MPFR_REFERENCE_H__ */
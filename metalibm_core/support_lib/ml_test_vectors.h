@@ -0,0 +1,88 @@
+/*******************************************************************************
+* This file is part of Kalray's Metalibm tool
+* Copyright (2026)
+* All rights reserved
+* created:          Oct 17th, 2026
+* last-modified:    Oct 17th, 2026
+*
+* author(s): metalibm developers
+*******************************************************************************/
+/** Memory-mapped binary test vector files (generated by
+ *  metalibm_core/utility/test_vector_file.py, which documents the layout) */
+#include <stdint.h>
+#include <stdio.h>
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+#ifndef __ML_TEST_VECTORS_H__
+#define __ML_TEST_VECTORS_H__
+
+#define ML_TEST_VECTOR_VERSION 1
+#define ML_TEST_VECTOR_BYTE_ORDER 0x01020304u
+
+typedef struct {
+    char magic[4];
+    uint32_t version;
+    uint32_t byte_order;
+    uint32_t column_num;
+    uint64_t test_num;
+} ml_test_vector_header_t;
+
+typedef struct {
+    uint32_t kind;
+    uint32_t bit_size;
+    uint64_t offset;
+    uint64_t length;
+} ml_test_vector_column_t;
+
+/** last mapped file (the mapping is kept until the process exits) */
+static const char* ml_test_vector_filename = NULL;
+static const uint8_t* ml_test_vector_base = NULL;
+
+/** map test vector file @p filename and check that it contains
+ *  @p column_num columns of @p test_num tests.
+ *  @return 0 on success, 1 otherwise */
+static inline int ml_test_vector_open(const char* filename, uint32_t column_num, uint64_t test_num) {
+    if (ml_test_vector_base == NULL || strcmp(filename, ml_test_vector_filename)) {
+        struct stat file_stat;
+        int fd = open(filename, O_RDONLY);
+        if (fd < 0 || fstat(fd, &file_stat) || file_stat.st_size < (off_t) sizeof(ml_test_vector_header_t)) {
+            printf("unable to open test vector file %s\n", filename);
+            if (fd >= 0) close(fd);
+            return 1;
+        }
+        void* base = mmap(NULL, file_stat.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+        close(fd);
+        if (base == MAP_FAILED) {
+            printf("unable to map test vector file %s\n", filename);
+            return 1;
+        }
+        ml_test_vector_base = (const uint8_t*) base;
+        ml_test_vector_filename = filename;
+    }
+    const ml_test_vector_header_t* header = (const ml_test_vector_header_t*) ml_test_vector_base;
+    if (memcmp(header->magic, "MLTV", 4) || header->version != ML_TEST_VECTOR_VERSION ||
+        header->byte_order != ML_TEST_VECTOR_BYTE_ORDER) {
+        printf("invalid test vector file %s\n", filename);
+        return 1;
+    }
+    if (header->column_num != column_num || header->test_num != test_num) {
+        printf("test vector file %s does not match test wrapper (%u columns, %llu tests)\n",
+               filename, header->column_num, (unsigned long long) header->test_num);
+        return 1;
+    }
+    return 0;
+}
+
+/** return a pointer to the data of column @p index of the mapped file
+ *  (ml_test_vector_open must have succeeded before) */
+static inline void* ml_test_vector_column(uint32_t index) {
+    const ml_test_vector_column_t* column_list =
+        (const ml_test_vector_column_t*) (ml_test_vector_base + sizeof(ml_test_vector_header_t));
+    return (void*) (ml_test_vector_base + column_list[index].offset);
+}
+
+#endif /* __ML_TEST_VECTORS_H__ */
@@ -629,7 +629,7 @@ class LLVMBackend(GenericProcessor):
 
     def __init__(self, *args):
         GenericProcessor.__init__(self, *args)
-        self.simplified_rec_op_map[LLVM_IR_Code] = self.generate_supported_op_map(language=LLVM_IR_Code)
+        self.simplified_rec_op_map.add_language(LLVM_IR_Code)
 
 
     ## return the compiler command line program to use to build
@@ -580,6 +580,7 @@ vector_opencl_code_generation_table = {
   },
 }
 
+@interface_only
 def type_uniform_op2_match(result_type, op0_type, op1_type, **kw):
     """ Type match predicates: 
             a 2-operand where operands and result format must 
@@ -593,7 +594,7 @@ def type_uniform_op2_match_restrain(list_t):
         is in <list_t> """
     def local_match(result_type, op0_t, op1_t, **kw):
         return type_uniform_op2_match(result_type, op0_t, op1_t, **kw) and result_type in list_t
-    return local_match
+    return interface_only(local_match)
 
 
 def assemble_vector(scalar_results, vector_prec, threshold=4):
@@ -1563,26 +1564,22 @@ class VectorBackend(GenericProcessor):
 
   def __init__(self, *args):
     GenericProcessor.__init__(self, *args)
-    self.simplified_rec_op_map[OpenCL_Code] = self.generate_supported_op_map(language = OpenCL_Code)
+    self.simplified_rec_op_map.add_language(OpenCL_Code)
 
 
   def is_supported_operation(self, optree, language = C_Code, debug = False, fallback = True,  key_getter = lambda self, optree: self.get_operation_keys(optree)):
     """ return whether or not the operation performed by optree is supported by any level of the processor hierarchy """
-    language_supported =  self.is_map_supported_operation(self.simplified_rec_op_map, optree, language, debug = debug, key_getter = key_getter)
+    language_supported = GenericProcessor.is_supported_operation(self, optree, language, debug = debug, key_getter = key_getter)
     # fallback to C_Code
     if language is OpenCL_Code and fallback: 
-      return language_supported or self.is_map_supported_operation(self.simplified_rec_op_map, optree, language = C_Code, debug = debug, key_getter = key_getter)
+      return language_supported or GenericProcessor.is_supported_operation(self, optree, language = C_Code, debug = debug, key_getter = key_getter)
     else:
       return language_supported
 
   def get_recursive_implementation(self, optree, language = None, table_getter = lambda self: self.code_generation_table,  key_getter = lambda self, optree: self.get_operation_keys(optree)):
-    if self.is_local_supported_operation(optree, language = language, table_getter = table_getter, key_getter = key_getter):
-      local_implementation = self.get_implementation(optree, language, table_getter = table_getter, key_getter = key_getter)
-      return local_implementation
-    else:
-      for parent_proc in self.parent_architecture:
-        if parent_proc.is_local_supported_operation(optree, language = language, table_getter = table_getter, key_getter = key_getter):
-          return parent_proc.get_implementation(optree, language, table_getter = table_getter, key_getter = key_getter)
+    implementation = self.find_implementation(optree, language, table_getter = table_getter, key_getter = key_getter)
+    if not implementation is None:
+      return implementation
 
     ## fallback to C_Code when no OpenCL_Code implementation is found
     if language is OpenCL_Code:
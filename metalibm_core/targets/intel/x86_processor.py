@@ -39,6 +39,7 @@ from metalibm_core.core.ml_formats import *
 from metalibm_core.core.ml_complex_formats import ML_Pointer_Format
 from metalibm_core.core.ml_operations import *
 from metalibm_core.core.target import TargetRegister
+from metalibm_core.core.latency_model import LatencyModel
 from metalibm_core.core.ml_table import ML_TableFormat
 from metalibm_core.core.attributes import ML_Debug
 from metalibm_core.core.special_values import (FP_PlusZero, FP_MinusZero)
@@ -2853,6 +2854,10 @@ class X86_Processor(VectorBackend):
     TargetRegister.register_new_target(target_name,
                                        lambda _: X86_Processor)
 
+    # cpu features (cpuid, as named by __builtin_cpu_supports) required
+    # to execute code generated for the target
+    cpu_feature_list = []
+
     code_generation_table = {
         C_Code: x86_c_code_generation_table,
     }
@@ -2866,12 +2871,18 @@ class X86_Processor(VectorBackend):
                 precision = ML_Int64
                 )
 
+    def get_latency_model(self):
+        # out-of-order core with two floating-point pipelines
+        return LatencyModel(add_latency=3, mul_latency=5, issue_width=2)
+
 
 class X86_SSE_Processor(X86_Processor):
     target_name = "x86_sse"
     TargetRegister.register_new_target(target_name,
                                        lambda _: X86_SSE_Processor)
 
+    cpu_feature_list = X86_Processor.cpu_feature_list + ["sse"]
+
     code_generation_table = {
         C_Code: sse_c_code_generation_table,
     }
@@ -2893,6 +2904,8 @@ class X86_SSE2_Processor(X86_SSE_Processor):
     TargetRegister.register_new_target(target_name,
                                        lambda _: X86_SSE2_Processor)
 
+    cpu_feature_list = X86_SSE_Processor.cpu_feature_list + ["sse2"]
+
     code_generation_table = {
         C_Code: sse2_c_code_generation_table,
     }
@@ -2910,6 +2923,8 @@ class X86_SSE3_Processor(X86_SSE2_Processor):
     TargetRegister.register_new_target(target_name,
                                        lambda _: X86_SSE3_Processor)
 
+    cpu_feature_list = X86_SSE2_Processor.cpu_feature_list + ["sse3"]
+
     code_generation_table = {
         C_Code: sse3_c_code_generation_table,
     }
@@ -2924,6 +2939,8 @@ class X86_SSSE3_Processor(X86_SSE3_Processor):
     TargetRegister.register_new_target(target_name,
                                        lambda _: X86_SSSE3_Processor)
 
+    cpu_feature_list = X86_SSE3_Processor.cpu_feature_list + ["ssse3"]
+
     code_generation_table = {
         C_Code: ssse3_c_code_generation_table,
     }
@@ -2941,6 +2958,8 @@ class X86_SSE41_Processor(X86_SSSE3_Processor):
     TargetRegister.register_new_target(target_name,
                                        lambda _: X86_SSE41_Processor)
 
+    cpu_feature_list = X86_SSSE3_Processor.cpu_feature_list + ["sse4.1"]
+
     code_generation_table = {
         C_Code: sse41_c_code_generation_table,
     }
@@ -2958,6 +2977,8 @@ class X86_SSE42_Processor(X86_SSE41_Processor):
     TargetRegister.register_new_target(target_name,
                                        lambda _: X86_SSE42_Processor)
 
+    cpu_feature_list = X86_SSE41_Processor.cpu_feature_list + ["sse4.2"]
+
     code_generation_table = {
         C_Code: sse42_c_code_generation_table,
     }
@@ -2975,6 +2996,8 @@ class X86_AVX_Processor(X86_SSE42_Processor):
     TargetRegister.register_new_target(target_name,
                                        lambda _: X86_AVX_Processor)
 
+    cpu_feature_list = X86_SSE42_Processor.cpu_feature_list + ["avx"]
+
     code_generation_table = {
         C_Code: avx_c_code_generation_table,
     }
@@ -2992,6 +3015,8 @@ class X86_AVX2_Processor(X86_AVX_Processor):
     TargetRegister.register_new_target(target_name,
                                        lambda _: X86_AVX2_Processor)
 
+    cpu_feature_list = X86_AVX_Processor.cpu_feature_list + ["avx2", "fma"]
+
     code_generation_table = {
         C_Code: avx2_c_code_generation_table,
     }
@@ -3003,6 +3028,9 @@ class X86_AVX2_Processor(X86_AVX_Processor):
       return super(X86_AVX2_Processor, self).get_compilation_options() \
               + ["-mfma", "-mavx2"]
 
+    def get_latency_model(self):
+        return LatencyModel(add_latency=4, mul_latency=4, fma_latency=4, issue_width=2)
+
 
 # debug message
 Log.report(LOG_BACKEND_INIT, "initializing INTEL targets")
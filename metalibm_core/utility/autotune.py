@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 17th, 2026
+# last-modified:    Oct 17th, 2026
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Auto-tuning of meta-function parameters
+
+    autotune explores a search space of meta-function arguments (e.g.
+    table_index_size, vector_size, fuse_fma ...): every candidate
+    configuration is generated and built (concurrently, each in its own
+    scratch directory), then its functional test and performance bench are
+    executed (in separate processes, by default one at a time so that
+    measures do not interfere). Candidates failing their functional test
+    are rejected, the others are ranked by accuracy (maximal ulp error
+    measured by --error-analysis) and CPE (cycles per element measured by
+    bench_wrapper). The Pareto front of accuracy vs CPE is persisted in a
+    JSON file (one front per meta-function and base arguments) and the
+    fastest accepted configuration is returned as reusable arguments. """
+
+import ctypes
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+
+from metalibm_core.utility.build_utils import BinaryFile
+from metalibm_core.utility.error_analysis import get_error_analysis
+from metalibm_core.utility.log_report import Log
+from metalibm_core.utility.process_utils import (
+    run_processes, prepare_scratch_workers, enter_scratch_dir
+)
+
+
+## log level for auto-tuning progress
+LOG_AUTOTUNE_INFO = Log.LogLevel("Info", "autotune")
+
+# (metafunction class, candidate argument list, scratch directory) shared
+# with forked worker processes
+_WORKER_CONTEXT = None
+
+
+def get_default_autotune_job_num():
+    """ default number of concurrent candidate generations, can be
+        overloaded by the ML_AUTOTUNE_JOBS environment variable """
+    return int(os.environ.get("ML_AUTOTUNE_JOBS", multiprocessing.cpu_count()))
+
+
+def get_default_autotune_timeout():
+    """ default time limit (in seconds) of a candidate generation or
+        evaluation, can be overloaded by the ML_AUTOTUNE_TIMEOUT
+        environment variable """
+    return float(os.environ.get("ML_AUTOTUNE_TIMEOUT", 1800))
+
+
+def get_candidate_list(search_space, max_candidate_num=None, seed=None):
+    """ return the list of candidate configurations (dict argument name ->
+        value) of @p search_space (dict argument name -> list of values),
+        the cartesian product is randomly sampled down to
+        @p max_candidate_num configurations if required """
+    name_list = sorted(search_space.keys())
+    candidate_list = [
+        dict(zip(name_list, value_tuple))
+        for value_tuple in itertools.product(*(search_space[name] for name in name_list))
+    ]
+    if not max_candidate_num is None and len(candidate_list) > max_candidate_num:
+        candidate_list = random.Random(seed).sample(candidate_list, max_candidate_num)
+    return candidate_list
+
+
+def serialize_value(value):
+    """ JSON compatible representation of the argument value @p value """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+class CandidateResult(object):
+    """ evaluation result of a candidate configuration """
+    def __init__(self, config, cpe=None, max_ulp_error=None, error=None):
+        # dict argument name -> value
+        self.config = config
+        # cycles per element measured by the bench (None if not measured)
+        self.cpe = cpe
+        # maximal error (in ulps) measured by the functional test
+        self.max_ulp_error = max_ulp_error
+        # rejection reason (None if the candidate is valid)
+        self.error = error
+
+    def is_valid(self):
+        return self.error is None
+
+    def dominates(self, other):
+        """ Pareto dominance: @p self is at least as accurate and as fast
+            as @p other and strictly better on one of the two criteria """
+        return self.max_ulp_error <= other.max_ulp_error and self.cpe <= other.cpe \
+            and (self.max_ulp_error < other.max_ulp_error or self.cpe < other.cpe)
+
+    def to_json(self):
+        return {
+            "config": dict((name, serialize_value(value)) for name, value in self.config.items()),
+            "cpe": self.cpe,
+            "max_ulp_error": self.max_ulp_error,
+        }
+
+    def __str__(self):
+        status = "{} CPE, max error {} ulp(s)".format(self.cpe, self.max_ulp_error) \
+            if self.is_valid() else "rejected ({})".format(self.error)
+        return "{}: {}".format(
+            ", ".join("{}={}".format(name, self.config[name]) for name in sorted(self.config)), status)
+
+
+def get_pareto_front(result_list):
+    """ return the valid results of @p result_list which are not dominated
+        by any other one (sorted by increasing CPE) """
+    valid_list = [result for result in result_list if result.is_valid()]
+    return sorted(
+        (result for result in valid_list if not any(other.dominates(result) for other in valid_list)),
+        key=lambda result: (result.cpe, result.max_ulp_error)
+    )
+
+
+def _worker_build_candidate(index):
+    """ generate and build candidate @p index in its own scratch directory,
+        return (index, shared object path, error message) """
+    metafunction_class, candidate_arg_list, scratch_dir = _WORKER_CONTEXT
+    candidate_dir = os.path.join(scratch_dir, "candidate_{}".format(index))
+    enter_scratch_dir(candidate_dir)
+    try:
+        metafunction = metafunction_class(candidate_arg_list[index])
+        metafunction.gen_implementation()
+    except Exception as e:
+        return index, None, "generation failed: {}".format(e)
+    lib_path = os.path.join(candidate_dir, "testlib_{}.so".format(metafunction.function_name))
+    if not os.path.isfile(lib_path):
+        return index, None, "build failed"
+    return index, lib_path, None
+
+
+def _worker_evaluate_candidate(task):
+    """ execute the functional test and the bench of the candidate shared
+        object, return (index, cpe, max ulp error, error message) """
+    index, lib_path = task
+    loaded_binary = BinaryFile(lib_path, None, shared_object=True).load()
+    test_wrapper = loaded_binary.loaded_module["test_wrapper"]
+    test_wrapper.restype = ctypes.c_int
+    if test_wrapper():
+        return index, None, None, "functional test failed"
+    max_ulp_error = get_error_analysis(loaded_binary).max_ulp_error
+    bench_wrapper = loaded_binary.loaded_module["bench_wrapper"]
+    bench_wrapper.restype = ctypes.c_double
+    return index, bench_wrapper(), max_ulp_error, None
+
+
+def init_autotune_worker():
+    """ worker processes must not fork their own process pools """
+    os.environ["ML_TEST_JOBS"] = "1"
+    os.environ["ML_BUILD_JOBS"] = "1"
+
+
+def get_pareto_key(metafunction_name, base_args):
+    """ return the key of the Pareto front of @p metafunction_name tuned
+        with the common arguments @p base_args (results measured with
+        different precisions, targets ... are not comparable) """
+    return "{} {}".format(metafunction_name, json.dumps(
+        dict((name, serialize_value(value)) for name, value in base_args.items()),
+        sort_keys=True
+    ))
+
+
+def load_pareto_file(pareto_file, pareto_key):
+    """ return the list of CandidateResult of the Pareto front
+        @p pareto_key stored in @p pareto_file """
+    if pareto_file is None or not os.path.isfile(pareto_file):
+        return []
+    with open(pareto_file, "r") as pareto_stream:
+        front_map = json.load(pareto_stream)
+    return [
+        CandidateResult(entry["config"], entry["cpe"], entry["max_ulp_error"])
+        for entry in front_map.get(pareto_key, [])
+    ]
+
+
+def save_pareto_file(pareto_file, pareto_key, pareto_front):
+    """ store @p pareto_front as the Pareto front @p pareto_key in
+        @p pareto_file (other fronts are preserved) """
+    front_map = {}
+    if os.path.isfile(pareto_file):
+        with open(pareto_file, "r") as pareto_stream:
+            front_map = json.load(pareto_stream)
+    front_map[pareto_key] = [result.to_json() for result in pareto_front]
+    with open(pareto_file, "w") as pareto_stream:
+        json.dump(front_map, pareto_stream, indent=2, sort_keys=True)
+
+
+class AutotuneResult(object):
+    """ result of an auto-tuning run """
+    def __init__(self, metafunction_class, base_args, result_list, pareto_front, best):
+        self.metafunction_class = metafunction_class
+        self.base_args = base_args
+        # CandidateResult of every evaluated candidate
+        self.result_list = result_list
+        # non-dominated candidates (accuracy vs CPE)
+        self.pareto_front = pareto_front
+        # fastest accepted candidate (None if every candidate was rejected)
+        self.best = best
+
+    def get_args(self):
+        """ return the argument object of the winning configuration """
+        kw = dict(self.base_args)
+        kw.update(self.best.config)
+        return self.metafunction_class.get_default_args(**kw)
+
+    def get_command_line(self, arg_template):
+        """ return the command line options selecting the winning
+            configuration, options are looked up in the parser of
+            @p arg_template (e.g. ML_NewArgTemplate) """
+        option_map = dict(
+            (action.dest, action) for action in arg_template.get_parser()._actions if action.option_strings
+        )
+        option_list = []
+        for name in sorted(self.best.config):
+            value = self.best.config[name]
+            if not name in option_map:
+                Log.report(Log.Warning, "no command line option for argument {}", name)
+                continue
+            action = option_map[name]
+            if action.nargs == 0:
+                # flag option (store_const / store_true)
+                if value == action.const:
+                    option_list.append(action.option_strings[0])
+            else:
+                option_list.append("{} {}".format(action.option_strings[0], value))
+        return " ".join(option_list)
+
+
+def autotune(metafunction_class, search_space, base_args=None,
+             max_candidate_num=None, max_ulp_error=None,
+             job_num=None, bench_job_num=1, pareto_file=None,
+             scratch_dir=None, seed=None, timeout=None):
+    """ search the configuration of @p metafunction_class with the best
+        measured CPE
+
+        Args:
+            metafunction_class: ML_FunctionBasis child class (must provide
+                get_default_args)
+            search_space (dict): argument name -> list of candidate values
+            base_args (dict): arguments common to every candidate (e.g.
+                precision, target, auto_test, bench_test_number)
+            max_candidate_num (int): number of candidates randomly sampled
+                from the search space (None: exhaustive search)
+            max_ulp_error (float): candidates whose maximal error (in ulps
+                outside the expected interval) exceeds this bound are
+                rejected
+            job_num (int): concurrent generations/builds (default
+                get_default_autotune_job_num())
+            bench_job_num (int): concurrent test/bench executions
+            pareto_file (str): JSON file where the Pareto front is merged
+                and persisted
+            scratch_dir (str): directory of candidate builds
+            timeout (float): time limit (in seconds) of each candidate
+                generation and evaluation (default
+                get_default_autotune_timeout())
+        Return:
+            AutotuneResult """
+    global _WORKER_CONTEXT
+    job_num = get_default_autotune_job_num() if job_num is None else job_num
+    timeout = get_default_autotune_timeout() if timeout is None else timeout
+    base_args = dict(base_args or {})
+    # functional test, error analysis and bench are required to rank
+    # candidates, which are only built (test and bench are executed by the
+    # evaluation workers)
+    candidate_base_args = dict(base_args)
+    candidate_base_args.setdefault("auto_test", 1000)
+    candidate_base_args.setdefault("bench_test_number", 1000)
+    candidate_base_args.update(error_analysis=True, build_enable=True, execute_trigger=False)
+
+    candidate_list = get_candidate_list(search_space, max_candidate_num, seed)
+    candidate_arg_list = []
+    for config in candidate_list:
+        kw = dict(candidate_base_args)
+        kw.update(config)
+        candidate_arg_list.append(metafunction_class.get_default_args(**kw))
+    scratch_dir = os.path.abspath(scratch_dir or tempfile.mkdtemp(prefix="ml_autotune_"))
+    Log.report(
+        LOG_AUTOTUNE_INFO, "auto-tuning {}: {} candidate(s), scratch directory {}",
+        metafunction_class.__name__, len(candidate_list), scratch_dir)
+    prepare_scratch_workers()
+
+    result_list = [CandidateResult(config) for config in candidate_list]
+    _WORKER_CONTEXT = (metafunction_class, candidate_arg_list, scratch_dir)
+    try:
+        build_list = run_processes(
+            _worker_build_candidate, list(range(len(candidate_list))), job_num,
+            lambda index, reason: (index, None, "generation failed: {}".format(reason)),
+            timeout=timeout, initializer=init_autotune_worker)
+    finally:
+        _WORKER_CONTEXT = None
+    task_list = []
+    for index, lib_path, error in build_list:
+        if error is None:
+            task_list.append((index, lib_path))
+        else:
+            result_list[index].error = error
+    evaluation_list = run_processes(
+        _worker_evaluate_candidate, task_list, bench_job_num,
+        lambda task, reason: (task[0], None, None, "evaluation failed: {}".format(reason)),
+        timeout=timeout)
+    for index, cpe, candidate_max_ulp_error, error in evaluation_list:
+        result = result_list[index]
+        result.cpe = cpe
+        result.max_ulp_error = candidate_max_ulp_error
+        result.error = error
+        if error is None and not max_ulp_error is None and candidate_max_ulp_error > max_ulp_error:
+            result.error = "max error {} ulp(s) exceeds bound".format(candidate_max_ulp_error)
+    for result in result_list:
+        Log.report(LOG_AUTOTUNE_INFO, "{}", result)
+
+    valid_list = [result for result in result_list if result.is_valid()]
+    best = min(valid_list, key=lambda result: (result.cpe, result.max_ulp_error)) if valid_list else None
+    if best is None:
+        Log.report(Log.Warning, "auto-tuning {}: every candidate was rejected", metafunction_class.__name__)
+
+    # previous Pareto front entries are merged with the new results
+    pareto_key = get_pareto_key(metafunction_class.__name__, base_args)
+    previous_front = load_pareto_file(pareto_file, pareto_key)
+    pareto_front = get_pareto_front(previous_front + valid_list)
+    if not pareto_file is None:
+        save_pareto_file(pareto_file, pareto_key, pareto_front)
+    return AutotuneResult(metafunction_class, base_args, result_list, pareto_front, best)
@@ -35,15 +35,44 @@
 
 import ctypes
 import hashlib
+import multiprocessing
+import re
 import subprocess
 import os
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # concurrent.futures is not available (e.g. python2.7):
+    # projects are built serially
+    ThreadPoolExecutor = None
+
 
 from metalibm_core.core.ml_formats import (
     ML_Binary32, ML_Binary64,
     ML_Int32, ML_Int64, ML_UInt32, ML_UInt64,
 )
+from metalibm_core.code_generation.code_function import FunctionGroup
 from metalibm_core.utility.log_report import Log
+from metalibm_core.utility.disk_cache import DiskCache
+
+LOG_BUILD_CACHE_INFO = Log.LogLevel("Info", "build_cache")
+
+# default size limit (in bytes) of the build cache, can be overloaded
+# through ML_BUILD_CACHE_MAX_SIZE environment variable
+DEFAULT_BUILD_CACHE_MAX_SIZE = 1024 * 2**20
+
+## content-addressed cache of build results (binary file contents),
+#  shared between metalibm processes and LRU-evicted
+build_cache = DiskCache(
+    "build",
+    max_size=int(os.environ.get("ML_BUILD_CACHE_MAX_SIZE", DEFAULT_BUILD_CACHE_MAX_SIZE))
+)
+
+# compiler -> version string (memoization of get_compiler_version)
+COMPILER_VERSION_MAP = {}
+
+INCLUDE_REGEX = re.compile(r'^\s*#\s*include\s*[<"]([^>"]+)[>"]', re.MULTILINE)
 
 
 def get_cmd_stdout(cmd):
@@ -95,6 +124,13 @@ class LoadedBinary:
         adapt_ctypes_wrapper_to_code_function(fct_handle, code_function)
         return fct_handle 
 
+    def get_numpy_harness(self, function_name, target):
+        """ return a NumpyHarness evaluating function_name over numpy
+            arrays (the shim is built for @p target) """
+        # numpy is only required by this harness
+        from metalibm_core.utility.numpy_harness import NumpyHarness
+        return NumpyHarness(self, function_name, target)
+
 def sha256_file(filename):
     """ return the sha256 checksum of @p filename """
     BLOCKSIZE = 65536
@@ -106,41 +142,151 @@ def sha256_file(filename):
             buf = afile.read(BLOCKSIZE)
     return hasher.hexdigest()
 
+def get_compiler_version(compiler):
+    """ return the version string of @p compiler (memoized), which
+        identifies the compiler in build cache keys """
+    if not compiler in COMPILER_VERSION_MAP:
+        try:
+            version_output = subprocess.check_output(
+                "{} --version".format(compiler), stderr=subprocess.STDOUT, shell=True)
+            COMPILER_VERSION_MAP[compiler] = version_output.decode("utf-8", "replace").strip()
+        except subprocess.CalledProcessError:
+            COMPILER_VERSION_MAP[compiler] = "unknown"
+    return COMPILER_VERSION_MAP[compiler]
+
+
+def get_support_lib_dir():
+    """ return the directory of metalibm support library """
+    return os.path.join(os.environ["ML_SRC_DIR"], "metalibm_core", "support_lib")
+
+
+def get_support_lib_source_list():
+    """ return the list of support_lib sources required to link an
+        executable """
+    return [
+        os.path.join(get_support_lib_dir(), "ml_libm_compatibility.c"),
+        os.path.join(get_support_lib_dir(), "ml_multi_prec_lib.c"),
+    ]
+
+
+def get_support_lib_header_digests(src_path):
+    """ return the sorted list of (header path, sha256) of every support_lib
+        header (transitively) included by @p src_path """
+    support_lib_dir = os.path.realpath(get_support_lib_dir())
+    include_dir_list = [os.path.dirname(support_lib_dir), support_lib_dir]
+    digest_map = {}
+    pending_list = [src_path]
+    while pending_list:
+        path = pending_list.pop()
+        with open(path, "r") as src_stream:
+            include_list = INCLUDE_REGEX.findall(src_stream.read())
+        for include in include_list:
+            for include_dir in [os.path.dirname(path)] + include_dir_list:
+                header_path = os.path.realpath(os.path.join(include_dir, include))
+                if os.path.isfile(header_path):
+                    break
+            else:
+                # system header (or header outside search path)
+                continue
+            if not header_path.startswith(support_lib_dir + os.sep) or header_path in digest_map:
+                continue
+            digest_map[header_path] = sha256_file(header_path)
+            pending_list.append(header_path)
+    return sorted(
+        (os.path.relpath(path, support_lib_dir), digest) for path, digest in digest_map.items()
+    )
+
+
+def get_build_cache_key(src_list, compiler, compiler_options):
+    """ return the build cache key of the compilation of @p src_list
+        with @p compiler and @p compiler_options """
+    return (
+        tuple(sha256_file(src) for src in src_list),
+        compiler,
+        get_compiler_version(compiler),
+        " ".join(compiler_options.split()),
+        tuple(
+            header_digest for src in src_list for header_digest in get_support_lib_header_digests(src)
+        ),
+    )
+
+
+def get_library_options(library_list):
+    """ return the linker options to link with libraries @p library_list
+        (and the math library) """
+    option_list = []
+    for library in list(library_list) + ["m"]:
+        option = "-l{}".format(library)
+        if not option in option_list:
+            option_list.append(option)
+    return " ".join(option_list)
+
+
 class SourceFile:
-    def __init__(self, path, function_list):
+    def __init__(self, path, function_list, optimization_level="-O2", library_list=None, target=None):
         self.function_list = function_list
         self.path = path
+        # target overloading the one given to build (e.g. multi-target
+        # variants compiled with their own target options)
+        self.target = target
+        # compiler optimization flag (e.g. -O0 for test harness sources)
+        self.optimization_level = optimization_level
+        # extra libraries required to link the source (e.g. ["mpfr", "gmp"])
+        self.library_list = [] if library_list is None else library_list
 
-    def build(self, target, bin_name=None, shared_object=False, link=False):
+    def get_library_options(self):
+        """ return the linker options for the libraries required by @p self """
+        return get_library_options(self.library_list)
+
+    def build(self, target, bin_name=None, shared_object=False, link=False, position_independent=False):
         """ Build @p self source file for @p target processor 
             Args:
                 target: target processor
                 bin_name(str): name of the binary file (build result)
                 shared_object: build as shared object
                 link: enable/disable link
+                position_independent: generate position independent code
+                    (when building an object file to be linked into a
+                    shared object)
             Return:
                 BinaryFile, str (error, stdout) """
         bin_name = bin_name or sha256_file(self.path) 
+        target = target if self.target is None else self.target
         compiler = target.get_compiler()
-        DEFAULT_OPTIONS = ["-O2", "-DML_DEBUG"]
+        DEFAULT_OPTIONS = [self.optimization_level, "-DML_DEBUG"]
         compiler_options = " ".join(DEFAULT_OPTIONS + target.get_compilation_options())
+        src_list = [self.path]
+        library_options = ""
         if not(link):
             # build only, disable link
             if shared_object:
                 compiler_options += " -fPIC -shared "
             else:
                 compiler_options += " -c  "
+                if position_independent:
+                    compiler_options += " -fPIC "
         else:
-            src_list += [
-                "%s/metalibm_core/support_lib/ml_libm_compatibility.c" % (os.environ["ML_SRC_DIR"]),
-                "%s/metalibm_core/support_lib/ml_multi_prec_lib.c" % (os.environ["ML_SRC_DIR"]),
-            ]
+            src_list += get_support_lib_source_list()
+        if link or shared_object:
+            library_options = self.get_library_options()
         Log.report(Log.Info, "Compiler options: \"{}\"".format(compiler_options))
 
+        cache_key = None
+        if build_cache.is_enabled():
+            cache_key = get_build_cache_key(src_list, compiler, compiler_options + " " + library_options)
+            bin_content = build_cache.get(cache_key)
+            if not bin_content is None:
+                Log.report(LOG_BUILD_CACHE_INFO, "build cache hit for {}", self.path)
+                with open(bin_name, "wb") as bin_stream:
+                    bin_stream.write(bin_content)
+                os.chmod(bin_name, 0o755)
+                return BinaryFile(bin_name, self, shared_object=shared_object)
+
         build_command = "{compiler} {options} -I{ML_SRC_DIR}/metalibm_core \
-        {src_file} -o {bin_name} -lm ".format(
+        {src_file} -o {bin_name} {libraries}".format(
             compiler=compiler,
-            src_file=self.path,
+            libraries=library_options,
+            src_file=" ".join(src_list),
             bin_name=bin_name,
             options=compiler_options,
             ML_SRC_DIR=os.environ["ML_SRC_DIR"])
@@ -151,37 +297,93 @@ class SourceFile:
         if build_result:
             return None
         else:
+            if not cache_key is None:
+                with open(bin_name, "rb") as bin_stream:
+                    build_cache.put(cache_key, bin_stream.read())
             return BinaryFile(bin_name, self, shared_object=shared_object)
 
         
 
 
+def get_default_build_job_num():
+    """ default number of concurrent compilations, can be overloaded
+        by the ML_BUILD_JOBS environment variable """
+    return int(os.environ.get("ML_BUILD_JOBS", multiprocessing.cpu_count()))
+
+
 class BuildProject:
+    """ Project made of several translation units (SourceFile-s) which
+        are compiled concurrently and linked together """
     def __init__(self, source_file_list):
         self.source_file_list = source_file_list
         self.function_list = FunctionGroup()
-        for function_group in source_file.function_list:
-            self.merge_with_group(function_group)
+        for source_file in source_file_list:
+            self.function_list.merge_with_group(source_file.function_list, demote_sub_core=False)
 
-    def build(self, target, bin_name, shared_object=False, link=False):
-        bin_list = [source_file.build(shared_object=shared_object, link=False) for source_file in self.source_file_list]
-        if None in bin_list:
+    def build(self, target, bin_name, shared_object=False, link=False, static_library=False, job_num=None):
+        """ Build every source file of @p self into an object file (using at
+            most @p job_num concurrent compilations) and link them together
+            Args:
+                target: target processor
+                bin_name(str): name of the binary file (build result)
+                shared_object: link as shared object
+                link: link as executable
+                static_library: archive objects as a static library
+                job_num(int): maximal number of concurrent compilations
+            Return:
+                BinaryFile (None if build failed) """
+        job_num = get_default_build_job_num() if job_num is None else job_num
+        source_file_list = self.source_file_list
+        if link:
+            source_file_list = source_file_list + [
+                SourceFile(src, FunctionGroup()) for src in get_support_lib_source_list()
+            ]
+        obj_name_list = [
+            "{}.{}.o".format(bin_name, index) for index in range(len(source_file_list))
+        ]
+
+        def build_object(source_file, obj_name):
+            return source_file.build(
+                target, obj_name, shared_object=False, link=False,
+                position_independent=shared_object
+            )
+
+        if job_num <= 1 or ThreadPoolExecutor is None:
+            obj_list = [
+                build_object(source_file, obj_name) for source_file, obj_name
+                in zip(source_file_list, obj_name_list)
+            ]
+        else:
+            executor = ThreadPoolExecutor(max_workers=job_num)
+            try:
+                obj_list = list(executor.map(build_object, source_file_list, obj_name_list))
+            finally:
+                executor.shutdown(wait=True)
+        if None in obj_list:
             # at least one source file could no be built properly
             return None
+        obj_src = " ".join(obj_file.path for obj_file in obj_list)
+        if static_library:
+            # ar appends to an existing archive: stale objects from a
+            # previous build must not survive
+            if os.path.exists(bin_name):
+                os.remove(bin_name)
+            link_command = "ar rcs {bin_name} {obj_src}".format(
+                bin_name=bin_name, obj_src=obj_src)
         else:
-            link_options = "-fPIC -shared" if shared_object else ""
-            link_options += "-c" if not link else ""
-            link_command = "{compiler} {link_options} {bin_src} -o {bin_name}".format(
-                compiler=processor.get_compiler(),
-                link_options=link_options,
-                bin_src=" ".join(bin_file.path for bin_file in bin_list),
-                bin_name=bin_name
+            link_command = "{compiler} {link_options} {obj_src} -o {bin_name} {libraries}".format(
+                compiler=target.get_compiler(),
+                link_options="-fPIC -shared" if shared_object else "",
+                obj_src=obj_src,
+                bin_name=bin_name,
+                libraries=get_library_options(
+                    lib for source_file in source_file_list for lib in source_file.library_list
+                )
             )
-            Log.report(Log.Verbose, "linking project with command: {}", link_command)
-            link_result, link_stdout = get_cmd_stdout(link_command)
-            Log.report(Log.Verbose, "link stdout: {}", link_stdout)
-            if link_result:
-                return None
-            else:
-                return BinaryFile(bin_name, self, shared_object=shared_object)
-
+        Log.report(Log.Verbose, "linking project with command: {}", link_command)
+        link_result, link_stdout = get_cmd_stdout(link_command)
+        Log.report(Log.Verbose, "link stdout: {}", link_stdout)
+        if link_result:
+            return None
+        else:
+            return BinaryFile(bin_name, self, shared_object=shared_object, main=link)
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 17th, 2026
+# last-modified:    Oct 17th, 2026
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Persistent content-addressed on-disk cache
+
+    Each entry is stored in its own pickle file whose name is the sha256
+    digest of the entry key. Entries are written atomically (temporary file
+    + rename) so several metalibm processes can share a cache directory.
+    The cache size is bounded: when it exceeds its limit, least recently
+    used entries (by file modification time, refreshed on every hit) are
+    evicted.
+
+    Environment variables:
+        ML_CACHE_DIR: root directory of every metalibm cache
+                      (default ~/.cache/metalibm)
+        ML_CACHE_MAX_SIZE: default size limit of each cache, in bytes
+        ML_DISABLE_CACHE: if defined, every cache is disabled
+"""
+
+import atexit
+import hashlib
+import os
+import pickle
+import tempfile
+
+import sollya
+
+from metalibm_core.utility.log_report import Log
+
+LOG_CACHE_INFO = Log.LogLevel("Info", "cache")
+
+# default size limit (in bytes) for a single cache directory
+DEFAULT_CACHE_MAX_SIZE = 256 * 2**20
+
+
+def get_cache_root_dir():
+    """ return the root directory where metalibm caches are stored """
+    return os.environ.get(
+        "ML_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "metalibm")
+    )
+
+
+## memoized digest of metalibm sources (None means not computed yet)
+METALIBM_SOURCE_DIGEST = None
+
+def get_metalibm_source_digest():
+    """ return a digest of every python source file of metalibm_core.
+        It can be used in cache keys whose values depend on metalibm's
+        implementation (e.g. accuracy or rounding code) """
+    global METALIBM_SOURCE_DIGEST
+    if METALIBM_SOURCE_DIGEST is None:
+        source_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        source_hash = hashlib.sha256()
+        for dir_path, dir_names, file_names in os.walk(source_root):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                if not file_name.endswith(".py"):
+                    continue
+                file_path = os.path.join(dir_path, file_name)
+                source_hash.update(os.path.relpath(file_path, source_root).encode("utf-8"))
+                with open(file_path, "rb") as source_stream:
+                    source_hash.update(source_stream.read())
+        METALIBM_SOURCE_DIGEST = source_hash.hexdigest()
+    return METALIBM_SOURCE_DIGEST
+
+
+def serialize_sollya_object(value):
+    """ convert a SollyaObject to an exact string representation
+        (hexadecimal display) which can be parsed back by sollya.parse """
+    old_display = sollya.settings.display
+    sollya.settings.display = sollya.hexadecimal
+    result = str(value)
+    sollya.settings.display = old_display
+    return result
+
+
+def deserialize_sollya_object(value_str):
+    """ inverse of serialize_sollya_object """
+    return sollya.parse(value_str)
+
+
+class DiskCache(object):
+    """ Persistent key -> value cache stored on disk.
+
+        key must be a tuple of values with a deterministic repr (str, int,
+        tuple ...), value must be picklable """
+    # global switch (e.g. command-line --no-cache)
+    enabled = not "ML_DISABLE_CACHE" in os.environ
+    # list of every cache object created during the current process
+    cache_list = []
+
+    def __init__(self, name, cache_dir=None, max_size=None, version=0):
+        """ Args:
+                name (str): cache name, also used as sub-directory name
+                cache_dir (str): root directory (default get_cache_root_dir())
+                max_size (int): size limit in bytes
+                version (int): format version, should be bumped when
+                    the layout of cached values changes """
+        self.name = name
+        self.version = version
+        self.cache_dir = os.path.join(cache_dir or get_cache_root_dir(), name)
+        if max_size is None:
+            max_size = int(os.environ.get("ML_CACHE_MAX_SIZE", DEFAULT_CACHE_MAX_SIZE))
+        self.max_size = max_size
+        # size of the cache directory, lazily evaluated on first store
+        self.current_size = None
+        # statistics
+        self.hit_count = 0
+        self.miss_count = 0
+        self.store_count = 0
+        self.eviction_count = 0
+        DiskCache.cache_list.append(self)
+
+    def is_enabled(self):
+        return DiskCache.enabled and self.max_size > 0
+
+    def get_key_digest(self, key):
+        """ return the hexadecimal digest used as @p key file name """
+        return hashlib.sha256(
+            repr((self.name, self.version, key)).encode("utf-8")
+        ).hexdigest()
+
+    def get_entry_path(self, key):
+        return os.path.join(self.cache_dir, self.get_key_digest(key) + ".pkl")
+
+    def get(self, key, default=None):
+        """ return the value associated with @p key, or @p default
+            if @p key is not cached """
+        if not self.is_enabled():
+            return default
+        entry_path = self.get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as entry_stream:
+                stored_key, value = pickle.load(entry_stream)
+        except Exception:
+            # missing or corrupted entry
+            self.miss_count += 1
+            return default
+        if stored_key != key:
+            # digest collision (or stale entry), considered as a miss
+            self.miss_count += 1
+            return default
+        self.hit_count += 1
+        try:
+            # refresh entry time for LRU eviction
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        return value
+
+    def __contains__(self, key):
+        return self.is_enabled() and os.path.isfile(self.get_entry_path(key))
+
+    def put(self, key, value):
+        """ store @p value associated to @p key """
+        if not self.is_enabled():
+            return
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as entry_stream:
+                pickle.dump((key, value), entry_stream, protocol=2)
+            entry_size = os.path.getsize(tmp_path)
+            os.rename(tmp_path, self.get_entry_path(key))
+        except (OSError, IOError, pickle.PicklingError) as e:
+            Log.report(Log.Warning, "unable to store entry in cache {}: {}", self.name, e)
+            return
+        self.store_count += 1
+        if self.current_size is None:
+            self.current_size = self.get_disk_size()
+        else:
+            self.current_size += entry_size
+        if self.current_size > self.max_size:
+            self.evict()
+
+    def get_or_compute(self, key, compute_function):
+        """ return the cached value for @p key, calling (and caching)
+            compute_function() if @p key is not available """
+        # a private sentinel allows None to be cached
+        sentinel = []
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute_function()
+            self.put(key, value)
+        return value
+
+    def get_entry_list(self):
+        """ return the list of (mtime, size, path) of every cache entry """
+        entry_list = []
+        if not os.path.isdir(self.cache_dir):
+            return entry_list
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(".pkl"):
+                continue
+            path = os.path.join(self.cache_dir, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # entry removed concurrently
+                continue
+            entry_list.append((stat.st_mtime, stat.st_size, path))
+        return entry_list
+
+    def get_disk_size(self):
+        return sum(size for _, size, _ in self.get_entry_list())
+
+    def evict(self):
+        """ remove least recently used entries until the cache size
+            drops below 3/4 of its limit """
+        entry_list = sorted(self.get_entry_list())
+        size = sum(size for _, size, _ in entry_list)
+        target_size = (self.max_size * 3) // 4
+        for _, entry_size, path in entry_list:
+            if size <= target_size:
+                break
+            try:
+                os.remove(path)
+                self.eviction_count += 1
+            except OSError:
+                pass
+            size -= entry_size
+        self.current_size = size
+
+    def clear(self):
+        """ remove every entry from the cache """
+        for _, _, path in self.get_entry_list():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.current_size = 0
+
+    def get_stats(self):
+        """ return a dict of statistics on cache usage """
+        access_count = self.hit_count + self.miss_count
+        return {
+            "name": self.name,
+            "hit": self.hit_count,
+            "miss": self.miss_count,
+            "store": self.store_count,
+            "eviction": self.eviction_count,
+            "hit_rate": (self.hit_count / float(access_count)) if access_count else 0.0,
+        }
+
+    def __str__(self):
+        return "{name}: {hit} hit(s), {miss} miss(es), {store} store(s), " \
+               "{eviction} eviction(s), hit rate {hit_rate:.2%}".format(
+                   **self.get_stats())
+
+    @staticmethod
+    def report_all_stats(level=LOG_CACHE_INFO):
+        """ report statistics of every used cache """
+        for cache in DiskCache.cache_list:
+            if cache.hit_count + cache.miss_count + cache.store_count > 0:
+                Log.report(level, "cache {}", cache)
+
+
+# cache statistics are displayed at exit with --verbose Info:cache
+atexit.register(DiskCache.report_all_stats)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 17th, 2026
+# last-modified:    Oct 17th, 2026
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Error analysis results of functional tests
+
+    Python mirror (ctypes) of the ml_error_analysis_t structure filled by
+    the test wrapper when --error-analysis is enabled
+    (see support_lib/ml_error_analysis.h). Results can be read from a loaded
+    test library (get_error_analysis) or from a binary dump
+    (load_error_analysis). """
+
+import ctypes
+
+from metalibm_core.utility.log_report import Log
+
+ERROR_ANALYSIS_VERSION = 1
+ERROR_SUBRANGE_NUM = 64
+ERROR_EXPONENT_NUM = 2048
+ERROR_WORST_NUM = 16
+
+## exponent bias of the formats supported by error analysis
+#  (indexed by format bit-size)
+EXPONENT_BIAS = {32: 127, 64: 1023}
+
+
+class ErrorCase(ctypes.Structure):
+    """ test case (mirror of ml_error_case_t) """
+    _fields_ = [
+        ("index", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32),
+        ("input", ctypes.c_double),
+        ("result", ctypes.c_double),
+        ("expected_low", ctypes.c_double),
+        ("expected_high", ctypes.c_double),
+        ("ulp_error", ctypes.c_double),
+    ]
+
+    def __str__(self):
+        return "test #{}: f({}) = {}, expected [{}; {}] ({} ulp(s))".format(
+            self.index, self.input.hex(), self.result.hex(),
+            self.expected_low.hex(), self.expected_high.hex(), self.ulp_error)
+
+
+class ErrorAnalysis(ctypes.Structure):
+    """ error analysis results (mirror of ml_error_analysis_t) """
+    _fields_ = [
+        ("version", ctypes.c_uint32),
+        ("format_size", ctypes.c_uint32),
+        ("test_num", ctypes.c_uint64),
+        ("error_num", ctypes.c_uint64),
+        ("max_ulp_error", ctypes.c_double),
+        ("sum_ulp_error", ctypes.c_double),
+        ("range_low", ctypes.c_double),
+        ("range_high", ctypes.c_double),
+        ("subrange_test_num", ctypes.c_uint64 * ERROR_SUBRANGE_NUM),
+        ("subrange_max_ulp_error", ctypes.c_double * ERROR_SUBRANGE_NUM),
+        ("exponent_test_num", ctypes.c_uint64 * ERROR_EXPONENT_NUM),
+        ("exponent_max_ulp_error", ctypes.c_double * ERROR_EXPONENT_NUM),
+        ("worst_num", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32),
+        ("worst_list", ErrorCase * ERROR_WORST_NUM),
+    ]
+
+    def get_mean_ulp_error(self):
+        return self.sum_ulp_error / self.test_num if self.test_num else 0.0
+
+    def get_worst_cases(self):
+        """ return the list of worst ErrorCase (decreasing error) """
+        return [self.worst_list[i] for i in range(self.worst_num)]
+
+    def get_subrange_histogram(self):
+        """ return the list of (low, high, test number, max ulp error)
+            of every non-empty input sub-range """
+        step = (self.range_high - self.range_low) / ERROR_SUBRANGE_NUM
+        return [
+            (self.range_low + i * step, self.range_low + (i + 1) * step,
+             self.subrange_test_num[i], self.subrange_max_ulp_error[i])
+            for i in range(ERROR_SUBRANGE_NUM) if self.subrange_test_num[i]
+        ]
+
+    def get_exponent_histogram(self):
+        """ return the list of (unbiased exponent, test number, max ulp error)
+            for every input exponent (first input) covered by the tests """
+        bias = EXPONENT_BIAS[self.format_size]
+        return [
+            (i - bias, self.exponent_test_num[i], self.exponent_max_ulp_error[i])
+            for i in range(ERROR_EXPONENT_NUM) if self.exponent_test_num[i]
+        ]
+
+    def __str__(self):
+        result = "max error: {} ulp(s), mean error: {:.3f} ulp(s), {}/{} inexact test(s)\n".format(
+            self.max_ulp_error, self.get_mean_ulp_error(), self.error_num, self.test_num)
+        result += "".join(
+            "  [{}; {}]: {} test(s), max error {} ulp(s)\n".format(*entry)
+            for entry in self.get_subrange_histogram())
+        result += "".join(
+            "  exponent {}: {} test(s), max error {} ulp(s)\n".format(*entry)
+            for entry in self.get_exponent_histogram())
+        result += "".join("  {}\n".format(case) for case in self.get_worst_cases())
+        return result
+
+
+def check_error_analysis(error_analysis):
+    if error_analysis.version != ERROR_ANALYSIS_VERSION:
+        Log.report(Log.Error, "unsupported error analysis version {}", error_analysis.version)
+    return error_analysis
+
+
+def get_error_analysis(loaded_binary):
+    """ return a copy of the error analysis results of the last test
+        executed in @p loaded_binary (LoadedBinary) """
+    accessor = loaded_binary.loaded_module["ml_get_error_analysis"]
+    accessor.restype = ctypes.POINTER(ErrorAnalysis)
+    accessor.argtypes = []
+    result = ErrorAnalysis()
+    ctypes.memmove(ctypes.byref(result), accessor(), ctypes.sizeof(ErrorAnalysis))
+    return check_error_analysis(result)
+
+
+def load_error_analysis(filename):
+    """ read error analysis results from a binary dump """
+    result = ErrorAnalysis()
+    with open(filename, "rb") as dump_stream:
+        if dump_stream.readinto(result) != ctypes.sizeof(ErrorAnalysis):
+            Log.report(Log.Error, "truncated error analysis dump {}", filename)
+    return check_error_analysis(result)
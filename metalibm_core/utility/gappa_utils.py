@@ -31,12 +31,40 @@
 # author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
 ###############################################################################
 
+import hashlib
+import multiprocessing
+import os
 import re
 import subprocess
 import sys
+import tempfile
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # concurrent.futures is not available (e.g. python2.7):
+    # gappa scripts are executed synchronously
+    ThreadPoolExecutor = None
 
 import sollya
 
+from metalibm_core.utility.disk_cache import (
+    DiskCache, serialize_sollya_object, deserialize_sollya_object
+)
+from metalibm_core.utility.log_report import Log
+
+## on-disk cache of parsed gappa results, indexed by the hash of the
+#  gappa script (and gappa's version)
+gappa_cache = DiskCache("gappa")
+
+## memoized results of gappa availability and version probes
+#  (None means not probed yet)
+GAPPA_INSTALLED = None
+GAPPA_VERSION = None
+
+## executor used to run gappa concurrently (built on first use)
+GAPPA_EXECUTOR = None
+
 def parse_gappa_interval(interval_value):
     # search for middle ","
     end_index = len(interval_value)
@@ -49,18 +77,15 @@ def parse_gappa_interval(interval_value):
     return sollya.Interval(sollya.parse(v0), sollya.parse(v1))
 
 
-def execute_gappa_script_extract(gappa_code, gappa_filename = "gappa_tmp.g"):
+def get_gappa_script_key(gappa_code):
+    """ return the cache key associated with the gappa script @p gappa_code """
+    script_digest = hashlib.sha256(gappa_code.encode("utf-8")).hexdigest()
+    return (script_digest, get_gappa_version())
+
+
+def parse_gappa_result(gappa_result):
+    """ extract the map var -> Interval from the output of gappa """
     result = {}
-    gappa_stream = open(gappa_filename, "w")
-    gappa_stream.write(gappa_code)
-    gappa_stream.close()
-    gappa_cmd = "gappa {}".format(gappa_filename)
-    cmd_result = subprocess.check_output(
-        gappa_cmd, stderr=subprocess.STDOUT, shell=True)
-    if sys.version_info >= (3, 0):
-        gappa_result = str(cmd_result, 'utf-8')
-    else:
-        gappa_result = str(cmd_result)
     start_result_index = gappa_result.index("Results")
     for result_line in gappa_result[start_result_index:].splitlines()[1:]:
         if not " in " in result_line: continue
@@ -71,9 +96,159 @@ def execute_gappa_script_extract(gappa_code, gappa_filename = "gappa_tmp.g"):
     return result
 
 
+def run_gappa_script(gappa_code, gappa_filename="gappa_tmp.g"):
+    """ execute gappa on script @p gappa_code and return gappa's raw output.
+        The script is dumped into a unique temporary file whose name is
+        derived from @p gappa_filename, so concurrent executions never
+        collide. The script file is removed on success and kept (and
+        reported) on failure.
+
+        This function does not manipulate any sollya object and can be
+        safely executed from a worker thread """
+    prefix = os.path.splitext(os.path.basename(gappa_filename))[0] + "_"
+    fd, script_path = tempfile.mkstemp(prefix=prefix, suffix=".g", dir=get_gappa_tmp_dir())
+    with os.fdopen(fd, "w") as gappa_stream:
+        gappa_stream.write(gappa_code)
+    gappa_cmd = "gappa {}".format(script_path)
+    try:
+        cmd_result = subprocess.check_output(
+            gappa_cmd, stderr=subprocess.STDOUT, shell=True)
+    except subprocess.CalledProcessError:
+        Log.report(Log.Warning, "gappa failed on script {}", script_path)
+        raise
+    os.remove(script_path)
+    if sys.version_info >= (3, 0):
+        return str(cmd_result, 'utf-8')
+    else:
+        return str(cmd_result)
+
+
+def get_gappa_tmp_dir():
+    """ directory where gappa scripts are dumped before execution
+        (can be overloaded by the ML_GAPPA_TMP_DIR environment variable) """
+    return os.environ.get("ML_GAPPA_TMP_DIR", tempfile.gettempdir())
+
+
+def get_gappa_executor():
+    """ return the (lazily built) executor in charge of gappa concurrent
+        executions. Its number of workers, which bounds the number of gappa
+        processes running concurrently, is defined by the ML_GAPPA_JOBS
+        environment variable (default: number of cpus).
+        Return None if concurrent execution is not available """
+    global GAPPA_EXECUTOR
+    if GAPPA_EXECUTOR is None and not ThreadPoolExecutor is None:
+        max_workers = int(os.environ.get("ML_GAPPA_JOBS", multiprocessing.cpu_count()))
+        # pythonsollya is not thread-safe: workers only drive gappa
+        # sub-processes, gappa outputs are parsed in the calling thread
+        GAPPA_EXECUTOR = ThreadPoolExecutor(max_workers=max(max_workers, 1))
+    return GAPPA_EXECUTOR
+
+
+class GappaFuture(object):
+    """ Future result of a gappa script execution.
+
+        The raw gappa output is computed asynchronously, it is parsed
+        (and stored in the gappa cache) by the first call to result(), which
+        returns the map of result intervals """
+    def __init__(self, cache_key, output_future=None, result_map=None):
+        self.cache_key = cache_key
+        self.output_future = output_future
+        self.result_map = result_map
+
+    def done(self):
+        return self.result_map is not None or self.output_future.done()
+
+    def result(self):
+        """ wait for gappa completion and return the map of result
+            intervals """
+        if self.result_map is None:
+            self.set_output(self.output_future.result())
+        return self.result_map
+
+    def set_output(self, gappa_result):
+        """ parse the raw gappa output @p gappa_result and store the
+            extracted intervals in the gappa cache """
+        self.result_map = parse_gappa_result(gappa_result)
+        gappa_cache.put(
+            self.cache_key,
+            tuple((var, serialize_sollya_object(self.result_map[var])) for var in sorted(self.result_map))
+        )
+
+    def then(self, post_process):
+        """ return a future whose result is post_process(self.result()) """
+        return DerivedGappaFuture(self, post_process)
+
+
+class DerivedGappaFuture(object):
+    """ Future result obtained by post-processing another future's result """
+    def __init__(self, source_future, post_process):
+        self.source_future = source_future
+        self.post_process = post_process
+
+    def done(self):
+        return self.source_future.done()
+
+    def result(self):
+        return self.post_process(self.source_future.result())
+
+    def then(self, post_process):
+        return DerivedGappaFuture(self, post_process)
+
+
+def execute_gappa_script_extract_async(gappa_code, gappa_filename = "gappa_tmp.g"):
+    """ asynchronous version of execute_gappa_script_extract, return a
+        GappaFuture. Cached results are resolved immediately """
+    cache_key = get_gappa_script_key(gappa_code)
+    cached_result = gappa_cache.get(cache_key)
+    if not cached_result is None:
+        return GappaFuture(cache_key, result_map=dict(
+            (var, deserialize_sollya_object(interval_str))
+            for var, interval_str in cached_result
+        ))
+    executor = get_gappa_executor()
+    if executor is None:
+        # no concurrent execution available: the future is resolved eagerly
+        gappa_future = GappaFuture(cache_key)
+        gappa_future.set_output(run_gappa_script(gappa_code, gappa_filename))
+        return gappa_future
+    output_future = executor.submit(run_gappa_script, gappa_code, gappa_filename)
+    return GappaFuture(cache_key, output_future=output_future)
+
+
+def execute_gappa_script_extract(gappa_code, gappa_filename = "gappa_tmp.g"):
+    """ execute gappa on script @p gappa_code (dumped in a unique file
+        derived from @p gappa_filename) and return the map of result
+        intervals. Results are cached on disk so identical scripts are only
+        proved once """
+    return execute_gappa_script_extract_async(gappa_code, gappa_filename).result()
+
+
+def wait_all(future_list):
+    """ wait for every future of @p future_list and return the list
+        of their results (in the same order) """
+    return [future.result() for future in future_list]
+
+
 ## Check if gappa binary is available in the execution environement
+#  the probe is only executed once per process
 def is_gappa_installed():
     """ check if gappa is present on the execution environement """
-    dev_null = open("/dev/null", "w")
-    gappa_test = subprocess.call("gappa --help 2> /dev/null", shell=True)
-    return (gappa_test == 0)
+    global GAPPA_INSTALLED
+    if GAPPA_INSTALLED is None:
+        gappa_test = subprocess.call("gappa --help 2> /dev/null", shell=True)
+        GAPPA_INSTALLED = (gappa_test == 0)
+    return GAPPA_INSTALLED
+
+
+def get_gappa_version():
+    """ return gappa's version string (memoized), None if gappa is not
+        available """
+    global GAPPA_VERSION
+    if GAPPA_VERSION is None and is_gappa_installed():
+        try:
+            version_output = subprocess.check_output(
+                "gappa --version", stderr=subprocess.STDOUT, shell=True)
+            GAPPA_VERSION = version_output.decode("utf-8", "replace").strip()
+        except subprocess.CalledProcessError:
+            GAPPA_VERSION = "unknown"
+    return GAPPA_VERSION
@@ -42,12 +42,13 @@ from sollya import Interval
 
 from .arg_utils import extract_option_value, test_flag_option
 from .log_report import Log
+from .disk_cache import DiskCache
 
 from ..core.ml_formats import *
 from ..core.precisions import *
 
 from ..code_generation.generic_processor import GenericProcessor
-from ..core.target import TargetRegister
+from ..core.target import TargetRegister, LazyTargetInstance
 from ..targets import *
 from ..code_generation.code_constant import *
 from ..core.passes import Pass
@@ -241,6 +242,24 @@ class ExitOnErrorAction(argparse.Action):
         Log.exit_on_error = True
 
 
+class DisableCacheAction(argparse.Action):
+    """ Custom action for command-line command --no-cache """
+    def __init__(self, option_strings, dest, nargs=None, **kwargs):
+        super(DisableCacheAction, self).__init__(
+            option_strings, dest, nargs=nargs, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        DiskCache.enabled = False
+
+
+class BuildCacheSizeAction(argparse.Action):
+    """ Custom action for command-line command --build-cache-size """
+    def __call__(self, parser, namespace, values, option_string=None):
+        from metalibm_core.utility.build_utils import build_cache
+        build_cache.max_size = values
+        setattr(namespace, self.dest, values)
+
+
 class VerboseAction(argparse.Action):
     def __init__(self, option_strings, dest, nargs=None, **kwargs):
         if nargs is not None:
@@ -356,7 +375,7 @@ class ArgDefault(object):
 #  are given for a specific parameter
 
 
-class DefaultArgTemplate:
+class DefaultArgTemplate(object):
     base_name = "unknown_function"
     function_name = "undef_function"
     output_file = "undef.c"
@@ -378,7 +397,7 @@ class DefaultArgTemplate:
     libm_compliant = False
     input_interval = Interval(0, 1)
     # Optimization parameters
-    target = GenericProcessor()
+    target = LazyTargetInstance(GenericProcessor)
     fuse_fma = False
     fast_path_extract = True
     dot_product_enabled = False
@@ -387,14 +406,31 @@ class DefaultArgTemplate:
     # Vector related parameters
     vector_size = 1
     sub_vector_size = None
+    # generate the <function>_array entry point (arrays of n elements)
+    array_entry = False
+    # list of targets of multi-versioned generation (None: single target)
+    multi_target = None
     language = C_Code
     # auto-test properties
     auto_test = False
     auto_test_range = Interval(0, 1)
     auto_test_std = False
+    # binary test vector file (None: test vectors are stored in C tables)
+    auto_test_file = None
+    # source of auto-test expected values: "python" (numeric_emulate,
+    # computed during generation) or "mpfr" (generate_emulate, at run time)
+    auto_test_reference = "python"
+    # exhaustive test of binary32 functions: enable, number of threads
+    # (0: number of online cpus), number of failing inputs displayed
+    exhaustive_test = False
+    exhaustive_threads = 0
+    exhaustive_failure_num = 10
     # enable max error computation
     compute_max_error = False
     break_error = False
+    # ulp error analysis (histograms, worst inputs) and its binary dump file
+    error_analysis = False
+    error_analysis_dump = None
     # bench properties
     bench_test_number = 0
     bench_test_range = Interval(0, 1)
@@ -409,8 +445,14 @@ class DefaultArgTemplate:
     check_processor_support = True
     # source elaboration
     build_enable = False
+    # number of functions per translation unit (None: single source file)
+    build_split = None
+    # number of concurrent compilations (None: ML_BUILD_JOBS or cpu count)
+    build_jobs = None
     #
     passes = []
+    # pass profiling (None: disabled, "-": print, <file>.json: JSON dump)
+    pass_profile = None
     # built binary execution
     execute_trigger = False
 
@@ -435,7 +477,7 @@ class DefaultEntityArgTemplate(DefaultArgTemplate):
     accuracy = ML_Faithful
     libm_compliant = False
     # Optimization parameters,
-    backend = VHDLBackend()
+    backend = LazyTargetInstance(VHDLBackend)
     fuse_fma = None
     fast_path_extract = False
     # Debug verbosity,
@@ -523,6 +565,18 @@ class ML_CommonArgTemplate(object):
             "--sub-vector-size", dest="sub_vector_size", type=int,
             default=default_arg.sub_vector_size,
             help="define size of sub vector")
+        self.parser.add_argument(
+            "--multi-target", dest="multi_target",
+            type=lambda s: [target_instanciate(name) for name in s.split(",")],
+            default=default_arg.multi_target, metavar="TARGET_LIST",
+            help="generate a variant of the function for each target of the \
+      comma separated TARGET_LIST and a dispatcher selecting the best one \
+      supported by the cpu at load time")
+        self.parser.add_argument(
+            "--array-entry", dest="array_entry", action="store_const",
+            const=True, default=default_arg.array_entry,
+            help="also generate <function>_array(in, out, n) entry point \
+      applying the function to arrays (and bench it)")
         # language selection
         self.parser.add_argument(
             "--language", dest="language", type=language_parser,
@@ -545,6 +599,31 @@ class ML_CommonArgTemplate(object):
             "--auto-test-std", dest="auto_test_std", action="store_const",
             const=True, default=default_arg.auto_test_std,
             help="enabling function test on standard test case list")
+        self.parser.add_argument(
+            "--auto-test-file", dest="auto_test_file", action="store",
+            default=default_arg.auto_test_file, metavar="FILE",
+            help="store auto-test inputs and expected outputs in binary file \
+      FILE (memory-mapped by the test wrapper) rather than in C tables")
+        self.parser.add_argument(
+            "--auto-test-reference", dest="auto_test_reference", action="store",
+            default=default_arg.auto_test_reference, choices=["python", "mpfr"],
+            help="select how auto-test expected values are computed: during \
+      generation by numeric_emulate (python) or at run time by MPFR with the \
+      function's generate_emulate (mpfr)")
+        self.parser.add_argument(
+            "--exhaustive", dest="exhaustive_test", action="store_const",
+            const=True, default=default_arg.exhaustive_test,
+            help="generate a test checking every binary32 input against \
+      the MPFR emulation (multi-threaded)")
+        self.parser.add_argument(
+            "--exhaustive-threads", dest="exhaustive_threads", action="store",
+            type=int, default=default_arg.exhaustive_threads, metavar="NUM",
+            help="number of threads used by --exhaustive test \
+      (default 0: number of online cpus)")
+        self.parser.add_argument(
+            "--exhaustive-failures", dest="exhaustive_failure_num", action="store",
+            type=int, default=default_arg.exhaustive_failure_num, metavar="NUM",
+            help="number of failing inputs reported by --exhaustive test")
 
         # enable the computation of eval error (if self-testing enabled)
         self.parser.add_argument(
@@ -552,6 +631,16 @@ class ML_CommonArgTemplate(object):
             const=True, default=default_arg.compute_max_error,
             help="enable the computation of the maximum error "
                  "(if auto-test is enabled)")
+        self.parser.add_argument(
+            "--error-analysis", dest="error_analysis", action="store_const",
+            const=True, default=default_arg.error_analysis,
+            help="enable ulp error analysis of auto-test results (max/mean "
+                 "error, histograms per input sub-range and exponent, worst inputs)")
+        self.parser.add_argument(
+            "--error-analysis-dump", dest="error_analysis_dump", action="store",
+            default=default_arg.error_analysis_dump, metavar="FILE",
+            help="dump --error-analysis results into binary FILE "
+                 "(see metalibm_core/utility/error_analysis.py)")
         self.parser.add_argument(
             "--break_error", dest="break_error", action="store_const",
             const=True, default=default_arg.break_error,
@@ -589,6 +678,18 @@ class ML_CommonArgTemplate(object):
             nargs=0,
             help="convert Fatal error to sys exit rather than exception")
 
+        self.parser.add_argument(
+            "--no-cache", dest="disable_cache",
+            action=DisableCacheAction, const=True,
+            default=False,
+            nargs=0,
+            help="disable metalibm persistent caches (e.g. sollya approximations)")
+        self.parser.add_argument(
+            "--build-cache-size", dest="build_cache_size",
+            action=BuildCacheSizeAction, type=int, default=None,
+            metavar="BYTES",
+            help="size limit of the build cache (0 disables it)")
+
         self.parser.add_argument(
             "--ml-debug", dest="ml_debug", action=MLDebugAction, const=True,
             default=False, help="enable metalibm debug")
@@ -601,6 +702,12 @@ class ML_CommonArgTemplate(object):
             "--passes", default=default_arg.passes, action="store", dest="passes",
             type=lambda s: s.split(","), help="comma separated list \
       of slot:pass to be executed ")
+        # pass profiling
+        self.parser.add_argument(
+            "--pass-profile", dest="pass_profile", nargs="?", const="-",
+            default=default_arg.pass_profile, metavar="FILE",
+            help="profile pass execution (time, peak memory, node count): \
+      print a table, write it in FILE, or dump it as JSON if FILE ends with .json")
         # disable check processor pass
         self.parser.add_argument(
             "--disable-check", default=True, action="store_const",
@@ -611,6 +718,17 @@ class ML_CommonArgTemplate(object):
             "--build", dest="build_enable", action="store_const",
             const=True, default=default_arg.build_enable,
             help="enable RTL elaboration")
+        # multi translation unit build
+        self.parser.add_argument(
+            "--build-split", dest="build_split", type=int,
+            default=default_arg.build_split, metavar="FCT_NUM",
+            help="build generated code as several translation units of at most \
+      FCT_NUM functions each, compiled concurrently")
+        self.parser.add_argument(
+            "--build-jobs", dest="build_jobs", type=int,
+            default=default_arg.build_jobs, metavar="JOB_NUM",
+            help="maximal number of concurrent compilations (default: \
+      ML_BUILD_JOBS or number of cpus)")
 
         # trigger generated code execution / simulation
         self.parser.add_argument(
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 17th, 2026
+# last-modified:    Oct 17th, 2026
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Multi-target (function multi-versioning) support
+
+    A meta-function can be generated for a list of targets (--multi-target),
+    each variant being renamed <function>_<target name>. A dispatcher source
+    file exposes the original function name and selects the best variant
+    supported by the cpu at load time (cpuid through
+    __builtin_cpu_supports), either with a GNU indirect function (ifunc) or
+    with a function pointer resolved by a constructor. """
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+from metalibm_core.code_generation.code_constant import C_Code
+
+from metalibm_core.utility.build_utils import get_cmd_stdout
+from metalibm_core.utility.log_report import Log
+
+
+# target name -> host cpu supports target (memoization of
+# host_supports_target)
+HOST_SUPPORT_MAP = {}
+
+
+def get_target_cpu_feature_list(target):
+    """ return the list of cpu features (as named by __builtin_cpu_supports)
+        required to execute code generated for @p target (empty for targets
+        which do not declare any) """
+    return list(getattr(target, "cpu_feature_list", []))
+
+
+def get_cpu_support_condition(target):
+    """ return the C condition checking that the cpu supports every
+        feature required by @p target """
+    return " && ".join(
+        "__builtin_cpu_supports(\"{}\")".format(feature) for feature in get_target_cpu_feature_list(target)
+    ) or "1"
+
+
+def host_supports_target(target):
+    """ check (by building and executing a cpuid probe with @p target's
+        compiler) whether the host cpu can execute code generated for
+        @p target (memoized) """
+    feature_list = get_target_cpu_feature_list(target)
+    if not feature_list:
+        return True
+    key = (target.get_compiler(), tuple(feature_list))
+    if not key in HOST_SUPPORT_MAP:
+        probe_dir = tempfile.mkdtemp(prefix="ml_cpu_probe")
+        try:
+            probe_src = os.path.join(probe_dir, "probe.c")
+            probe_bin = os.path.join(probe_dir, "probe")
+            with open(probe_src, "w") as probe_stream:
+                probe_stream.write(
+                    "int main(void) {{\n  __builtin_cpu_init();\n  return !({});\n}}\n".format(
+                        get_cpu_support_condition(target)))
+            build_result, _ = get_cmd_stdout("{} {} -o {}".format(target.get_compiler(), probe_src, probe_bin))
+            HOST_SUPPORT_MAP[key] = not build_result and subprocess.call([probe_bin]) == 0
+        finally:
+            shutil.rmtree(probe_dir, ignore_errors=True)
+    return HOST_SUPPORT_MAP[key]
+
+
+def sort_variant_list(variant_list):
+    """ sort (target, ...) variant tuples from the most demanding target (in
+        number of required cpu features) to the least demanding one, which
+        is the order in which the dispatcher tests them """
+    return sorted(variant_list, key=lambda variant: -len(get_target_cpu_feature_list(variant[0])))
+
+
+def generate_dispatcher_source(entry_list, variant_list):
+    """ generate the source code of the dispatcher
+
+        Args:
+            entry_list (list): list of dispatched entry points as tuple
+                (name, CodeFunction prototype, dict variant suffix ->
+                variant function name)
+            variant_list (list): list of (target, variant suffix) tuples
+        Return:
+            str: C source code """
+    variant_list = sort_variant_list(variant_list)
+    source = [
+        "/** dispatcher generated by metalibm (--multi-target) */",
+        "#include <stddef.h>",
+        "#include <stdint.h>",
+        "#include <support_lib/ml_vector_format.h>",
+        "",
+        "/* GNU indirect functions are only available on ELF platforms,",
+        " * else the variant is resolved by a constructor */",
+        "#if defined(__ELF__) && defined(__GNUC__) && !defined(ML_DISPATCH_NO_IFUNC)",
+        "#define ML_DISPATCH_IFUNC",
+        "#endif",
+        "",
+    ]
+    main_name = entry_list[0][0]
+    # variant selection (same order for every entry point)
+    source += [
+        "static int {}_select_variant(void) {{".format(main_name),
+        "  __builtin_cpu_init();",
+    ]
+    for index, (target, _) in enumerate(variant_list):
+        source.append("  if ({}) return {};".format(get_cpu_support_condition(target), index))
+    source += [
+        "  return -1;",
+        "}",
+        "",
+        "/** return the name of the target of the selected variant */",
+        "const char* {}_get_variant(void) {{".format(main_name),
+        "  static const char* variant_names[] = {{{}}};".format(
+            ", ".join("\"{}\"".format(suffix) for _, suffix in variant_list)),
+        "  int index = {}_select_variant();".format(main_name),
+        "  return index < 0 ? \"none\" : variant_names[index];",
+        "}",
+        "",
+    ]
+    for entry_name, prototype, variant_name_map in entry_list:
+        result_type = prototype.get_output_format().get_name(language=C_Code)
+        arg_type_list = [arg.get_precision().get_name(language=C_Code) for arg in prototype.get_arg_list()]
+        arg_name_list = ["x{}".format(index) for index in range(len(arg_type_list))]
+        fct_type = "{}_fct_t".format(entry_name)
+        signature = ", ".join(
+            "{} {}".format(arg_type, arg_name) for arg_type, arg_name in zip(arg_type_list, arg_name_list)
+        ) or "void"
+
+        source.append("typedef {} (*{})({});".format(result_type, fct_type, ", ".join(arg_type_list) or "void"))
+        for _, suffix in variant_list:
+            source.append("{} {}({});".format(result_type, variant_name_map[suffix], ", ".join(arg_type_list) or "void"))
+        source += [
+            "",
+            "static {fct_type} {name}_resolve(void) {{".format(fct_type=fct_type, name=entry_name),
+            "  switch ({}_select_variant()) {{".format(main_name),
+        ]
+        for index, (_, suffix) in enumerate(variant_list):
+            source.append("  case {}: return {};".format(index, variant_name_map[suffix]))
+        # least demanding variant as last resort
+        source += [
+            "  default: return {};".format(variant_name_map[variant_list[-1][1]]),
+            "  }",
+            "}",
+            "",
+            "#ifdef ML_DISPATCH_IFUNC",
+            "{} {}({}) __attribute__((ifunc(\"{}_resolve\")));".format(
+                result_type, entry_name, signature, entry_name),
+            "#else",
+            "static {} {}_variant = NULL;".format(fct_type, entry_name),
+            "__attribute__((constructor)) static void {name}_init(void) {{ {name}_variant = {name}_resolve(); }}".format(
+                name=entry_name),
+            "{} {}({}) {{".format(result_type, entry_name, signature),
+            "  {}{}_variant({});".format(
+                "" if result_type == "void" else "return ", entry_name, ", ".join(arg_name_list)),
+            "}",
+            "#endif",
+            "",
+        ]
+    return "\n".join(source)
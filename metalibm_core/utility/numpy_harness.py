@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 17th, 2026
+# last-modified:    Oct 17th, 2026
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Zero-copy NumPy harness for built functions
+
+    A NumpyHarness evaluates a function of a loaded shared object
+    (LoadedBinary) over NumPy arrays. The element loop is run by a small C
+    shim (generated and built once per function): the NumPy buffers are
+    passed directly to the shim (no copy) which calls the function for each
+    element. The shim supports vector formats (each vector element is made
+    of get_vector_size() consecutive array elements) and multiple outputs:
+    the function result (if not void) and each pointer argument (assumed to
+    be an output) are returned as separate arrays. """
+
+import ctypes
+import os
+
+import numpy
+
+from metalibm_core.core.ml_formats import (
+    ML_Void, ML_Binary32, ML_Binary64,
+    ML_Int8, ML_UInt8, ML_Int16, ML_UInt16,
+    ML_Int32, ML_UInt32, ML_Int64, ML_UInt64, ML_Bool,
+)
+from metalibm_core.core.ml_complex_formats import is_pointer
+from metalibm_core.code_generation.code_function import FunctionGroup
+
+from metalibm_core.code_generation.code_constant import C_Code
+
+from metalibm_core.utility.build_utils import SourceFile
+from metalibm_core.utility.log_report import Log
+
+
+def get_numpy_dtype(precision):
+    """ translate a Metalibm scalar format object to its numpy dtype """
+    return {
+        ML_Binary64: numpy.float64,
+        ML_Binary32: numpy.float32,
+        ML_Int8: numpy.int8,
+        ML_UInt8: numpy.uint8,
+        ML_Int16: numpy.int16,
+        ML_UInt16: numpy.uint16,
+        ML_Int32: numpy.int32,
+        ML_UInt32: numpy.uint32,
+        ML_Int64: numpy.int64,
+        ML_UInt64: numpy.uint64,
+        ML_Bool: numpy.int32,
+    }[precision]
+
+
+def get_array_layout(precision):
+    """ return (numpy dtype, number of array elements per function element)
+        of @p precision (scalar or vector format) """
+    if precision.is_vector_format():
+        return get_numpy_dtype(precision.get_scalar_format()), precision.get_vector_size()
+    return get_numpy_dtype(precision), 1
+
+
+class ArrayOperand(object):
+    """ array operand of the harness shim (function input or output) """
+    def __init__(self, precision, is_output, arg_index=None):
+        # precision of one function element
+        self.precision = precision
+        self.is_output = is_output
+        # index of the function argument (None for the function result)
+        self.arg_index = arg_index
+        self.dtype, self.element_size = get_array_layout(precision)
+
+
+def generate_shim_source(function_name, code_function):
+    """ return (shim source code, list of ArrayOperand) of the C loop shim
+        evaluating @p code_function over arrays
+
+        The shim prototype is:
+          void <function_name>_numpy_shim(void* fct, void** arrays, size_t n)
+        where arrays lists the input arrays (one per non pointer argument),
+        then the pointer argument outputs and finally the result array """
+    input_list = []
+    output_list = []
+    arg_list = code_function.get_arg_list()
+    for index, arg in enumerate(arg_list):
+        arg_format = arg.get_precision()
+        if is_pointer(arg_format):
+            output_list.append(ArrayOperand(arg_format.get_data_precision(), True, index))
+        else:
+            input_list.append(ArrayOperand(arg_format, False, index))
+    result_format = code_function.get_output_format()
+    if result_format != ML_Void:
+        output_list.append(ArrayOperand(result_format, True))
+    operand_list = input_list + output_list
+
+    def c_name(precision):
+        return precision.get_name(language=C_Code)
+
+    fct_type = "{}_fct_t".format(function_name)
+    shim_name = "{}_numpy_shim".format(function_name)
+    source = [
+        "#include <stddef.h>",
+        "#include <stdint.h>",
+        "#include <string.h>",
+        "#include <support_lib/ml_vector_format.h>",
+        "",
+        "typedef {} (*{})({});".format(
+            c_name(result_format), fct_type,
+            ", ".join(c_name(arg.get_precision()) for arg in arg_list) or "void"
+        ),
+        "",
+        "void {}(void* fct, void** arrays, size_t n) {{".format(shim_name),
+        "  {fct_type} f = ({fct_type}) fct;".format(fct_type=fct_type),
+        "  for (size_t i = 0; i < n; ++i) {",
+    ]
+    # vector operands may not be aligned in numpy buffers: values are
+    # loaded/stored through memcpy (which is free for scalars)
+    call_arg_map = {}
+    for array_index, operand in enumerate(operand_list):
+        if operand.arg_index is None:
+            continue
+        local_name = "op{}".format(array_index)
+        source.append("    {} {};".format(c_name(operand.precision), local_name))
+        if operand.is_output:
+            call_arg_map[operand.arg_index] = "&" + local_name
+        else:
+            source.append(
+                "    memcpy(&{local}, (char*) arrays[{index}] + i * sizeof({local}), sizeof({local}));".format(
+                    local=local_name, index=array_index))
+            call_arg_map[operand.arg_index] = local_name
+    call = "f({})".format(", ".join(call_arg_map[index] for index in range(len(arg_list))))
+    if result_format != ML_Void:
+        result_index = len(operand_list) - 1
+        source.append("    {} op{} = {};".format(c_name(result_format), result_index, call))
+    else:
+        source.append("    {};".format(call))
+    for array_index, operand in enumerate(operand_list):
+        if operand.is_output:
+            source.append(
+                "    memcpy((char*) arrays[{index}] + i * sizeof(op{index}), &op{index}, sizeof(op{index}));".format(
+                    index=array_index))
+    source += ["  }", "}", ""]
+    return "\n".join(source), operand_list
+
+
+class NumpyHarness(object):
+    """ evaluation of a function of a loaded shared object over numpy
+        arrays """
+    def __init__(self, loaded_binary, function_name, target, shim_name=None):
+        """ Args:
+                loaded_binary(LoadedBinary): shared object containing the
+                    function
+                function_name(str): name of the function
+                target: processor used to build the shim (must be
+                    compatible with the one used to build loaded_binary)
+                shim_name(str): path of the shim shared object (default
+                    derived from the path of loaded_binary) """
+        self.function_name = function_name
+        code_function = loaded_binary.binary_file.source_object.function_list.get_code_function_by_name(function_name)
+        source, self.operand_list = generate_shim_source(function_name, code_function)
+        self.input_list = [operand for operand in self.operand_list if not operand.is_output]
+        self.output_list = [operand for operand in self.operand_list if operand.is_output]
+
+        shim_name = shim_name or "{}.{}_numpy_shim.so".format(loaded_binary.binary_file.path, function_name)
+        source_name = os.path.splitext(shim_name)[0] + ".c"
+        with open(source_name, "w") as source_stream:
+            source_stream.write(source)
+        shim_binary = SourceFile(source_name, FunctionGroup()).build(target, shim_name, shared_object=True)
+        if shim_binary is None:
+            Log.report(Log.Error, "unable to build numpy shim for {}", function_name)
+        self.shim_module = ctypes.CDLL(shim_binary.path)
+        self.shim = self.shim_module["{}_numpy_shim".format(function_name)]
+        self.shim.restype = None
+        self.shim.argtypes = (ctypes.c_void_p, ctypes.POINTER(ctypes.c_void_p), ctypes.c_size_t)
+        # keep a reference on the loaded binary so that the function address
+        # remains valid
+        self.loaded_binary = loaded_binary
+        self.function_address = ctypes.cast(loaded_binary.loaded_module[function_name], ctypes.c_void_p)
+
+    def get_element_num(self, array, operand):
+        """ number of function elements stored in @p array """
+        if array.size % operand.element_size:
+            Log.report(
+                Log.Error, "array size {} is not a multiple of the vector size {} of {}",
+                array.size, operand.element_size, operand.precision)
+        return array.size // operand.element_size
+
+    def __call__(self, *input_arrays, **kwords):
+        """ evaluate the function over @p input_arrays (one per non pointer
+            argument)
+
+            Inputs which are C-contiguous arrays of the expected dtype are
+            not copied. Output arrays can be provided with the out keyword
+            (tuple of arrays, one per output) to avoid allocations.
+            Return a single array for single-output functions, else a tuple
+            (pointer argument outputs, then function result) """
+        if len(input_arrays) != len(self.input_list):
+            Log.report(
+                Log.Error, "{} expects {} input arrays, got {}",
+                self.function_name, len(self.input_list), len(input_arrays))
+        input_arrays = [
+            numpy.ascontiguousarray(array, dtype=operand.dtype) for array, operand in zip(input_arrays, self.input_list)
+        ]
+        element_num_set = set(
+            self.get_element_num(array, operand) for array, operand in zip(input_arrays, self.input_list)
+        )
+        if len(element_num_set) > 1:
+            Log.report(Log.Error, "input arrays of {} have different element counts", self.function_name)
+        element_num = element_num_set.pop() if element_num_set else kwords.get("n", 0)
+        output_arrays = kwords.get("out", None)
+        if output_arrays is None:
+            output_arrays = [
+                numpy.empty(element_num * operand.element_size, dtype=operand.dtype) for operand in self.output_list
+            ]
+        else:
+            for array, operand in zip(output_arrays, self.output_list):
+                if array.dtype != operand.dtype or not array.flags["C_CONTIGUOUS"] or \
+                   self.get_element_num(array, operand) != element_num:
+                    Log.report(Log.Error, "invalid output array for {}", self.function_name)
+        pointer_list = (ctypes.c_void_p * len(self.operand_list))(
+            *[array.ctypes.data for array in list(input_arrays) + list(output_arrays)]
+        )
+        self.shim(self.function_address, pointer_list, element_num)
+        if len(output_arrays) == 1:
+            return output_arrays[0]
+        return tuple(output_arrays)
+
+
+def ulp_distance(result, expected):
+    """ element-wise distance in ulps between float arrays @p result and
+        @p expected (same dtype, float32 or float64), NaNs compare equal
+        to any NaN and distance with a single NaN is the maximal
+        distance """
+    result = numpy.asarray(result)
+    expected = numpy.asarray(expected)
+    int_type = {numpy.dtype(numpy.float32): numpy.int32, numpy.dtype(numpy.float64): numpy.int64}[result.dtype]
+    uint_type = {numpy.int32: numpy.uint32, numpy.int64: numpy.uint64}[int_type]
+    min_value = numpy.iinfo(int_type).min
+
+    def ordinal(array):
+        """ map floats to integers such that consecutive floats have
+            consecutive ordinals (-0 and +0 are both mapped to 0) """
+        bits = array.view(int_type)
+        return numpy.where(bits < 0, min_value - bits, bits)
+
+    # distance is computed in unsigned arithmetic to avoid overflows
+    distance = (ordinal(result).astype(uint_type) - ordinal(expected).astype(uint_type))
+    distance = numpy.minimum(distance, -distance)
+    result_nan = numpy.isnan(result)
+    expected_nan = numpy.isnan(expected)
+    distance[result_nan & expected_nan] = 0
+    distance[result_nan ^ expected_nan] = numpy.iinfo(uint_type).max
+    return distance
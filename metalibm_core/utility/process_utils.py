@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 17th, 2026
+# last-modified:    Oct 17th, 2026
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Execution of independent tasks in forked processes
+
+    run_processes executes each task in its own forked process (at most
+    job_num at a time): a task whose process raises, dies (e.g. segmentation
+    fault in a loaded binary) or exceeds its time limit is turned into a
+    failure result instead of blocking the caller, which is what a
+    multiprocessing.Pool does when one of its workers dies.
+
+    Tasks are forked so that non-picklable objects (metafunctions,
+    targets, sollya values ...) can be shared through module globals set
+    before run_processes is called; only task descriptions and results
+    go through pipes and must be picklable. """
+
+import multiprocessing
+import os
+import sys
+import time
+
+
+def get_fork_context():
+    """ return the multiprocessing context forking processes, or None if
+        fork is not available on the host """
+    if sys.version_info >= (3, 4):
+        if not "fork" in multiprocessing.get_all_start_methods():
+            return None
+        return multiprocessing.get_context("fork")
+    return multiprocessing if os.name == "posix" else None
+
+
+def prepare_scratch_workers():
+    """ must be called before forking processes which change their
+        working directory (see enter_scratch_dir): import paths and
+        ML_SRC_DIR (used by metalibm to locate its support library)
+        are made absolute so they survive the chdir """
+    sys.path[:] = [os.path.abspath(path) for path in sys.path]
+    if "ML_SRC_DIR" in os.environ:
+        os.environ["ML_SRC_DIR"] = os.path.abspath(os.environ["ML_SRC_DIR"])
+
+
+def enter_scratch_dir(scratch_dir):
+    """ make @p scratch_dir (created if needed) the working directory of the
+        current process, so generated sources, built binaries and gappa
+        scripts of concurrent processes never collide """
+    if not os.path.isdir(scratch_dir):
+        os.makedirs(scratch_dir)
+    os.chdir(scratch_dir)
+    os.environ["ML_GAPPA_TMP_DIR"] = scratch_dir
+
+
+def _run_task(worker, task, result_connection, initializer):
+    """ forked process entry point: execute worker(task) and send
+        (True, result) or (False, error message) through
+        @p result_connection """
+    try:
+        if not initializer is None:
+            initializer()
+        message = (True, worker(task))
+    except BaseException as e:
+        # SystemExit (e.g. Log.Error with --exit-on-error) is also reported
+        message = (False, "{}: {}".format(e.__class__.__name__, e))
+    result_connection.send(message)
+    result_connection.close()
+
+
+def run_processes(worker, task_list, job_num, failure_result, timeout=None,
+                  initializer=None, callback=None):
+    """ execute @p worker on every task of @p task_list, each task in its
+        own forked process, with at most @p job_num concurrent processes.
+        A task whose process raises, dies (e.g. segmentation fault) or
+        exceeds @p timeout seconds returns failure_result(task, reason)
+
+        Args:
+            initializer: function called in each process before worker
+            callback: function called in the calling process with
+                (task index, result) as soon as a task completes
+        Return:
+            list of results (in the order of task_list) """
+    mp_context = get_fork_context()
+    if mp_context is None:
+        raise NotImplementedError("run_processes requires fork")
+    result_list = [None] * len(task_list)
+    pending_list = list(enumerate(task_list))
+    # task index -> (process, result connection, start time)
+    running_map = {}
+    while pending_list or running_map:
+        while pending_list and len(running_map) < max(job_num, 1):
+            task_index, task = pending_list.pop(0)
+            recv_connection, send_connection = mp_context.Pipe(duplex=False)
+            process = mp_context.Process(
+                target=_run_task, args=(worker, task, send_connection, initializer))
+            process.start()
+            send_connection.close()
+            running_map[task_index] = (process, recv_connection, time.time())
+        for task_index in list(running_map.keys()):
+            process, recv_connection, start_time = running_map[task_index]
+            task = task_list[task_index]
+            if recv_connection.poll():
+                try:
+                    success, value = recv_connection.recv()
+                except EOFError:
+                    # process died without sending its result
+                    process.join()
+                    success, value = False, "process exited with code {}".format(process.exitcode)
+                process.join()
+            elif not process.is_alive():
+                process.join()
+                if recv_connection.poll():
+                    # result sent just before exiting
+                    continue
+                success, value = False, "process exited with code {}".format(process.exitcode)
+            elif not timeout is None and time.time() - start_time > timeout:
+                process.terminate()
+                process.join()
+                success, value = False, "timeout ({} s)".format(timeout)
+            else:
+                continue
+            recv_connection.close()
+            del running_map[task_index]
+            result_list[task_index] = value if success else failure_result(task, value)
+            if callback:
+                callback(task_index, result_list[task_index])
+        if running_map:
+            time.sleep(0.05)
+    return result_list
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 17th, 2026
+# last-modified:    Oct 17th, 2026
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Reference output computation for functional tests
+
+    Expected outputs (accuracy.get_output_check_value) are computed by
+    chunks of test cases, each computed in its own worker process
+    and stored in a persistent on-disk cache, so that re-generating the
+    same test set does not call numeric_emulate again. """
+
+import hashlib
+import inspect
+import multiprocessing
+import os
+import re
+
+import sollya
+
+from metalibm_core.core.ml_formats import ML_FP_Format
+from metalibm_core.utility.disk_cache import (
+    DiskCache, serialize_sollya_object, deserialize_sollya_object,
+    get_metalibm_source_digest,
+)
+from metalibm_core.utility.log_report import Log
+from metalibm_core.utility.process_utils import run_processes, get_fork_context
+
+## on-disk cache of reference outputs, one entry per chunk of test cases
+#  (version must be bumped when the layout of the reference key changes)
+reference_cache = DiskCache("test_reference", version=1)
+
+## number of test cases per chunk (cache entry / worker task)
+REFERENCE_CHUNK_SIZE = 2048
+
+## regular expression matching the metafunction attributes
+#  used in numeric_emulate's source
+SELF_ATTRIBUTE_REGEX = re.compile(r"\bself\.(\w+)")
+
+## state shared with forked worker processes: (metafunction, test case list)
+_WORKER_CONTEXT = None
+
+
+def get_default_reference_job_num():
+    """ default number of worker processes, can be overloaded
+        by the ML_TEST_JOBS environment variable """
+    return int(os.environ.get("ML_TEST_JOBS", multiprocessing.cpu_count()))
+
+
+def get_source_digest(fct):
+    """ return the digest of @p fct's source code, or None if the
+        source is not available """
+    try:
+        source = inspect.getsource(fct)
+    except (IOError, OSError, TypeError):
+        return None
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def get_reference_key(metafunction):
+    """ return a tuple identifying the reference computation of
+        @p metafunction: class, digest of numeric_emulate's source, of its
+        module's source (module-level helpers) and of metalibm's sources
+        (accuracy and rounding code), value of the attributes
+        numeric_emulate reads, output precision, accuracy.
+        None is returned if the key can not be determined
+        (reference values are not cached in that case) """
+    emulate_method = metafunction.numeric_emulate
+    emulate_digest = get_source_digest(emulate_method)
+    module_digest = get_source_digest(inspect.getmodule(metafunction.__class__))
+    if emulate_digest is None or module_digest is None:
+        return None
+    # values of metafunction parameters used by numeric_emulate
+    # (e.g. basis of a logarithm)
+    attribute_list = []
+    for attr_name in sorted(set(SELF_ATTRIBUTE_REGEX.findall(inspect.getsource(emulate_method)))):
+        attr_value = getattr(metafunction, attr_name, None)
+        if inspect.ismethod(attr_value) or inspect.isfunction(attr_value):
+            attr_digest = get_source_digest(attr_value)
+            if attr_digest is None:
+                return None
+            attribute_list.append((attr_name, attr_digest))
+        elif isinstance(attr_value, sollya.SollyaObject):
+            attribute_list.append((attr_name, serialize_sollya_object(attr_value)))
+        else:
+            attribute_list.append((attr_name, str(attr_value)))
+    metafunction_class = metafunction.__class__
+    accuracy = metafunction.accuracy
+    return (
+        "{}.{}".format(metafunction_class.__module__, metafunction_class.__name__),
+        emulate_digest,
+        module_digest,
+        get_metalibm_source_digest(),
+        tuple(attribute_list),
+        str(metafunction.precision),
+        accuracy.__class__.__name__,
+        # error goal of degraded accuracies
+        str(getattr(accuracy, "goal", None)),
+    )
+
+
+def encode_input_value(precision, value):
+    """ exact and hashable encoding of test input @p value """
+    if isinstance(precision, ML_FP_Format):
+        try:
+            # integer encoding distinguishes signed zeros and NaNs
+            return precision.get_integer_coding(value)
+        except Exception:
+            pass
+    return serialize_sollya_object(value)
+
+
+def compute_reference_chunk(metafunction, test_case_list):
+    """ compute output check values for every test case in @p test_case_list
+        @return list of tuples of serialized values """
+    accuracy = metafunction.accuracy
+    return [
+        tuple(serialize_sollya_object(value) for value in accuracy.get_output_check_value(metafunction, input_tuple))
+        for input_tuple in test_case_list
+    ]
+
+
+def _worker_compute_chunk(chunk_bounds):
+    """ worker process entry point: compute the chunk
+        [start; stop) of the shared test case list """
+    metafunction, test_case_list = _WORKER_CONTEXT
+    start, stop = chunk_bounds
+    return compute_reference_chunk(metafunction, test_case_list[start:stop])
+
+
+def compute_reference_values(metafunction, test_case_list, job_num=None):
+    """ compute the output check values of every input tuple of
+        @p test_case_list for @p metafunction
+
+        @param job_num number of worker processes
+               (default get_default_reference_job_num())
+        @return list of output value tuples (same order as test_case_list) """
+    global _WORKER_CONTEXT
+    job_num = get_default_reference_job_num() if job_num is None else job_num
+    reference_key = get_reference_key(metafunction)
+    input_precisions = metafunction.get_input_precisions()
+
+    chunk_list = [
+        (start, min(start + REFERENCE_CHUNK_SIZE, len(test_case_list)))
+        for start in range(0, len(test_case_list), REFERENCE_CHUNK_SIZE)
+    ]
+    # chunk index -> list of serialized output tuples
+    chunk_results = {}
+    chunk_keys = {}
+    if not reference_key is None and reference_cache.is_enabled():
+        for chunk_index, (start, stop) in enumerate(chunk_list):
+            chunk_key = (reference_key, tuple(
+                tuple(encode_input_value(precision, value) for precision, value in zip(input_precisions, input_tuple))
+                for input_tuple in test_case_list[start:stop]
+            ))
+            chunk_keys[chunk_index] = chunk_key
+            cached_result = reference_cache.get(chunk_key)
+            if not cached_result is None:
+                chunk_results[chunk_index] = cached_result
+    missing_chunks = [index for index in range(len(chunk_list)) if not index in chunk_results]
+    Log.report(
+        Log.Info, "reference values: {} test(s), {} chunk(s) out of {} to compute",
+        len(test_case_list), len(missing_chunks), len(chunk_list))
+
+    if len(missing_chunks) > 1 and job_num > 1 and not get_fork_context() is None:
+        # worker processes are forked so that the metafunction and the
+        # sollya values do not need to be pickled, each chunk is computed
+        # in its own process (a dead worker is detected)
+        _WORKER_CONTEXT = (metafunction, test_case_list)
+        try:
+            computed_list = run_processes(
+                _worker_compute_chunk, [chunk_list[index] for index in missing_chunks],
+                min(job_num, len(missing_chunks)),
+                lambda chunk_bounds, reason: reason)
+        finally:
+            _WORKER_CONTEXT = None
+        for chunk_index, chunk_result in zip(missing_chunks, computed_list):
+            if not isinstance(chunk_result, list):
+                Log.report(
+                    Log.Error, "reference value computation failed for test cases [{}; {}): {}",
+                    chunk_list[chunk_index][0], chunk_list[chunk_index][1], chunk_result)
+    else:
+        computed_list = [
+            compute_reference_chunk(metafunction, test_case_list[slice(*chunk_list[index])])
+            for index in missing_chunks
+        ]
+    for chunk_index, chunk_result in zip(missing_chunks, computed_list):
+        chunk_results[chunk_index] = chunk_result
+        if chunk_index in chunk_keys:
+            reference_cache.put(chunk_keys[chunk_index], chunk_result)
+
+    return [
+        tuple(deserialize_sollya_object(value) for value in output_tuple)
+        for chunk_index in range(len(chunk_list))
+        for output_tuple in chunk_results[chunk_index]
+    ]
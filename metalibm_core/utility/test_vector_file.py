@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 17th, 2026
+# last-modified:    Oct 17th, 2026
+#
+# Author(s): metalibm developers
+###############################################################################
+
+""" Binary test vector files
+
+    Test inputs and expected outputs can be stored in a binary file which
+    is memory-mapped by the generated test wrapper (see
+    support_lib/ml_test_vectors.h) rather than embedded as C tables.
+
+    File layout (little-endian):
+        header:
+            char     magic[4]      "MLTV"
+            uint32   version
+            uint32   byte_order    0x01020304 (checked by the reader)
+            uint32   column_num
+            uint64   test_num
+        column_num column descriptors:
+            uint32   kind          0: integer, 1: floating-point
+            uint32   bit_size      size of one element
+            uint64   offset        byte offset of the column data
+            uint64   length        number of elements in the column
+        column data (each column aligned on COLUMN_ALIGNMENT bytes)
+
+    Input columns come first (one per function argument), followed by a
+    single output column storing the expected values of each test
+    contiguously (num_output_value values per test).
+"""
+
+import struct
+
+from metalibm_core.core.ml_formats import ML_FP_Format, ML_Binary32, ML_Binary64
+from metalibm_core.core.special_values import FP_SpecialValue
+from metalibm_core.utility.log_report import Log
+
+TEST_VECTOR_MAGIC = b"MLTV"
+TEST_VECTOR_VERSION = 1
+TEST_VECTOR_BYTE_ORDER = 0x01020304
+
+HEADER_STRUCT = struct.Struct("<4sIIIQ")
+COLUMN_STRUCT = struct.Struct("<IIQQ")
+COLUMN_ALIGNMENT = 64
+
+INTEGER_KIND = 0
+FP_KIND = 1
+
+# struct codes of integer and floating-point values, indexed by byte size
+INTEGER_CODE = {1: "B", 2: "H", 4: "I", 8: "Q"}
+FP_CODE = {ML_Binary32: "f", ML_Binary64: "d"}
+
+
+def get_column_kind(precision):
+    return FP_KIND if isinstance(precision, ML_FP_Format) else INTEGER_KIND
+
+
+def encode_column(precision, value_list):
+    """ return the binary encoding (bytes) of value_list elements in
+        @p precision format """
+    byte_size = precision.get_bit_size() // 8
+    if not byte_size in INTEGER_CODE:
+        Log.report(Log.Error, "unsupported format {} for test vector file", precision)
+    int_struct = struct.Struct("<" + INTEGER_CODE[byte_size])
+    mask = 2**precision.get_bit_size() - 1
+    if precision in FP_CODE:
+        fp_struct = struct.Struct("<" + FP_CODE[precision])
+        def encode_value(value):
+            if FP_SpecialValue.is_special_value(value):
+                return int_struct.pack(precision.get_integer_coding(value) & mask)
+            # values have been rounded to precision, so they are exactly
+            # representable as python floats
+            return fp_struct.pack(float(value))
+    else:
+        def encode_value(value):
+            return int_struct.pack(precision.get_integer_coding(value) & mask)
+    return b"".join(encode_value(value) for value in value_list)
+
+
+def write_test_vector_file(filename, input_precisions, output_precision, input_columns, output_values):
+    """ dump test vectors into binary file @p filename
+        Args:
+            input_precisions: list of input formats (one per column)
+            output_precision: format of expected output values
+            input_columns: list of input value lists (one per argument)
+            output_values: list of expected output tuples (one per test) """
+    test_num = len(output_values)
+    output_column = [value for value_tuple in output_values for value in value_tuple]
+    column_list = [
+        (precision, encode_column(precision, column), len(column))
+        for precision, column in zip(input_precisions, input_columns)
+    ] + [(output_precision, encode_column(output_precision, output_column), len(output_column))]
+
+    def align(offset):
+        return (offset + COLUMN_ALIGNMENT - 1) // COLUMN_ALIGNMENT * COLUMN_ALIGNMENT
+
+    offset = align(HEADER_STRUCT.size + COLUMN_STRUCT.size * len(column_list))
+    descriptor_list = []
+    for precision, data, length in column_list:
+        descriptor_list.append(COLUMN_STRUCT.pack(
+            get_column_kind(precision), precision.get_bit_size(), offset, length
+        ))
+        offset = align(offset + len(data))
+
+    with open(filename, "wb") as output_stream:
+        output_stream.write(HEADER_STRUCT.pack(
+            TEST_VECTOR_MAGIC, TEST_VECTOR_VERSION, TEST_VECTOR_BYTE_ORDER,
+            len(column_list), test_num
+        ))
+        for descriptor in descriptor_list:
+            output_stream.write(descriptor)
+        for _, data, _ in column_list:
+            output_stream.seek(align(output_stream.tell()))
+            output_stream.write(data)
+    Log.report(Log.Info, "{} test vectors written to {}", test_num, filename)
+
+
+def read_test_vector_header(filename):
+    """ return (test_num, [(kind, bit_size, offset, length) for each column])
+        from the header of test vector file @p filename """
+    with open(filename, "rb") as input_stream:
+        magic, version, byte_order, column_num, test_num = HEADER_STRUCT.unpack(
+            input_stream.read(HEADER_STRUCT.size))
+        if magic != TEST_VECTOR_MAGIC or version != TEST_VECTOR_VERSION or byte_order != TEST_VECTOR_BYTE_ORDER:
+            Log.report(Log.Error, "{} is not a valid test vector file", filename)
+        column_list = [
+            COLUMN_STRUCT.unpack(input_stream.read(COLUMN_STRUCT.size))
+            for _ in range(column_num)
+        ]
+    return test_num, column_list
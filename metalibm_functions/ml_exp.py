@@ -31,7 +31,7 @@ import sollya
 
 from sollya import (
     Interval, round, inf, sup, log, expm1, log2,
-    guessdegree, dirtyinfnorm, floor,
+    dirtyinfnorm, floor,
     SollyaObject
 )
 
@@ -56,7 +56,7 @@ from metalibm_core.core.ml_function import (
     ML_FunctionBasis, DefaultArgTemplate
 )
 from metalibm_core.core.polynomials import (
-    PolynomialSchemeEvaluator, Polynomial
+    PolynomialSchemeEvaluator, Polynomial, cached_guessdegree
 )
 from metalibm_core.code_generation.generator_utility import (
     FunctionOperator, FO_Arg
@@ -73,7 +73,7 @@ from metalibm_core.utility.debug_utils import (
     debug_multi
 )
 from metalibm_core.utility.num_utils   import ulp
-from metalibm_core.utility.gappa_utils import is_gappa_installed
+from metalibm_core.utility.gappa_utils import is_gappa_installed, wait_all
 
 
 class ML_Exponential(ML_FunctionBasis):
@@ -259,7 +259,7 @@ class ML_Exponential(ML_FunctionBasis):
         error_goal_approx = S2**-1 * error_goal
 
         Log.report(Log.Info, "\033[33;1m building mathematical polynomial \033[0m\n")
-        poly_degree = max(sup(guessdegree(expm1(sollya.x)/sollya.x, approx_interval, error_goal_approx)) - 1, 2)
+        poly_degree = max(sup(cached_guessdegree(expm1(sollya.x)/sollya.x, approx_interval, error_goal_approx)) - 1, 2)
         init_poly_degree = poly_degree
 
         error_function = lambda p, f, ai, mod, t: dirtyinfnorm(f - p, ai)
@@ -270,7 +270,7 @@ class ML_Exponential(ML_FunctionBasis):
         while 1:
             Log.report(Log.Info, "attempting poly degree: %d" % poly_degree)
             precision_list = [1] + [self.precision] * (poly_degree)
-            poly_object, poly_approx_error = Polynomial.build_from_approximation_with_error(expm1(sollya.x), poly_degree, precision_list, approx_interval, sollya.absolute, error_function = error_function)
+            poly_object, poly_approx_error = Polynomial.build_from_approximation_with_error(expm1(sollya.x), poly_degree, precision_list, approx_interval, sollya.absolute, error_function = error_function, error_function_id = "dirtyinfnorm")
             Log.report(Log.Info, "polynomial: %s " % poly_object)
             sub_poly = poly_object.sub_poly(start_index = 2)
             Log.report(Log.Info, "polynomial: %s " % sub_poly)
@@ -318,8 +318,8 @@ class ML_Exponential(ML_FunctionBasis):
 
 
             if is_gappa_installed():
-                sub_poly_eval_error = -1.0
-                sub_poly_eval_error = self.gappa_engine.get_eval_error_v2(self.opt_engine, opt_sub_poly, sub_poly_error_copy_map, gappa_filename = "%s_gappa_sub_poly.g" % self.function_name)
+                # every evaluation error is proved concurrently
+                sub_poly_eval_error_future = self.gappa_engine.get_eval_error_v2_async(self.opt_engine, opt_sub_poly, sub_poly_error_copy_map, gappa_filename = "%s_gappa_sub_poly.g" % self.function_name)
 
                 dichotomy_map = [
                     {
@@ -332,7 +332,11 @@ class ML_Exponential(ML_FunctionBasis):
                         exact_hi_part.get_handle().get_node(): approx_interval_split[2],
                     },
                 ]
-                poly_eval_error_dico = self.gappa_engine.get_eval_error_v3(self.opt_engine, opt_poly, poly_error_copy_map, gappa_filename = "gappa_poly.g", dichotomy = dichotomy_map)
+                poly_eval_error_futures = self.gappa_engine.get_eval_error_v3_async(self.opt_engine, opt_poly, poly_error_copy_map, gappa_filename = "gappa_poly.g", dichotomy = dichotomy_map)
+
+                eval_error_list = wait_all([sub_poly_eval_error_future] + poly_eval_error_futures)
+                sub_poly_eval_error = eval_error_list[0]
+                poly_eval_error_dico = eval_error_list[1:]
 
                 poly_eval_error = max([sup(abs(err)) for err in poly_eval_error_dico])
             else:
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# Description: check global value numbering: redundant expressions are
+#              merged, side-effect and region-dependent nodes are kept
+from metalibm_core.core.ml_operations import (
+    Variable, Constant, Addition, Multiplication, Statement, Return,
+    ConditionBlock, ReferenceAssign, Comparison
+)
+from metalibm_core.core.ml_formats import ML_Binary32, ML_Bool
+from metalibm_core.core.graph_traversal import iterate_post_order
+
+from metalibm_core.opt.p_gvn import global_value_numbering
+
+from metalibm_functions.unit_tests.utils import TestRunner, check
+
+
+def count_nodes(root):
+    return len(list(iterate_post_order([root])))
+
+
+class ML_UT_GVN(TestRunner):
+    @staticmethod
+    def __call__(args):
+        vx = Variable("x", precision=ML_Binary32, var_type=Variable.Input)
+        vy = Variable("y", precision=ML_Binary32, var_type=Variable.Input)
+
+        def cst(value):
+            return Constant(value, precision=ML_Binary32)
+
+        # duplicated sub-graphs (including commuted inputs and
+        # separately built constants)
+        a0 = Multiplication(Addition(vx, cst(1.0), precision=ML_Binary32), vy, precision=ML_Binary32)
+        a1 = Multiplication(vy, Addition(cst(1.0), vx, precision=ML_Binary32), precision=ML_Binary32)
+        # -0.0 must not be merged with 0.0
+        b0 = Addition(vx, cst(0.0), precision=ML_Binary32)
+        b1 = Addition(vx, cst(-0.0), precision=ML_Binary32)
+        # protected node
+        c0 = Addition(vx, vy, precision=ML_Binary32)
+        c1 = Addition(vx, vy, precision=ML_Binary32, prevent_optimization=True)
+        result = Addition(Addition(a0, a1, precision=ML_Binary32), Addition(Addition(b0, b1, precision=ML_Binary32), Addition(c0, c1, precision=ML_Binary32), precision=ML_Binary32), precision=ML_Binary32)
+        scheme = Statement(Return(result))
+
+        node_count = count_nodes(scheme)
+        eliminated = global_value_numbering(scheme)
+        # a1's Multiplication, Addition and Constant(1.0) are merged
+        check(eliminated == 3, "eliminated count ({})".format(eliminated))
+        check(count_nodes(scheme) == node_count - 3, "node count after gvn")
+        check(result.get_input(0).get_input(0) is result.get_input(0).get_input(1), "commuted sub-graph merge")
+        check(not b0.get_input(1) is b1.get_input(1), "signed zero merge")
+        check(not c0 is c1, "prevent_optimization merge")
+
+        # a variable assigned in the graph must not be numbered
+        vz = Variable("z", precision=ML_Binary32, var_type=Variable.Local)
+        z0 = Addition(vz, vx, precision=ML_Binary32)
+        z1 = Addition(vz, vx, precision=ML_Binary32)
+        assign_scheme = Statement(
+            ReferenceAssign(vz, vx), ReferenceAssign(vy, z0),
+            ReferenceAssign(vz, vy), Return(z1)
+        )
+        check(global_value_numbering(assign_scheme) == 0, "mutable variable merge")
+
+        # a node of a branch must not be used as the representative of
+        # a node outside this branch
+        d0 = Multiplication(vx, vx, precision=ML_Binary32)
+        d1 = Multiplication(vx, vx, precision=ML_Binary32)
+        cond = Comparison(vx, cst(0.0), specifier=Comparison.Greater, precision=ML_Bool)
+        branch_scheme = Statement(ConditionBlock(cond, Return(d0)), Return(d1))
+        check(global_value_numbering(branch_scheme) == 0, "branch node merge")
+        return True
+
+
+run_test = ML_UT_GVN
+
+
+if __name__ == "__main__":
+    if ML_UT_GVN.__call__(ML_UT_GVN.get_default_args()):
+        exit(0)
+    else:
+        exit(1)
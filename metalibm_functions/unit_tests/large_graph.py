@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# Description: check that graph walkers do not depend on python's
+#              recursion limit by processing a very deep operation graph
+###############################################################################
+from metalibm_core.core.ml_operations import (
+    Variable, Addition, Subtraction, Statement, Return
+)
+from metalibm_core.core.ml_formats import ML_Binary32
+from metalibm_core.core.graph_traversal import (
+    iterate_post_order, iterate_pre_order, topological_sort
+)
+
+from metalibm_core.opt.node_transformation import Pass_NodeTransformation
+from metalibm_core.opt.p_function_typing import instantiate_abstract_precision
+from metalibm_core.opt.p_function_std import subexpression_sharing
+from metalibm_core.opt.p_auto_pipeline import Pass_CriticalPathEval
+
+from metalibm_functions.unit_tests.utils import TestRunner, check
+
+# number of operation nodes in the test graph
+GRAPH_DEPTH = 100000
+
+
+class AdditionToSubtraction(Pass_NodeTransformation):
+    """ Transform every Addition into a Subtraction """
+    def can_be_transformed(self, node, *args):
+        return isinstance(node, Addition)
+
+    def transform_node(self, node, transformed_inputs, *args):
+        new_inputs = [
+            op if transformed is None else transformed
+            for op, transformed in zip(node.get_inputs(), transformed_inputs)
+        ]
+        return Subtraction(*new_inputs, precision=node.get_precision())
+
+    def reconstruct_from_transformed(self, node, transformed_node):
+        return transformed_node
+
+
+def build_chain(depth, precision=None):
+    """ build a chain of <depth> Addition nodes, each one
+        using the previous one """
+    vx = Variable("x", precision=ML_Binary32, var_type=Variable.Input)
+    node = vx
+    for _ in range(depth):
+        node = Addition(node, vx, precision=precision)
+    return vx, node
+
+
+def chain_length(node, op_class):
+    """ count the number of consecutive <op_class> nodes from node """
+    length = 0
+    while isinstance(node, op_class):
+        length += 1
+        node = node.get_input(0)
+    return length
+
+
+class ML_UT_LargeGraph(TestRunner):
+    @staticmethod
+    def __call__(args):
+        vx, result = build_chain(GRAPH_DEPTH, precision=ML_Binary32)
+        scheme = Statement(Return(result))
+
+        # generic traversals
+        post_order = list(iterate_post_order([result]))
+        check(len(post_order) == GRAPH_DEPTH + 1, "post-order node count")
+        check(post_order[0] is vx and post_order[-1] is result, "post-order node order")
+        pre_order = list(iterate_pre_order([result]))
+        check(pre_order[0] is result and pre_order[-1] is vx, "pre-order node order")
+        check(topological_sort([result], users_first=True) == post_order[::-1], "topological order")
+
+        # abstract typing (on an untyped chain)
+        _, untyped_result = build_chain(GRAPH_DEPTH)
+        instantiate_abstract_precision(Statement(Return(untyped_result)))
+        check(
+            all(not node.get_precision() is None for node in iterate_post_order([untyped_result])),
+            "abstract precision instantiation"
+        )
+
+        # sub-expression sharing
+        subexpression_sharing(scheme)
+
+        # copy
+        result_copy = result.copy({})
+        check(not result_copy is result, "copy")
+        check(chain_length(result_copy, Addition) == GRAPH_DEPTH, "copy chain length")
+
+        # critical path evaluation
+        cp_eval = Pass_CriticalPathEval(None)
+        critical_path = cp_eval.evaluate_critical_path(result)
+        check(critical_path.value > 0, "critical path evaluation")
+
+        # node transformation
+        transformed = AdditionToSubtraction().transform_graph(result)
+        check(chain_length(transformed, Subtraction) == GRAPH_DEPTH, "node transformation")
+        return True
+
+
+run_test = ML_UT_LargeGraph
+
+
+if __name__ == "__main__":
+    if ML_UT_LargeGraph.__call__(ML_UT_LargeGraph.get_default_args()):
+        exit(0)
+    else:
+        exit(1)
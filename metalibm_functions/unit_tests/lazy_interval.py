@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# Description: check lazy evaluation and memoization of node intervals,
+#              and their invalidation when the graph is modified
+from sollya import Interval
+
+from metalibm_core.core.ml_operations import (
+    Variable, Addition, Multiplication, AbstractOperation
+)
+from metalibm_core.core.ml_formats import ML_Binary32
+
+from metalibm_functions.unit_tests.utils import TestRunner, check
+
+
+class ML_UT_LazyInterval(TestRunner):
+    @staticmethod
+    def __call__(args):
+        vx = Variable("x", precision=ML_Binary32, interval=Interval(1, 2))
+        vy = Variable("y", precision=ML_Binary32, interval=Interval(-1, 1))
+
+        add = Addition(vx, vx, precision=ML_Binary32)
+        check(add.evaluated_interval is None, "interval evaluated at construction")
+        mul = Multiplication(add, vx, precision=ML_Binary32)
+        check(mul.get_interval() == Interval(2, 8), "interval evaluation")
+        check(not add.evaluated_interval is None, "input interval memoization")
+        square = Multiplication(vy, vy, precision=ML_Binary32)
+        check(square.get_interval() == Interval(-1, 1), "independent interval evaluation")
+
+        # graph modification invalidates memoized intervals of the
+        # modified node and of its users only
+        add.set_input(1, vy)
+        check(add.evaluated_interval is None and mul.evaluated_interval is None, "user interval invalidation")
+        check(not square.evaluated_interval is None, "independent interval kept")
+        check(mul.get_interval() == Interval(0, 6), "interval invalidation by set_input")
+        add.change_to(Multiplication(vx, vy, precision=ML_Binary32))
+        check(mul.get_interval() == Interval(-4, 4), "interval invalidation by change_to")
+        # explicit interval set through node attributes
+        add.set_attributes(interval=Interval(0, 1))
+        check(mul.evaluated_interval is None, "interval invalidation by set_attributes")
+        check(mul.get_interval() == Interval(0, 2), "interval value after set_attributes")
+
+        # explicit intervals take precedence
+        explicit = Addition(vx, vy, precision=ML_Binary32, interval=Interval(0, 1))
+        check(explicit.get_interval() == Interval(0, 1), "explicit interval")
+
+        # eager evaluation
+        AbstractOperation.lazy_interval = False
+        eager = Addition(vx, vy, precision=ML_Binary32)
+        AbstractOperation.lazy_interval = True
+        check(not eager.evaluated_interval is None, "eager interval evaluation")
+        check(eager.get_interval() == Interval(0, 3), "eager interval value")
+        return True
+
+
+run_test = ML_UT_LazyInterval
+
+
+if __name__ == "__main__":
+    if ML_UT_LazyInterval.__call__(ML_UT_LazyInterval.get_default_args()):
+        exit(0)
+    else:
+        exit(1)
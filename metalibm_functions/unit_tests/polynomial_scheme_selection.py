@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# Description: check polynomial evaluation scheme selection with a latency
+#              model (Horner vs Estrin vs hybrid schemes)
+###############################################################################
+
+from metalibm_core.core.ml_operations import Variable
+from metalibm_core.core.ml_formats import ML_Binary32
+from metalibm_core.core.polynomials import Polynomial, PolynomialSchemeSelector
+from metalibm_core.core.latency_model import LatencyModel
+
+from metalibm_functions.unit_tests.utils import TestRunner, check
+
+
+class ML_UT_PolynomialSchemeSelection(TestRunner):
+    @staticmethod
+    def __call__(args):
+        vx = Variable("x", precision=ML_Binary32, var_type=Variable.Input)
+        poly_object = Polynomial(dict((index, 1.0 / (index + 1)) for index in range(7)))
+        fma_model = LatencyModel(add_latency=4, mul_latency=4, fma_latency=4, issue_width=2)
+
+        # latency-bound evaluation: Estrin's scheme has the shortest critical path
+        selector = PolynomialSchemeSelector(fma_model, fuse_fma=True)
+        candidate_list = selector.get_candidate_list(poly_object, vx, ML_Binary32)
+        name_list = [candidate.name for candidate in candidate_list]
+        check(name_list[0] == "estrin", "latency-bound selection ({})".format(name_list))
+        check(set(name_list) == set(["horner", "estrin_depth1", "estrin"]), "candidate list ({})".format(name_list))
+        horner = [candidate for candidate in candidate_list if candidate.name == "horner"][0]
+        # 6 fused multiply-adds in sequence
+        check(horner.latency == 24 and horner.op_num == 6, "horner cost ({})".format(horner))
+
+        # throughput-bound evaluation: Horner's scheme has the fewest operations
+        selector = PolynomialSchemeSelector(fma_model, fuse_fma=True, independent_evaluation_num=8)
+        candidate_list = selector.get_candidate_list(poly_object, vx, ML_Binary32)
+        check(candidate_list[0].name == "horner", "throughput-bound selection ({})".format(candidate_list[0]))
+
+        # rejected candidates are skipped, Horner is the fallback
+        selector = PolynomialSchemeSelector(fma_model, fuse_fma=True)
+        candidate_list = selector.get_candidate_list(poly_object, vx, ML_Binary32)
+        check(selector.select(candidate_list, accept=lambda c: c.name != "estrin").name == "estrin_depth1", "rejection")
+        check(selector.select(candidate_list, accept=lambda c: False).name == "horner", "fallback")
+        return True
+
+
+run_test = ML_UT_PolynomialSchemeSelection
+
+
+if __name__ == "__main__":
+    if ML_UT_PolynomialSchemeSelection.__call__(ML_UT_PolynomialSchemeSelection.get_default_args()):
+        exit(0)
+    else:
+        exit(1)
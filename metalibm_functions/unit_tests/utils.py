@@ -31,6 +31,8 @@
 from metalibm_core.core.ml_function import DefaultArgTemplate
 from metalibm_core.core.ml_formats import ML_Binary32
 
+from metalibm_core.utility.log_report import Log
+
 ## Runner wrapper for unit tests
 class TestRunner:
   def __init__(self):
@@ -50,3 +52,10 @@ class TestRunner:
   ## overloading 
   def __call__(self):
     raise NotImplementedError
+
+
+## report a unit test failure described by @p msg if @p predicate
+#  does not hold
+def check(predicate, msg):
+  if not predicate:
+    Log.report(Log.Error, "unit test check failed: {}", msg)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+""" Benchmark of C source code emission
+
+    Emit a large test table (and the unrolled test statements which
+    reference it) through the C code generator and a NestedCode object,
+    and report the time spent inserting code and assembling the final
+    source with get().
+
+    Usage: python3 valid/codegen_bench.py [--entry-num N]
+"""
+
+import argparse
+import sys
+import timeit
+
+from metalibm_core.core.ml_formats import ML_Int32
+from metalibm_core.core.ml_table import ML_NewTable
+from metalibm_core.code_generation.code_object import NestedCode
+from metalibm_core.code_generation.c_code_generator import CCodeGenerator
+from metalibm_core.code_generation.generic_processor import GenericProcessor
+
+
+def build_test_table(entry_num):
+    """ build a one-dimension test table with <entry_num> entries,
+        integer values are used so that constant formatting (which
+        requires sollya for floating-point formats) does not dominate
+        the measure """
+    table = ML_NewTable(
+        dimensions=[entry_num], storage_precision=ML_Int32,
+        tag="input_table"
+    )
+    for index in range(entry_num):
+        table[index] = index
+    return table
+
+
+def emit_code(table, entry_num, statement_num):
+    """ emit <table> declaration and <statement_num> test statements
+        in a nested block, return the code object """
+    code_generator = CCodeGenerator(
+        GenericProcessor(), declare_cst=False, disable_debug=True,
+        libm_compliant=False
+    )
+    code_object = NestedCode(code_generator, static_cst=True)
+    table_name = code_object.declare_table(table, prefix="input_table")
+    code_object << "int main(void) "
+    code_object.open_level()
+    code_object << "int errors = 0;\n"
+    for index in range(statement_num):
+        code_object << "errors += (%s[%d] != %d);\n" % (table_name, index % entry_num, index % entry_num)
+    code_object << "return errors;\n"
+    code_object.close_level()
+    return code_object, code_generator
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="C code emission benchmark")
+    parser.add_argument("--entry-num", type=int, default=1000000,
+                        help="number of entries in the test table")
+    parser.add_argument("--statement-num", type=int, default=None,
+                        help="number of unrolled test statements (default: --entry-num)")
+    args = parser.parse_args(sys.argv[1:])
+    statement_num = args.entry_num if args.statement_num is None else args.statement_num
+
+    start = timeit.default_timer()
+    table = build_test_table(args.entry_num)
+    build_time = timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    code_object, code_generator = emit_code(table, args.entry_num, statement_num)
+    emit_time = timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    source = code_object.get(code_generator)
+    get_time = timeit.default_timer() - start
+
+    print("{:24} {:>10}".format("table entries", args.entry_num))
+    print("{:24} {:>10}".format("test statements", statement_num))
+    print("{:24} {:>10}".format("source size (bytes)", len(source)))
+    print("{:24} {:>10.3f}".format("table build (s)", build_time))
+    print("{:24} {:>10.3f}".format("code emission (s)", emit_time))
+    print("{:24} {:>10.3f}".format("get (s)", get_time))
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+""" Benchmark of meta-function generation time with eager (at node
+    construction) and lazy (on demand, memoized) interval evaluation
+
+    Usage: python3 valid/interval_bench.py [--repeat N] [--bench ml_exp,...]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+import metalibm_functions.ml_exp
+import metalibm_functions.ml_log
+import metalibm_hw_blocks.mult_array
+
+from metalibm_core.core.ml_formats import ML_Binary32, ML_Binary64
+from metalibm_core.core.ml_operations import AbstractOperation
+from metalibm_core.utility.log_report import Log
+
+
+class GenerationBench(object):
+    """ generation of one meta-function """
+    def __init__(self, title, ctor, arg_map, ctor_kw=None):
+        self.title = title
+        self.ctor = ctor
+        self.arg_map = arg_map
+        self.ctor_kw = ctor_kw or {}
+
+    def generate(self):
+        """ build the meta-function scheme and generate its code """
+        fct = self.ctor(self.ctor.get_default_args(**self.arg_map), **self.ctor_kw)
+        fct.gen_implementation()
+
+    def measure(self, lazy_interval):
+        """ return the generation time (seconds) with the selected
+            interval evaluation mode """
+        AbstractOperation.lazy_interval = lazy_interval
+        start = timeit.default_timer()
+        self.generate()
+        return timeit.default_timer() - start
+
+
+BENCH_LIST = [
+    GenerationBench("ml_exp", metalibm_functions.ml_exp.ML_Exponential, {"precision": ML_Binary64}),
+    GenerationBench("ml_log", metalibm_functions.ml_log.ML_Log, {"precision": ML_Binary64}),
+    GenerationBench(
+        "mult_array", metalibm_hw_blocks.mult_array.MultArray,
+        {"op_expr": metalibm_hw_blocks.mult_array.multiplication_descriptor_parser(
+            "FU32.0xFU32.0+FU32.0xFU32.0")},
+    ),
+]
+
+
+def run_bench(bench, repeat):
+    """ return the (eager, lazy) best generation times of <bench> """
+    # warm-up (module level caches, lazy target instanciation ...)
+    bench.measure(True)
+    eager_time = min(bench.measure(False) for _ in range(repeat))
+    lazy_time = min(bench.measure(True) for _ in range(repeat))
+    return eager_time, lazy_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="interval evaluation benchmark")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of timed generations per mode")
+    parser.add_argument("--bench", type=lambda s: s.split(","),
+                        default=[bench.title for bench in BENCH_LIST],
+                        help="comma separated list of benchmarks to run")
+    args = parser.parse_args(sys.argv[1:])
+
+    # generated files are discarded
+    os.chdir(tempfile.mkdtemp(prefix="interval_bench_"))
+    Log.report(Log.Info, "generating in {}", os.getcwd())
+
+    print("{:12} {:>10} {:>10} {:>8}".format("function", "eager (s)", "lazy (s)", "speedup"))
+    for bench in BENCH_LIST:
+        if not bench.title in args.bench:
+            continue
+        eager_time, lazy_time = run_bench(bench, args.repeat)
+        print("{:12} {:10.3f} {:10.3f} {:7.2f}x".format(
+            bench.title, eager_time, lazy_time, eager_time / lazy_time))
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+""" Benchmark of the memory footprint of operation nodes
+
+    Report the number of bytes allocated per node when building large
+    graphs (measured with tracemalloc), before and after the handle of
+    every node has been requested.
+
+    Usage: python3 valid/memory_bench.py [--node-num N]
+"""
+
+import argparse
+import sys
+import tracemalloc
+
+from metalibm_core.core.ml_operations import (
+    Variable, Addition, Multiplication, BitLogicXor, Comparison
+)
+from metalibm_core.core.ml_formats import ML_Binary32, ML_Int32, ML_Bool
+from metalibm_core.core.graph_traversal import iterate_post_order
+
+
+def build_chain(node_num):
+    """ floating-point arithmetic chain (software-like graph) """
+    vx = Variable("x", precision=ML_Binary32, var_type=Variable.Input)
+    node = vx
+    for index in range(node_num // 2):
+        node = Multiplication(Addition(node, vx, precision=ML_Binary32), vx, precision=ML_Binary32)
+    return node
+
+
+def build_tagged_tree(node_num):
+    """ integer reduction tree with tagged comparison nodes
+        (RTL-like graph) """
+    vx = Variable("x", precision=ML_Int32, var_type=Variable.Input)
+    level = [BitLogicXor(vx, vx, precision=ML_Int32) for _ in range(node_num // 2)]
+    while len(level) > 1:
+        level = [
+            Comparison(lhs, rhs, specifier=Comparison.Equal, precision=ML_Bool, tag="cmp")
+            if isinstance(lhs, BitLogicXor) else
+            BitLogicXor(lhs, rhs, precision=ML_Int32)
+            for lhs, rhs in zip(level[::2], level[1::2])
+        ]
+    return level[0]
+
+
+BENCH_LIST = [
+    ("arithmetic chain", build_chain),
+    ("tagged tree", build_tagged_tree),
+]
+
+
+def measure(builder, node_num):
+    """ return (node count, bytes per node, bytes per node once every
+        handle has been allocated) """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    root = builder(node_num)
+    node_list = list(iterate_post_order([root]))
+    # the node list itself is not part of the graph footprint
+    graph_size = tracemalloc.get_traced_memory()[0] - start - sys.getsizeof(node_list)
+    for node in node_list:
+        node.get_handle()
+    handle_size = tracemalloc.get_traced_memory()[0] - start - sys.getsizeof(node_list)
+    tracemalloc.stop()
+    return len(node_list), graph_size / float(len(node_list)), handle_size / float(len(node_list))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="operation node memory benchmark")
+    parser.add_argument("--node-num", type=int, default=200000,
+                        help="approximate number of nodes per graph")
+    args = parser.parse_args(sys.argv[1:])
+
+    print("{:18} {:>8} {:>12} {:>16}".format("graph", "nodes", "bytes/node", "w/ handles"))
+    for title, builder in BENCH_LIST:
+        node_count, node_size, handle_node_size = measure(builder, args.node_num)
+        print("{:18} {:8d} {:12.1f} {:16.1f}".format(title, node_count, node_size, handle_node_size))
@@ -100,6 +100,23 @@ new_scheme_function_list = [
     "execute": True, "target": VectorBackend()},
      ]
   ),
+  NewSchemeTest(
+    "array entry point hyperbolic cosine gen test",
+    metalibm_functions.ml_cosh.ML_HyperbolicCosine,
+    [{"precision": ML_Binary32, "array_entry": True, "bench_test_number": 100,
+      "execute": True},
+     {"precision": ML_Binary32, "vector_size": 4, "array_entry": True,
+      "bench_test_number": 101, "execute": True, "target": VectorBackend()},
+     ]
+  ),
+  NewSchemeTest(
+    "multi-target hyperbolic cosine gen test",
+    metalibm_functions.ml_cosh.ML_HyperbolicCosine,
+    [{"precision": ML_Binary32, "function_name": "my_coshf", "auto_test": 128,
+      "execute": True,
+      "multi_target": [target_instanciate(target_name) for target_name in ["x86", "x86_sse2", "x86_avx2"]]},
+     ]
+  ),
   NewSchemeTest(
     "basic hyperbolic sine gen test",
     metalibm_functions.ml_sinh.ML_HyperbolicSine,
@@ -331,6 +348,8 @@ arg_parser.add_argument("--execute", dest = "test_list", type = parse_test_list,
 
 arg_parser.add_argument("--match", dest = "match_regex", type = str, default = ".*", help = "list of comma separated match regexp to be used for test selection")
 
+arg_parser.add_argument("--jobs", dest = "jobs", type = int, default = 1, help = "number of test cases executed concurrently (each in its own process and scratch directory)")
+
 
 
 
@@ -341,12 +360,14 @@ success = True
 # of new scheme tests
 result_details = []
 
-for test_scheme in args.test_list:
-  if re.search(args.match_regex, test_scheme.get_tag_title()) != None:
-    test_result = test_scheme.perform_all_test(debug = args.debug)
-    result_details.append(test_result)
-    if not test_result.get_result():
-      success = False
+selected_test_list = [test_scheme for test_scheme in args.test_list if re.search(args.match_regex, test_scheme.get_tag_title()) != None]
+result_matrix = perform_test_list_no_reduce(selected_test_list, jobs = args.jobs, debug = args.debug)
+
+for test_scheme, result_list in zip(selected_test_list, result_matrix):
+  test_result = test_scheme.reduce_test_result(result_list)
+  result_details.append(test_result)
+  if not test_result.get_result():
+    success = False
 
 # Printing test summary for new scheme
 for result in result_details:
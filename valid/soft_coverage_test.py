@@ -230,6 +230,10 @@ arg_parser.add_argument(
     "--verbose", dest="verbose_enable", action=VerboseAction,
     const=True, default=False,
     help="enable Verbose log level")
+arg_parser.add_argument(
+    "--jobs", dest="jobs", type=int, default=1,
+    help="number of test cases executed concurrently "
+         "(each in its own process and scratch directory)")
 
 args = arg_parser.parse_args(sys.argv[1:])
 
@@ -247,11 +251,14 @@ RESULT_MAP = {}
 # forcing exception cause to be raised
 Log.exit_on_error = False
 
-for test_scheme in global_test_list:
-    test_results = test_scheme.perform_all_test_no_reduce(debug=args.debug)
+RESULT_MATRIX = perform_test_list_no_reduce(
+    global_test_list, jobs=args.jobs, debug=args.debug,
+    callback=None if args.report_only else display_test_progress
+)
+for test_scheme, test_results in zip(global_test_list, RESULT_MATRIX):
     RESULT_MAP[test_scheme] = test_results
 
-for test_scheme in RESULT_MAP:
+for test_scheme in global_test_list:
     result_list = RESULT_MAP[test_scheme]
     test_result = test_scheme.reduce_test_result(result_list)
     success_count += test_scheme.get_success_count(result_list)
@@ -34,7 +34,11 @@
 ###############################################################################
 
 import sys
+import os
 import argparse
+import atexit
+import shutil
+import tempfile
 
 from sollya import Interval, SollyaObject
 
@@ -83,6 +87,15 @@ import metalibm_functions.unit_tests.fuse_fma as ut_fuse_fma
 import metalibm_functions.unit_tests.llvm_code as ut_llvm_code
 import metalibm_functions.unit_tests.multi_precision as ut_multi_precision
 import metalibm_functions.unit_tests.function_ptr as ut_function_ptr
+import metalibm_functions.unit_tests.large_graph as ut_large_graph
+import metalibm_functions.unit_tests.gvn as ut_gvn
+import metalibm_functions.unit_tests.lazy_interval as ut_lazy_interval
+import metalibm_functions.unit_tests.polynomial_scheme_selection as ut_polynomial_scheme_selection
+
+# test vector file of the "auto-test vector file" test, written to a
+# temporary directory (removed at exit) rather than the working directory
+AUTO_TEST_VECTOR_DIR = tempfile.mkdtemp(prefix="ml_ut_vectors_")
+atexit.register(shutil.rmtree, AUTO_TEST_VECTOR_DIR, True)
 
 unit_test_list = [
   UnitTestScheme(
@@ -203,6 +216,11 @@ unit_test_list = [
     ut_new_table,
     [{"auto_test_range": Interval(0, 100), "precision": ML_Int32, "auto_test_execute": 10}],
   ),
+  UnitTestScheme(
+    "auto-test vector file",
+    ut_new_table,
+    [{"auto_test_range": Interval(0, 100), "precision": ML_Int32, "auto_test_execute": 10, "auto_test_file": os.path.join(AUTO_TEST_VECTOR_DIR, "ut_new_table_vectors.bin")}],
+  ),
   UnitTestScheme(
     "perf bench test",
     ut_new_table,
@@ -242,6 +260,26 @@ unit_test_list = [
     ut_function_ptr,
     [{}],
   ),
+  UnitTestScheme(
+    "large graph traversal",
+    ut_large_graph,
+    [{}],
+  ),
+  UnitTestScheme(
+    "global value numbering",
+    ut_gvn,
+    [{}],
+  ),
+  UnitTestScheme(
+    "lazy interval evaluation",
+    ut_lazy_interval,
+    [{}],
+  ),
+  UnitTestScheme(
+    "polynomial scheme selection",
+    ut_polynomial_scheme_selection,
+    [{}],
+  ),
 ]
 
 # TODO: factorize / encapsulate in object/function
@@ -34,9 +34,18 @@
 # Last Modified:     March 6th, 2018
 ###############################################################################
 
+import os
+import pickle
+import sys
+import tempfile
+
 from metalibm_core.core.ml_function import (
     DefaultArgTemplate, BuildError, ValidError
 )
+from metalibm_core.utility.process_utils import (
+    run_processes, get_fork_context, prepare_scratch_workers,
+    enter_scratch_dir
+)
 
 class GenerationError(Exception):
     """ Exception indicating that an error occured during code generation """
@@ -144,3 +153,96 @@ class NewSchemeTest(CommonTestScheme):
             
         return TestResult(True, "{} succeed".format(test_desc), title=self.title)
 
+
+## list of test schemes shared with worker processes: workers are forked
+#  after it has been set and inherit it, so only indexes (and picklable
+#  TestResult) are exchanged between processes
+PARALLEL_TEST_SCHEME_LIST = []
+
+def get_picklable_result(test_result):
+    """ strip a TestResult from the fields which can not be exchanged
+        between processes (test object, test case) """
+    error = test_result.error
+    try:
+        pickle.dumps(error)
+    except Exception:
+        error = GenerationError(str(error))
+    return TestResult(
+        test_result.result, test_result.details, error=error,
+        title=test_result.title)
+
+def run_test_case(task):
+    """ execute a single test case in its own process and scratch
+        directory, @p task is a tuple (scheme index, test case index,
+        debug flag, scratch root directory) """
+    scheme_index, tc_index, debug, scratch_root = task
+    test_scheme = PARALLEL_TEST_SCHEME_LIST[scheme_index]
+    enter_scratch_dir(tempfile.mkdtemp(
+        prefix="test_{}_{}_".format(scheme_index, tc_index), dir=scratch_root))
+    try:
+        test_result = test_scheme.single_test(test_scheme.argument_tc[tc_index], debug=debug)
+    except Exception as e:
+        test_result = TestResult(False, "{} test failed: {}".format(test_scheme.get_title(), e), error=GenerationError(), title=test_scheme.get_title())
+    return scheme_index, tc_index, get_picklable_result(test_result)
+
+def display_test_progress(index, num_test, test_result):
+    """ default progress display, called every time a test completes """
+    print("[{}/{}] {} {}".format(
+        index, num_test, "OK" if test_result.get_result() else "KO",
+        test_result.get_details()))
+    sys.stdout.flush()
+
+def get_failed_test_case(task, reason):
+    """ result of a test case whose process died or timed out """
+    scheme_index, tc_index, _, _ = task
+    test_scheme = PARALLEL_TEST_SCHEME_LIST[scheme_index]
+    return scheme_index, tc_index, TestResult(
+        False, "{} test failed: {}".format(test_scheme.get_title(), reason),
+        error=GenerationError(), title=test_scheme.get_title())
+
+def perform_test_list_no_reduce(test_scheme_list, jobs=1, debug=False,
+                                scratch_root=None,
+                                callback=display_test_progress,
+                                timeout=None):
+    """ execute every test case of every test scheme in @p test_scheme_list
+        on at most @p jobs concurrent processes (one process per test case,
+        a test case whose process crashes or exceeds @p timeout seconds
+        fails).
+
+        Results are streamed through @p callback as soon as they complete,
+        the returned value is deterministic: the list (ordered as
+        @p test_scheme_list) of the TestResult lists (ordered as
+        each scheme's argument_tc) """
+    if jobs <= 1 or debug or get_fork_context() is None:
+        # sequential execution in the current process
+        return [test_scheme.perform_all_test_no_reduce(debug=debug) for test_scheme in test_scheme_list]
+
+    # test objects (targets, passes ...) are not picklable and are
+    # inherited through fork
+    PARALLEL_TEST_SCHEME_LIST[:] = test_scheme_list
+    scratch_root = os.path.abspath(scratch_root or tempfile.mkdtemp(prefix="ml_valid_"))
+    task_list = [
+        (scheme_index, tc_index, debug, scratch_root)
+        for scheme_index, test_scheme in enumerate(test_scheme_list)
+        for tc_index in range(test_scheme.num_test)
+    ]
+    result_matrix = [[None] * test_scheme.num_test for test_scheme in test_scheme_list]
+    print("running {} test(s) on {} process(es), scratch directory: {}".format(
+        len(task_list), jobs, scratch_root))
+    prepare_scratch_workers()
+    completed_list = []
+
+    def record_result(task_index, result):
+        scheme_index, tc_index, test_result = result
+        test_scheme = test_scheme_list[scheme_index]
+        test_result.test_object = test_scheme
+        test_result.test_case = test_scheme.argument_tc[tc_index]
+        result_matrix[scheme_index][tc_index] = test_result
+        completed_list.append(task_index)
+        if callback:
+            callback(len(completed_list), len(task_list), test_result)
+
+    run_processes(
+        run_test_case, task_list, jobs, get_failed_test_case,
+        timeout=timeout, callback=record_result)
+    return result_matrix